@@ -4,7 +4,7 @@ from typing import Any, cast
 from django.conf import settings
 from django.contrib import admin, messages
 from django.contrib.admin.options import IS_POPUP_VAR
-from django.db.models import QuerySet
+from django.db.models import Count, QuerySet
 from django.http import HttpRequest, HttpResponseRedirect
 from django.urls import reverse
 from django.utils.safestring import mark_safe
@@ -12,8 +12,8 @@ from rangefilter.filters import DateTimeRangeFilterBuilder
 
 from apps import inlines, models
 from apps.actions import change_satus, duplicate
-from apps.enums import ResponseChoices
-from apps.filters import ResourceFilter
+from apps.enums import LogPolicy, ResponseChoices
+from apps.filters import CachedValuesFieldListFilter, DurationFilter, ResourceFilter
 from apps.forms import ResourceStubForm, ResponseStubForm, WebHookRequestForm
 from apps.inlines import ResourceHookAdminInline
 from apps.mixins import (
@@ -25,15 +25,32 @@ from apps.mixins import (
     SaveByCurrentUserMixin,
 )
 from apps.models import User
+from apps.pagination import EstimatedCountPaginator, KeysetChangeList
+from apps.search import get_search_backend
 from apps.services import turn_off_same_resource
-from apps.utils import end_of_the_day_today, prettify_data_to_html, prettify_json_html, start_of_the_day_today
+from apps.utils import (
+    describe_log_policy,
+    end_of_the_day_today,
+    prettify_data_to_html,
+    prettify_json_html,
+    start_of_the_day_today,
+)
 
 
 @admin.register(models.Application)
 class ApplicationAdmin(admin.ModelAdmin):
     readonly_fields = ('owner',)
-    list_display = ('get_is_enabled', 'name', 'slug', 'resources_count', 'short_desc')
-    fields = ('name', 'description', 'slug', 'owner')
+    list_display = ('get_is_enabled', 'name', 'slug', 'resources_count', 'get_log_policy', 'short_desc')
+    fields = (
+        'name',
+        'description',
+        'slug',
+        'faker_locale',
+        'log_policy',
+        'log_sample_rate',
+        'log_retention_days',
+        'owner',
+    )
     inlines = [inlines.LogsInline]
     change_form_template = 'admin/apps/application/change_form.html'
     ordering = (
@@ -46,6 +63,9 @@ class ApplicationAdmin(admin.ModelAdmin):
     class Media:
         css = {'all': ('admin/css/application.css',)}
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        return super().get_queryset(request).annotate(resources_number=Count('resources'))
+
     def get_inlines(self, request: HttpRequest, obj: models.Application = None):
         """Hook for specifying custom inlines.
 
@@ -74,7 +94,7 @@ class ApplicationAdmin(admin.ModelAdmin):
         return obj.is_enabled
 
     @staticmethod
-    @admin.display(description='Resources')
+    @admin.display(description='Resources', ordering='resources_number')
     def resources_count(obj: models.Application) -> int:
         """Return related resource stubs count.
 
@@ -84,7 +104,7 @@ class ApplicationAdmin(admin.ModelAdmin):
         Returns:
             Related resource stubs count.
         """
-        return obj.resources.count()
+        return getattr(obj, 'resources_number')
 
     @staticmethod
     @admin.display(description='Description')
@@ -101,6 +121,11 @@ class ApplicationAdmin(admin.ModelAdmin):
             return f'{obj.description[:50]}...'
         return obj.description
 
+    @staticmethod
+    @admin.display(description='Logging')
+    def get_log_policy(obj: models.Application) -> str:
+        return describe_log_policy(log_policy=obj.log_policy, sample_rate=obj.log_sample_rate)
+
 
 @admin.register(models.RequestStub)
 class RequestStubAdmin(
@@ -169,10 +194,12 @@ class ResourceStubAdmin(
         'description',
         'full_url',
         'proxied',
+        'get_log_policy',
     )
     no_add_related = ('application',)
     no_edit_related = ('application',)
     no_delete_related = ('application',)
+    list_select_related = ('application', 'response')
     inlines = (ResourceHookAdminInline,)
     ordering = (
         '-is_enabled',
@@ -222,6 +249,23 @@ class ResourceStubAdmin(
             return 'ANY'
         return obj.method or '-'
 
+    @staticmethod
+    @admin.display(description='Logging')
+    def get_log_policy(obj: models.ResourceStub) -> str:
+        """Describe the active request logging policy.
+
+        Args:
+            obj: model instance.
+
+        Returns:
+            Active logging policy name, marked if it is inherited from the application.
+        """
+        log_policy, sample_rate = obj.active_log_policy
+        description = describe_log_policy(log_policy=log_policy, sample_rate=sample_rate)
+        if obj.log_policy == LogPolicy.INHERIT:
+            return f'{description} (application)'
+        return description
+
     @staticmethod
     @admin.display(description='URI')
     def uri_with_slash(obj: models.ResourceStub) -> str:
@@ -356,6 +400,9 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         'status_code',
         'pretty_response_headers',
         'pretty_response_body',
+        'is_truncated',
+        'duration',
+        'pretty_timings',
         'ipaddress',
         'x_real_ip',
         'resource',
@@ -369,21 +416,27 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         'get_remote_ip',
         'resource',
         'proxied',
+        'duration',
     )
+    list_select_related = ('resource',)
+    inlines = (inlines.WebhookDeliveriesInline,)
     readonly_fields = (
         'pretty_params',
         'pretty_request_headers',
         'pretty_request_body',
         'pretty_response_headers',
         'pretty_response_body',
+        'pretty_timings',
     )
     search_fields = (
         'id',
         'url',
         'params',
         'request_body',
+        'request_body_blob__content',
         'request_headers',
         'response_body',
+        'response_body_blob__content',
         'response_headers',
         'ipaddress',
         'x_real_ip',
@@ -398,15 +451,21 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
             ),
         ),
         ResourceFilter,
-        'status_code',
+        ('status_code', CachedValuesFieldListFilter),
         'proxied',
-        'method',
+        ('method', CachedValuesFieldListFilter),
+        DurationFilter,
     )
-    ordering = ('-created_at',)
+    ordering = ('-created_at', '-id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     class Media:
         css = {'all': ('admin/css/application.css',)}
 
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> type[KeysetChangeList]:
+        return KeysetChangeList
+
     def get_queryset(self, request: HttpRequest) -> QuerySet:
         params = request.GET.dict()
         application_id = cast(str | None, params.get('application'))
@@ -415,6 +474,22 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
 
         return models.RequestLog.objects.filter(application__pk=application_id)
 
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet, search_term: str) -> tuple[QuerySet, bool]:
+        """Search the logs with the indexed search backend of the database, if there is one.
+
+        Args:
+            request: HttpRequest instance.
+            queryset: request logs.
+            search_term: search query.
+
+        Returns:
+            Filtered queryset and False, as the search never duplicates the logs.
+        """
+        backend = get_search_backend()
+        if backend is None or not search_term:
+            return super().get_search_results(request, queryset, search_term)
+        return backend.search(queryset, search_term), False
+
     @staticmethod
     @admin.display(description='Query params')
     def pretty_params(obj: models.RequestLog) -> str:
@@ -429,6 +504,19 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         params_prettified = prettify_json_html(obj.params)
         return mark_safe(params_prettified)
 
+    @staticmethod
+    @admin.display(description='Timings (ms)')
+    def pretty_timings(obj: models.RequestLog) -> str:
+        """Prettify the request handling phase timings.
+
+        Args:
+            obj: model instance.
+
+        Returns:
+            HTML with the style block containing nice-looking timings.
+        """
+        return mark_safe(prettify_json_html(obj.timings))
+
     @staticmethod
     @admin.display(description='Request Headers')
     def pretty_request_headers(obj: models.RequestLog) -> str:
@@ -468,8 +556,8 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         Returns:
             HTML with the style block containing nice-looking request body.
         """
-        if obj.request_body is not None:
-            return prettify_data_to_html(obj.request_body)
+        if (body := obj.request_body_text) is not None:
+            return prettify_data_to_html(body)
         return ''
 
     @staticmethod
@@ -483,8 +571,8 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         Returns:
             HTML with the style block containing nice-looking response body.
         """
-        if obj.response_body is not None:
-            return prettify_data_to_html(obj.response_body)
+        if (body := obj.response_body_text) is not None:
+            return prettify_data_to_html(body)
         return ''
 
     @staticmethod
@@ -521,3 +609,56 @@ class RequestLogAdmin(DenyCreateMixin, DenyUpdateMixin, HideFromAdminIndexMixin,
         application = obj.application
         obj.delete()
         return HttpResponseRedirect(reverse('admin:apps_application_change', args=(application.pk,)))
+
+
+@admin.register(models.WebhookDelivery)
+class WebhookDeliveryAdmin(DenyCreateMixin, DenyUpdateMixin, admin.ModelAdmin):
+    list_display = (
+        'created_at',
+        'application',
+        'lifecycle',
+        'method',
+        'url',
+        'attempt',
+        'status_code',
+        'response_size',
+        'dns_time',
+        'connect_time',
+        'total_time',
+        'get_request_log',
+    )
+    list_filter = (
+        (
+            'created_at',
+            DateTimeRangeFilterBuilder(
+                title="Created at",
+                default_start=start_of_the_day_today(),
+                default_end=end_of_the_day_today(),
+            ),
+        ),
+        'application',
+        'lifecycle',
+    )
+    list_select_related = ('application',)
+    search_fields = ('url', 'error')
+    ordering = ('-created_at', '-id')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @staticmethod
+    @admin.display(description='Request log')
+    def get_request_log(obj: models.WebhookDelivery) -> str:
+        """Link to the log of the request triggered the webhook.
+
+        The log id is kept without a database constraint, so it is shown even if the log was not saved.
+
+        Args:
+            obj: WebhookDelivery instance.
+
+        Returns:
+            HTML link to the request log change page.
+        """
+        if not obj.request_log_id:
+            return ''
+        log_url = reverse('admin:apps_requestlog_change', args=(obj.request_log_id,))
+        return mark_safe(f'<a href="{log_url}">{obj.request_log_id}</a>')
@@ -5,3 +5,9 @@ class AppsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps'
     verbose_name = 'API Stubs'
+
+    def ready(self) -> None:
+        from apps import signals  # noqa: F401
+        from apps.cooperative import make_psycopg_cooperative
+
+        make_psycopg_cooperative()
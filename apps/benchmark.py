@@ -0,0 +1,298 @@
+import json
+import os
+import resource
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import requests
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from apps.enums import Action, BodyFormat, Lifecycle, ResponseChoices
+from apps.models import Application, RequestStub, ResourceHook, ResourceStub, ResponseStub
+
+BENCHMARK_APP_SLUG = 'stubborn-benchmark'
+UPSTREAM_BODY = json.dumps(
+    {'status': 'OK', 'items': [{'id': number, 'name': f'item {number}'} for number in range(20)]}
+)
+
+STATIC_JSON_BODY = json.dumps([{'id': number, 'name': f'user {number}', 'active': True} for number in range(20)])
+TEMPLATED_JSON_BODY = (
+    '[{% for _ in range(20) %}{"id": {{ random.randint(1, 100500) }}, "name": "{{ fake.name() }}", '
+    '"email": "{{ fake.email() }}"}{% if not loop.last %}, {% endif %}{% endfor %}]'
+)
+XML_BODY = '<users>{}</users>'.format(
+    ''.join(f'<user><id>{number}</id><name>user {number}</name></user>' for number in range(20))
+)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Stub resource driven by the benchmark."""
+
+    name: str
+    method: str
+    path: str
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Stand-in of the third-party service answering any request with the same JSON body."""
+
+    def respond(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = UPSTREAM_BODY.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = respond
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@contextmanager
+def run_upstream() -> Iterator[str]:
+    """Run the stand-in upstream service in a background thread.
+
+    Yields:
+        Base URL of the service.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), UpstreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def run_stub_server() -> Iterator[str]:
+    """Serve the stubs by the current process with a threaded WSGI server.
+
+    Yields:
+        Base URL of the server.
+    """
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietWSGIRequestHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def seed_applications(upstream_url: str) -> list[Scenario]:
+    """Create the benchmark application with a resource of every kind, the previous one is removed.
+
+    Args:
+        upstream_url: base URL of the proxied service, also called by the webhook.
+
+    Returns:
+        Scenarios calling the resources.
+    """
+    clean_up()
+    application = Application.objects.create(name='Benchmark', slug=BENCHMARK_APP_SLUG)
+
+    def add_resource(slug: str, body: str, body_format: str = BodyFormat.JSON) -> ResourceStub:
+        response = ResponseStub.objects.create(
+            application=application, status_code=200, body=body, format=body_format, headers={}
+        )
+        return ResourceStub.objects.create(application=application, slug=slug, method='GET', response=response)
+
+    add_resource('static-json', STATIC_JSON_BODY)
+    add_resource('templated-json', TEMPLATED_JSON_BODY)
+    add_resource('xml', XML_BODY, BodyFormat.XML)
+    hooked = add_resource('hooks', STATIC_JSON_BODY)
+    ResourceHook.objects.create(resource=hooked, action=Action.WAIT, lifecycle=Lifecycle.BEFORE_REQUEST, timeout=0)
+    webhook = RequestStub.objects.create(
+        application=application, uri=f'{upstream_url}/webhook', method='POST', body='{"event": "called"}', headers={}
+    )
+    ResourceHook.objects.create(
+        resource=hooked, action=Action.WEBHOOK, lifecycle=Lifecycle.AFTER_REQUEST, request=webhook
+    )
+    ResourceStub.objects.create(
+        application=application,
+        slug='proxy',
+        method='GET',
+        response_type=ResponseChoices.PROXY_CURRENT,
+        proxy_destination_address=f'{upstream_url}/proxy',
+    )
+
+    slugs = ['static-json', 'templated-json', 'xml', 'hooks', 'proxy']
+    return [Scenario(name=slug, method='GET', path=f'/{BENCHMARK_APP_SLUG}/{slug}') for slug in slugs]
+
+
+def clean_up() -> None:
+    """Remove the benchmark application with all its objects and logs."""
+    Application.objects.filter(slug=BENCHMARK_APP_SLUG).delete()
+
+
+def count_queries(scenario: Scenario, requests_number: int = 5) -> float:
+    """Measure the average number of the database queries made by the stub request.
+
+    The requests are handled by the current thread after a warm-up request, so the per-worker caches are filled
+    as they are on a running server.
+
+    Args:
+        scenario: called scenario.
+        requests_number: number of the measured requests.
+
+    Returns:
+        Queries per request.
+    """
+    client = Client()
+    client.generic(scenario.method, scenario.path)
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(requests_number):
+            client.generic(scenario.method, scenario.path)
+    return len(queries) / requests_number
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    """Get the percentile of the latencies.
+
+    Args:
+        latencies: measured values, at least one.
+        percent: percentile, 1 to 99.
+
+    Returns:
+        Percentile value.
+    """
+    if len(latencies) == 1:
+        return latencies[0]
+    return statistics.quantiles(latencies, n=100, method='inclusive')[percent - 1]
+
+
+def run_load(base_url: str, scenario: Scenario, requests_number: int, concurrency: int) -> dict[str, Any]:
+    """Send the scenario requests from a pool of concurrent clients.
+
+    Args:
+        base_url: base URL of the stub server.
+        scenario: called scenario.
+        requests_number: total number of the requests.
+        concurrency: number of the concurrent clients.
+
+    Returns:
+        Number of the sent requests and failed ones (status 5xx or no response), requests per second, p50, p95 and
+        p99 latency in milliseconds.
+    """
+    sessions = threading.local()
+    url = f'{base_url}{scenario.path}'
+
+    def send(_: int) -> tuple[float, bool]:
+        if not hasattr(sessions, 'session'):
+            sessions.session = requests.Session()
+        started_at = time.perf_counter()
+        try:
+            failed = sessions.session.request(scenario.method, url).status_code >= 500
+        except requests.RequestException:
+            failed = True
+        return (time.perf_counter() - started_at) * 1000, failed
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(send, range(requests_number)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies = [latency for latency, _ in results]
+    return {
+        'requests': requests_number,
+        'errors': sum(failed for _, failed in results),
+        'rps': round(requests_number / elapsed, 1),
+        'p50': round(percentile(latencies, 50), 3),
+        'p95': round(percentile(latencies, 95), 3),
+        'p99': round(percentile(latencies, 99), 3),
+    }
+
+
+def read_rss(pid: int) -> float | None:
+    """Read the resident set size of the process.
+
+    Args:
+        pid: process id.
+
+    Returns:
+        RSS in megabytes, None if the process is not found.
+    """
+    try:
+        with open(f'/proc/{pid}/status') as status:
+            for line in status:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if pid == os.getpid():  # no procfs, the peak RSS is the best guess
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    return None
+
+
+def get_worker_rss(pidfile: str | None = None) -> dict[str, float]:
+    """Get the resident set size of every worker.
+
+    Args:
+        pidfile: uWSGI master pidfile, the workers are the children of the master process. The current process is
+            the only worker if not set.
+
+    Returns:
+        RSS in megabytes by the process id.
+    """
+    pids = [os.getpid()]
+    if pidfile:
+        with open(pidfile) as file:
+            master_pid = int(file.read().strip())
+        pids = []
+        for task in os.listdir(f'/proc/{master_pid}/task'):
+            with open(f'/proc/{master_pid}/task/{task}/children') as children:
+                pids.extend(int(pid) for pid in children.read().split())
+
+    rss = {str(pid): read_rss(pid) for pid in pids}
+    return {pid: value for pid, value in rss.items() if value is not None}
+
+
+def compare_results(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Find the scenarios that got slower than the baseline.
+
+    Args:
+        results: benchmark results.
+        baseline: stored results of an earlier run.
+        tolerance: allowed throughput decrease and latency increase, percent.
+
+    Returns:
+        Regression descriptions, empty if there are none.
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        if current['rps'] < previous['rps'] * (1 - tolerance / 100):
+            regressions.append(f'{name}: {current["rps"]} RPS, was {previous["rps"]}')
+        for metric in ('p95', 'p99'):
+            if current[metric] > previous[metric] * (1 + tolerance / 100):
+                regressions.append(f'{name}: {metric} {current[metric]} ms, was {previous[metric]}')
+        if current['queries_per_request'] > previous['queries_per_request']:
+            regressions.append(
+                f'{name}: {current["queries_per_request"]} queries per request, was {previous["queries_per_request"]}'
+            )
+    return regressions
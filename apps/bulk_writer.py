@@ -0,0 +1,173 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Generic, TypeVar
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, models, transaction
+
+from apps.metrics import QUEUE_DROPPED, observe_queue_depth
+from apps.models import RequestLog, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+_ModelT = TypeVar('_ModelT', bound=models.Model)
+
+
+class OverflowPolicy:
+    DROP = 'drop'
+    BLOCK = 'block'
+
+
+class BulkWriter(Generic[_ModelT]):
+    """Background writer saving the model objects in batches.
+
+    Objects are put into a bounded in-process queue and saved with `bulk_create` by a flusher thread once the
+    batch is full or the flush interval has passed. The objects must have their primary keys generated before
+    queueing (UUID primary keys are generated on instantiation), so they can be referenced before they are saved.
+
+    If the queue is full, new objects are dropped (and counted) or the caller waits for a free slot, depending on
+    the overflow policy. The flusher thread is started on the first put, so every forked worker runs its own one.
+    """
+
+    def __init__(
+        self,
+        model: type[_ModelT],
+        queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        overflow: str = OverflowPolicy.DROP,
+    ) -> None:
+        self.model = model
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: queue.Queue[_ModelT] = queue.Queue(maxsize=queue_size)
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._batch_ready = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def put(self, obj: _ModelT) -> bool:
+        """Queue the object for saving.
+
+        Args:
+            obj: unsaved model object with the primary key set.
+
+        Returns:
+            True if the object was queued, False if it was dropped because of the queue overflow.
+        """
+        self.start()
+        try:
+            self._queue.put(obj, block=self.overflow == OverflowPolicy.BLOCK)
+        except queue.Full:
+            self.dropped += 1
+            QUEUE_DROPPED.labels(model=self.model.__name__).inc()
+            logger.warning(f'{self.model.__name__} queue is full, the object is dropped (total: {self.dropped}).')
+            return False
+        queued = self._queue.qsize()
+        observe_queue_depth(model=self.model.__name__, depth=queued)
+        if queued >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    def start(self) -> None:
+        """Start the flusher thread if it is not running."""
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name=f'{self.model.__name__}-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._batch_ready.wait(self.flush_interval)
+            self._batch_ready.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:  # the thread must survive any failure
+                logger.exception(f'{self.model.__name__} writer failed.')
+
+    def flush(self) -> int:
+        """Save all the queued objects in the current thread.
+
+        Returns:
+            Number of saved objects.
+        """
+        saved = 0
+        with self._flush_lock:
+            while batch := self._take_batch():
+                saved += self._write(batch)
+        observe_queue_depth(model=self.model.__name__, depth=self._queue.qsize())
+        return saved
+
+    def _take_batch(self) -> list[_ModelT]:
+        batch: list[_ModelT] = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: list[_ModelT]) -> int:
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create(batch)
+        except DatabaseError:
+            # i.e. the related object was deleted in between, save the objects one by one to keep the valid ones
+            return sum(self._write_one(obj) for obj in batch)
+        self.written += len(batch)
+        return len(batch)
+
+    def _write_one(self, obj: _ModelT) -> int:
+        try:
+            with transaction.atomic():
+                self.model.objects.bulk_create([obj])
+        except DatabaseError as error:
+            self.failed += 1
+            logger.warning(f'Could not save {obj}: {error}')
+            return 0
+        self.written += 1
+        return 1
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the writer counters.
+
+        Returns:
+            Numbers of the queued, written, dropped and failed objects.
+        """
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+
+request_log_writer: BulkWriter[RequestLog] = BulkWriter(
+    model=RequestLog,
+    queue_size=settings.REQUEST_LOG_QUEUE_SIZE,
+    batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+    flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL / 1000,
+    overflow=settings.REQUEST_LOG_OVERFLOW,
+)
+atexit.register(request_log_writer.flush)
+
+# deliveries are recorded by the hook threads, which must never wait for the database
+webhook_delivery_writer: BulkWriter[WebhookDelivery] = BulkWriter(
+    model=WebhookDelivery,
+    queue_size=settings.REQUEST_LOG_QUEUE_SIZE,
+    batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+    flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL / 1000,
+    overflow=OverflowPolicy.DROP,
+)
+atexit.register(webhook_delivery_writer.flush)
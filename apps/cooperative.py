@@ -0,0 +1,61 @@
+import logging
+import sys
+from typing import Any
+
+from psycopg2 import OperationalError, extensions
+
+logger = logging.getLogger(__name__)
+
+
+def is_gevent_patched() -> bool:
+    """Check if the worker runs in the gevent mode, i.e. the standard library is monkey patched by uWSGI.
+
+    Returns:
+        True if the sockets are cooperative.
+    """
+    if 'gevent.monkey' not in sys.modules:
+        return False
+
+    from gevent import monkey
+
+    return monkey.is_module_patched('socket')
+
+
+def gevent_wait_callback(connection: Any, timeout: float | None = None) -> None:
+    """Wait for the database connection with the gevent hub, so the other greenlets run in the meantime.
+
+    Args:
+        connection: psycopg2 connection.
+        timeout: max time in seconds to wait for the socket.
+
+    Raises:
+        OperationalError if the connection is in an unexpected state.
+    """
+    from gevent.socket import wait_read, wait_write
+
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(connection.fileno(), timeout=timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(connection.fileno(), timeout=timeout)
+        else:
+            raise OperationalError(f'Bad result from poll: {state}')
+
+
+def make_psycopg_cooperative() -> bool:
+    """Make the database queries yield to the other greenlets if the worker runs in the gevent mode.
+
+    psycopg2 talks to the database with the C library, which monkey patching does not reach: without the wait
+    callback a query would block all the requests of the worker.
+
+    Returns:
+        True if the wait callback was set.
+    """
+    if not is_gevent_patched():
+        return False
+    extensions.set_wait_callback(gevent_wait_callback)
+    logger.info('gevent mode: the database queries are cooperative.')
+    return True
@@ -43,3 +43,12 @@ class TeamChoices(TextChoices):
 class InviterChoices(TextChoices):
     OWNER = 'owner', 'Owner'
     EVERYBODY = 'everybody', 'Everybody'
+
+
+class LogPolicy(TextChoices):
+    INHERIT = 'inherit', 'Same as application'
+    FULL = 'full', 'Full'
+    METADATA = 'metadata', 'Metadata only'
+    SAMPLED = 'sampled', 'Sampled'
+    ERRORS = 'errors', 'Errors only'
+    OFF = 'off', 'Off'
@@ -0,0 +1,99 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from apps.bulk_writer import OverflowPolicy
+from apps.metrics import EXECUTOR_DROPPED, EXECUTOR_TASK_DURATION, EXECUTOR_TASK_WAIT, observe_executor_depth
+
+logger = logging.getLogger(__name__)
+
+Task = tuple[float, Callable[..., Any], tuple, dict]
+
+
+class BoundedExecutor:
+    """Fixed pool of background threads running the tasks from a bounded in-process queue.
+
+    The number of threads does not depend on the load: tasks submitted while all the threads are busy wait in the
+    queue. If the queue is full, new tasks are dropped (and counted) or the caller waits for a free slot, depending
+    on the overflow policy. The threads are started on the first submit, so every forked worker runs its own pool.
+    """
+
+    def __init__(self, name: str, workers: int, queue_size: int, overflow: str = OverflowPolicy.DROP) -> None:
+        self.name = name
+        self.workers = workers
+        self.overflow = overflow
+        self.completed = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: queue.Queue[Task] = queue.Queue(maxsize=queue_size)
+        self._start_lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+
+    def submit(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """Queue the function call.
+
+        Args:
+            func: called function.
+            args: positional arguments of the function.
+            kwargs: keyword arguments of the function.
+
+        Returns:
+            True if the task was queued, False if it was dropped because of the queue overflow.
+        """
+        self.start()
+        try:
+            self._queue.put((time.perf_counter(), func, args, kwargs), block=self.overflow == OverflowPolicy.BLOCK)
+        except queue.Full:
+            self.dropped += 1
+            EXECUTOR_DROPPED.labels(executor=self.name).inc()
+            logger.warning(f'{self.name} queue is full, the task is dropped (total: {self.dropped}).')
+            return False
+        observe_executor_depth(executor=self.name, depth=self._queue.qsize())
+        return True
+
+    def start(self) -> None:
+        """Start the missing worker threads."""
+        if len(self._threads) == self.workers and all(thread.is_alive() for thread in self._threads):
+            return
+        with self._start_lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._run, name=f'{self.name}-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def join(self) -> None:
+        """Wait until all the queued tasks are done."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            queued_at, func, args, kwargs = self._queue.get()
+            started_at = time.perf_counter()
+            EXECUTOR_TASK_WAIT.labels(executor=self.name).observe(started_at - queued_at)
+            observe_executor_depth(executor=self.name, depth=self._queue.qsize())
+            try:
+                func(*args, **kwargs)
+                self.completed += 1
+            except Exception:  # the thread must survive any failure
+                self.failed += 1
+                logger.exception(f'{self.name} task failed.')
+            finally:
+                EXECUTOR_TASK_DURATION.labels(executor=self.name).observe(time.perf_counter() - started_at)
+                self._queue.task_done()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the executor counters.
+
+        Returns:
+            Numbers of the queued, completed, dropped and failed tasks.
+        """
+        return {
+            'queued': self._queue.qsize(),
+            'completed': self.completed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
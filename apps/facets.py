@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+
+from apps.metrics import observe_cache_lookup
+from apps.models import RequestLog, ResourceStub
+
+FacetKey = tuple[str, UUID | None]
+
+
+class FacetCache:
+    """Per-worker cache of the request log list filter choices.
+
+    Distinct values of a log field are selected once in REQUEST_LOG_FACET_TTL seconds for every application (and
+    for all the logs), the values of the logs written by the worker are added on the way, so the admin sidebar
+    costs no queries over the log table in between. Resource choices are cached the same way and dropped as soon
+    as the resources of the application are changed.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[FacetKey, tuple[float, set[Any]]] = {}
+        self._resources: dict[UUID, tuple[float, list[tuple[UUID, str]]]] = {}
+        self._lock = threading.Lock()
+
+    def get_values(self, field_name: str, application_id: UUID | None = None) -> list[Any]:
+        """Get the distinct values of the request log field.
+
+        Args:
+            field_name: request log field name.
+            application_id: primary key of the application, None for the logs of all the applications.
+
+        Returns:
+            Values ordered ascending, None goes last.
+        """
+        key = (field_name, application_id)
+        cached = self._values.get(key)
+        if cached and cached[0] > time.monotonic():
+            observe_cache_lookup(cache='facets', hit=True)
+            values = cached[1]
+        else:
+            observe_cache_lookup(cache='facets', hit=False)
+            logs = RequestLog.objects.all()
+            if application_id:
+                logs = logs.filter(application_id=application_id)
+            values = set(logs.order_by().values_list(field_name, flat=True).distinct())
+            if settings.REQUEST_LOG_FACET_TTL:
+                with self._lock:
+                    self._values[key] = (time.monotonic() + settings.REQUEST_LOG_FACET_TTL, values)
+        return sorted(values, key=lambda value: (value is None, value))
+
+    def add(self, log: RequestLog) -> None:
+        """Add the field values of the new request log to the cached values.
+
+        Args:
+            log: request log being saved.
+        """
+        with self._lock:
+            for (field_name, application_id), (_, values) in self._values.items():
+                if application_id in (None, log.application_id):
+                    values.add(getattr(log, field_name))
+
+    def get_resources(self, application_id: UUID) -> list[tuple[UUID, str]]:
+        """Get the resources of the application.
+
+        Args:
+            application_id: primary key of the application.
+
+        Returns:
+            Primary keys and names of the resources ordered by the slug.
+        """
+        cached = self._resources.get(application_id)
+        if cached and cached[0] > time.monotonic():
+            observe_cache_lookup(cache='facets', hit=True)
+            return cached[1]
+
+        observe_cache_lookup(cache='facets', hit=False)
+        resources = ResourceStub.objects.filter(application__pk=application_id).order_by('slug')
+        choices = [(resource.id, str(resource)) for resource in resources]
+        if settings.REQUEST_LOG_FACET_TTL:
+            with self._lock:
+                self._resources[application_id] = (time.monotonic() + settings.REQUEST_LOG_FACET_TTL, choices)
+        return choices
+
+    def invalidate_resources(self, application_id: UUID) -> None:
+        """Drop the cached resource choices of the application.
+
+        Args:
+            application_id: primary key of the changed application.
+        """
+        with self._lock:
+            self._resources.pop(application_id, None)
+
+    def clear(self) -> None:
+        """Drop all the cached choices."""
+        with self._lock:
+            self._values.clear()
+            self._resources.clear()
+
+
+facet_cache = FacetCache()
@@ -0,0 +1,153 @@
+import logging
+import random
+import threading
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext as _
+from faker import Faker
+from faker.config import AVAILABLE_LOCALES
+from faker.proxy import UniqueProxy
+
+logger = logging.getLogger(__name__)
+
+
+class PregeneratedFaker:
+    """Faker proxy drawing the values of the pooled providers from the pre-generated arrays.
+
+    Pooled providers called without arguments return a random value from the array of `pool_size` values
+    generated once. Calls with arguments and all the other providers are delegated to the Faker instance.
+    """
+
+    def __init__(self, faker: Faker, providers: list[str], pool_size: int) -> None:
+        self.faker = faker
+        self.providers = set(providers)
+        self.pool_size = pool_size
+        self._pools: dict[str, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in self.providers:
+            return getattr(self.faker, name)
+
+        provider = getattr(self.faker, name)
+
+        def draw(*args: Any, **kwargs: Any) -> Any:
+            if args or kwargs:
+                return provider(*args, **kwargs)
+            return random.choice(self.get_pool(name))
+
+        return draw
+
+    def get_pool(self, name: str) -> list[Any]:
+        """Get the pre-generated values of the provider, generate them if needed.
+
+        Args:
+            name: provider name, i.e. `name`, `email`, `uuid4`.
+
+        Returns:
+            List of the pre-generated values.
+        """
+        if pool := self._pools.get(name):
+            return pool
+
+        with self._lock:
+            if name not in self._pools:
+                provider: Callable[[], Any] = getattr(self.faker, name)
+                self._pools[name] = [provider() for _ in range(self.pool_size)]
+                logger.debug(f'Generated {self.pool_size} values of the fake {name} for {self.faker.locales}.')
+        return self._pools[name]
+
+    def warm_up(self) -> None:
+        """Generate the values of all the pooled providers."""
+        for name in self.providers:
+            self.get_pool(name)
+
+
+class RenderFaker:
+    """Proxy of a shared Faker instance with the `unique` values tracked for one template render only.
+
+    The Faker instances live as long as the worker, so their own `unique` state would keep the values of all the
+    previous requests and run out of them.
+    """
+
+    def __init__(self, faker: Faker | PregeneratedFaker) -> None:
+        self.faker = faker
+        self.unique = UniqueProxy(faker)  # type: ignore[arg-type]
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.faker, name)
+
+
+class FakerPool:
+    """Per-worker pool of the reusable Faker instances, one per locale.
+
+    Creating a Faker instance loads the providers and the locale data, so instances are created once and shared
+    by all the templates of the worker. If FAKE_DATA_POOL_SIZE is set, the instances draw the values of the
+    FAKE_DATA_POOL_PROVIDERS from the pre-generated arrays instead of running the provider code on every call.
+    """
+
+    def __init__(self) -> None:
+        self._fakers: dict[str | None, Faker | PregeneratedFaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, locale: str | None = None) -> Faker | PregeneratedFaker:
+        """Get the Faker instance for the locale.
+
+        Args:
+            locale: Faker locale name (i.e. `de_DE`), default locale is used if not set.
+
+        Returns:
+            Faker instance.
+        """
+        if faker := self._fakers.get(locale):
+            return faker
+
+        with self._lock:
+            if locale not in self._fakers:
+                faker = Faker(locale)
+                if settings.FAKE_DATA_POOL_SIZE:
+                    faker = PregeneratedFaker(
+                        faker, providers=settings.FAKE_DATA_POOL_PROVIDERS, pool_size=settings.FAKE_DATA_POOL_SIZE
+                    )
+                self._fakers[locale] = faker
+        return self._fakers[locale]
+
+    def for_render(self, locale: str | None = None) -> RenderFaker:
+        """Get the Faker instance for the locale wrapped for one template render.
+
+        Args:
+            locale: Faker locale name (i.e. `de_DE`), default locale is used if not set.
+
+        Returns:
+            RenderFaker instance with its own `unique` state.
+        """
+        return RenderFaker(self.get(locale))
+
+    def warm_up(self) -> None:
+        """Generate the pooled values of the default locale Faker (if pre-generated pools are turned on)."""
+        faker = self.get()
+        if isinstance(faker, PregeneratedFaker):
+            faker.warm_up()
+
+    def clear(self) -> None:
+        """Drop all the Faker instances."""
+        with self._lock:
+            self._fakers.clear()
+
+
+def validate_faker_locale(locale: str | None) -> None:
+    """Check if the locale is supported by Faker.
+
+    Args:
+        locale: Faker locale name.
+
+    Raises:
+        ValidationError if the locale is not supported.
+    """
+    if locale and locale not in AVAILABLE_LOCALES:
+        raise ValidationError(_('Unknown locale: %(locale)s.'), code='invalid', params={'locale': locale})
+
+
+faker_pool = FakerPool()
@@ -1,12 +1,28 @@
 from typing import Any, Generator
 from uuid import UUID
 
-from django.contrib.admin import SimpleListFilter
+from django.contrib.admin import AllValuesFieldListFilter, SimpleListFilter
+from django.contrib.admin.options import IncorrectLookupParameters
 from django.core.handlers.wsgi import WSGIRequest
 from django.db.models import QuerySet
 from django.utils.translation import gettext_lazy as _
 
-from apps.models import ResourceStub
+from apps.facets import facet_cache
+
+
+def get_application_id(request: WSGIRequest) -> UUID | None:
+    """Get the application the request logs are filtered by.
+
+    Args:
+        request: WSGIRequest instance.
+
+    Returns:
+        Primary key of the application, None if the logs are not filtered by the application.
+    """
+    try:
+        return UUID(request.GET['application'])
+    except (KeyError, ValueError):
+        return None
 
 
 class MultiSelectFilter(SimpleListFilter):
@@ -48,13 +64,12 @@ class ResourceFilter(MultiSelectFilter):
     parameter_name = 'resource_slug'
 
     def lookups(self, request: WSGIRequest, model_admin: Any) -> list[tuple[Any, str]]:
-        query_params = request.GET.dict()
-        app_id = query_params.get('application')
+        app_id = get_application_id(request)
 
         if not app_id:
             return []
 
-        return [(res.id, str(res)) for res in ResourceStub.objects.filter(application__pk=app_id).order_by('slug')]
+        return facet_cache.get_resources(app_id)
 
     def queryset(self, request: WSGIRequest, queryset: QuerySet) -> QuerySet:
         value = self.value()
@@ -62,3 +77,30 @@ class ResourceFilter(MultiSelectFilter):
             return queryset
 
         return queryset.filter(resource__pk__in=[UUID(v) for v in value.split(',')])
+
+
+class DurationFilter(SimpleListFilter):
+    title = 'Duration'
+    parameter_name = 'slower_than'
+
+    def lookups(self, request: WSGIRequest, model_admin: Any) -> list[tuple[Any, str]]:
+        return [(100, '> 100 ms'), (500, '> 500 ms'), (1000, '> 1 s'), (5000, '> 5 s')]
+
+    def queryset(self, request: WSGIRequest, queryset: QuerySet) -> QuerySet:
+        value = self.value()
+        if value is None:
+            return queryset
+
+        try:
+            return queryset.filter(duration__gt=float(value))
+        except ValueError as error:
+            raise IncorrectLookupParameters(error) from error
+
+
+class CachedValuesFieldListFilter(AllValuesFieldListFilter):
+    """List filter of the request log field values taken from the facet cache instead of the log table."""
+
+    def __init__(self, field: Any, request: WSGIRequest, params: dict, model: Any, model_admin: Any, field_path: str):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        values = facet_cache.get_values(field.name, get_application_id(request))
+        self.lookup_choices = values  # type: ignore[assignment]
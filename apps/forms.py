@@ -37,6 +37,8 @@ class ResourceStubForm(ModelForm):
             'description',
             'application',
             'inject_stubborn_headers',
+            'log_policy',
+            'log_sample_rate',
         ]
 
 
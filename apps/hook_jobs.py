@@ -0,0 +1,148 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.hooks import process_hook
+from apps.models import HookJob, HookStep
+
+logger = logging.getLogger(__name__)
+
+
+def claim_jobs(limit: int, lease: float) -> list[HookJob]:
+    """Claim the available hook jobs for the current worker.
+
+    The jobs are selected with `FOR UPDATE SKIP LOCKED`, so concurrent workers never wait for each other and never
+    get the same job. The claimed jobs are hidden from other workers for the lease time.
+
+    Args:
+        limit: max number of the claimed jobs.
+        lease: seconds the jobs are hidden from other workers.
+
+    Returns:
+        Claimed HookJob instances, oldest first.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            HookJob.objects.select_for_update(skip_locked=True)
+            .filter(available_at__lte=now)
+            .order_by('available_at')[:limit]
+        )
+        if jobs:
+            HookJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                available_at=now + timedelta(seconds=lease), attempts=F('attempts') + 1
+            )
+    for job in jobs:
+        job.attempts += 1
+    return jobs
+
+
+def extend_leases(jobs: list[HookJob], lease: float) -> None:
+    """Hide the running jobs from other workers for one more lease time.
+
+    Args:
+        jobs: claimed HookJob instances.
+        lease: seconds the jobs are hidden from other workers.
+    """
+    HookJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+        available_at=timezone.now() + timedelta(seconds=lease)
+    )
+
+
+def run_job(job: HookJob, max_attempts: int) -> bool:
+    """Run the hooks of the claimed job and delete it.
+
+    A job with a failed hook (i.e. an undelivered webhook) is left for another run once its lease expires, unless it
+    has used all its attempts. The next run starts from the failed hook, the hooks already run are not run again.
+
+    Args:
+        job: claimed HookJob instance.
+        max_attempts: number of the runs of a failing job before it is dropped.
+
+    Returns:
+        True if the hooks were run, False otherwise.
+    """
+    done_steps: set[int] = set()
+    try:
+        process_hook(
+            steps=tuple(HookStep(**step) for step in job.steps),
+            on_step_done=done_steps.add,
+            threading_mode=True,
+            raise_errors=True,
+            application_id=job.application_id,
+            request_log_id=job.request_log_id,
+        )
+    except Exception:
+        logger.exception(f'Hook job {job.pk} failed (attempt {job.attempts} of {max_attempts}).')
+        if job.attempts >= max_attempts:
+            HookJob.objects.filter(pk=job.pk).delete()
+        else:  # the webhooks are not idempotent, the delivered ones are not sent again
+            HookJob.objects.filter(pk=job.pk).update(
+                steps=[step for index, step in enumerate(job.steps) if index not in done_steps]
+            )
+        return False
+    HookJob.objects.filter(pk=job.pk).delete()
+    return True
+
+
+def _run_job_in_thread(job: HookJob, max_attempts: int) -> bool:
+    close_old_connections()
+    try:
+        return run_job(job, max_attempts)
+    finally:
+        close_old_connections()
+
+
+def run_worker(
+    concurrency: int,
+    lease: float,
+    max_attempts: int,
+    poll_interval: float,
+    once: bool = False,
+    stop: threading.Event | None = None,
+) -> int:
+    """Claim and run the hook jobs until stopped.
+
+    Jobs are claimed whenever there is a free thread, so a slow job does not hold back the others. The leases of the
+    running jobs are extended every half of the lease time, so the jobs running longer than the lease are not run
+    again by other workers.
+
+    Args:
+        concurrency: number of the jobs run at the same time.
+        lease: seconds a claimed job is hidden from other workers.
+        max_attempts: number of the runs of a failing job before it is dropped.
+        poll_interval: pause in seconds between the checks of the job table when there are no jobs.
+        once: return once there are no available jobs.
+        stop: event stopping the worker, the running jobs are finished.
+
+    Returns:
+        Number of the jobs run successfully.
+    """
+    stop = stop or threading.Event()
+    done_jobs = 0
+    running: dict[Future, HookJob] = {}
+    extended_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='hook-worker') as executor:
+        while running or not stop.is_set():
+            if not stop.is_set() and len(running) < concurrency:
+                for job in claim_jobs(limit=concurrency - len(running), lease=lease):
+                    running[executor.submit(_run_job_in_thread, job, max_attempts)] = job
+            if not running:
+                if once:
+                    break
+                stop.wait(poll_interval)
+                continue
+            finished, _ = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                done_jobs += future.result()
+            if running and time.monotonic() - extended_at >= lease / 2:
+                extend_leases(list(running.values()), lease=lease)
+                extended_at = time.monotonic()
+    return done_jobs
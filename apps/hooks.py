@@ -1,14 +1,19 @@
+import itertools
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from threading import Event
 from time import sleep
-from typing import Any, Callable
+from types import MappingProxyType
+from typing import Any, Callable, Iterator
+from uuid import UUID
 
-import requests
 from django.conf import settings
-from django.db.models import QuerySet
+from django.utils import timezone
 
 from apps import enums, models
-from apps.utils import run_in_separate_thread
+from apps.executor import BoundedExecutor
+from apps.metrics import HOOK_DURATION
+from apps.webhooks import send_webhook
 
 logger = logging.getLogger(__name__)
 
@@ -21,71 +26,152 @@ def process_wait(*, timeout, **kwargs):
     if kwargs.get('threading_mode'):
         Event().wait(timeout)
     else:
-        sleep(timeout)
+        sleep(timeout)  # yields to the other requests in the gevent mode (GEVENT_CORES)
 
 
-def process_webhook(*, headers, body, uri, method, query_params, **kwargs):
+def process_webhook(*, headers, body, uri, method, query_params, lifecycle, **kwargs):
     logger.debug(
         f'Run webhook. headers={headers}, body={body}, destination_url={uri}, '
         f'method={method}, query_params={query_params}'
     )
     try:
-        response = requests.request(method=method, url=uri, params=query_params, headers=headers, data=body)
+        response = send_webhook(
+            method=method,
+            url=uri,
+            params=query_params,
+            headers=headers,
+            body=body,
+            lifecycle=lifecycle,
+            application_id=kwargs.get('application_id'),
+            request_log_id=kwargs.get('request_log_id'),
+        )
         logger.debug(response)
     except Exception as e:
         logger.debug(f'Hook failed. Error - {e}')
+        if kwargs.get('raise_errors'):  # the hook jobs are run again by the worker
+            raise
 
 
-HOOK_FIELDS = [
-    'action',
-    'timeout',
-]
-REQUEST_STUB_FIELDS = ['headers', 'body', 'method', 'uri', 'format', 'query_params']
-
 process_action: dict[str, Callable] = {
     enums.Action.WAIT: process_wait,
     enums.Action.WEBHOOK: process_webhook,
 }
 
 
-def _get_hook_context(hook: models.ResourceHook, extra_context: dict) -> dict:
-    context: dict[str, Any] = {}
-    for context_field in [*HOOK_FIELDS, *REQUEST_STUB_FIELDS]:
-        context.setdefault(context_field, None)
-
-    context.update(
-        {
-            **extra_context,
-            **{k: getattr(hook, k, None) for k in HOOK_FIELDS},
-        }
-    )
-
-    if hasattr(hook, 'request') and hook.request:
-        context.update(**{k: getattr(hook.request, k, None) for k in REQUEST_STUB_FIELDS})
-
-    return context
+class HookBackend:
+    THREAD = 'thread'
+    DATABASE = 'database'
+
+
+webhook_executor = ThreadPoolExecutor(max_workers=settings.WEBHOOK_CONCURRENCY, thread_name_prefix='webhook')
+
+after_response_executor = BoundedExecutor(
+    name='after-response-hooks',
+    workers=settings.AFTER_RESPONSE_HOOK_WORKERS,
+    queue_size=settings.AFTER_RESPONSE_HOOK_QUEUE_SIZE,
+    overflow=settings.AFTER_RESPONSE_HOOK_OVERFLOW,
+)
+
+
+def process_step(step: models.HookStep, extra_context: dict):
+    action: Callable = process_action[step.action]
+    with HOOK_DURATION.labels(action=step.action, lifecycle=step.lifecycle).time():
+        action(**extra_context, **step._asdict())
+
+
+def _split_into_batches(steps: tuple[models.HookStep, ...]) -> Iterator[list[models.HookStep]]:
+    # adjacent webhooks are sent at the same time, the other hooks run one by one in between
+    for is_webhook, group in itertools.groupby(steps, key=lambda step: step.action == enums.Action.WEBHOOK):
+        if is_webhook:
+            yield list(group)
+        else:
+            yield from ([step] for step in group)
+
+
+def process_hook(
+    steps: tuple[models.HookStep, ...], on_step_done: Callable[[int], None] | None = None, **extra_context
+):
+    position = 0
+    for batch in _split_into_batches(steps):
+        indexes = range(position, position + len(batch))
+        position += len(batch)
+        if len(batch) == 1:
+            process_step(batch[0], extra_context)
+            if on_step_done:
+                on_step_done(indexes[0])
+            continue
+        # every webhook of the batch is waited for, so the ones delivered are reported even if another one fails
+        futures = [webhook_executor.submit(process_step, step, extra_context) for step in batch]
+        error = None
+        for index, future in zip(indexes, futures):
+            try:
+                future.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if on_step_done:
+                on_step_done(index)
+        if error:
+            raise error
+    logger.debug('Hooks processed!')
 
 
-def process_hook(hooks: QuerySet[models.ResourceHook], **extra_context):
-    for hook in hooks:
-        _context = _get_hook_context(hook, extra_context)
-        action: Callable = process_action[hook.action]
-        action(**_context)
-    logger.debug('Hooks processed!')
+def before_request(resource: models.ResourceStub, request_log_id: UUID | None = None):
+    return process_hook(
+        steps=resource.hook_plan.before_request,
+        application_id=resource.application_id,
+        request_log_id=request_log_id,
+    )
 
 
-def before_request(resource: models.ResourceStub):
-    hooks = resource.hooks.filter(lifecycle=enums.Lifecycle.BEFORE_REQUEST)
-    return process_hook(hooks=hooks)
+def after_request(resource: models.ResourceStub, request_log_id: UUID | None = None):
+    return process_hook(
+        steps=resource.hook_plan.after_request,
+        application_id=resource.application_id,
+        request_log_id=request_log_id,
+    )
 
 
-def after_request(resource: models.ResourceStub):
-    hooks = resource.hooks.filter(lifecycle=enums.Lifecycle.AFTER_REQUEST)
-    return process_hook(hooks=hooks)
+def after_response(resource: models.ResourceStub, request_log_id: UUID | None = None):
+    steps = resource.hook_plan.after_response
+    if not steps:
+        return
+    if settings.AFTER_RESPONSE_HOOK_BACKEND == HookBackend.DATABASE:
+        defer_hooks(steps, application_id=resource.application_id, request_log_id=request_log_id)
+    else:
+        after_response_executor.submit(
+            process_hook,
+            steps=steps,
+            threading_mode=True,
+            application_id=resource.application_id,
+            request_log_id=request_log_id,
+        )
+
+
+def defer_hooks(
+    steps: tuple[models.HookStep, ...],
+    application_id: UUID | None = None,
+    request_log_id: UUID | None = None,
+) -> models.HookJob:
+    """Save the hook steps as a job for the `run_hook_worker` command.
+
+    Args:
+        steps: hook steps run one after another.
+        application_id: primary key of the application the hooks belong to.
+        request_log_id: id of the log of the request triggered the hooks.
+
+    Returns:
+        HookJob instance.
+    """
+    return models.HookJob.objects.create(
+        available_at=timezone.now(),
+        steps=[_dump_step(step) for step in steps],
+        application_id=application_id,
+        request_log_id=request_log_id,
+    )
 
 
-@run_in_separate_thread
-def after_response(resource_pk: str):
-    resource = models.ResourceStub.objects.get(pk=resource_pk)
-    hooks = resource.hooks.filter(lifecycle=enums.Lifecycle.AFTER_RESPONSE)
-    return process_hook(hooks=hooks, threading_mode=True)
+def _dump_step(step: models.HookStep) -> dict[str, Any]:
+    return {
+        name: dict(value) if isinstance(value, MappingProxyType) else value for name, value in step._asdict().items()
+    }
@@ -76,7 +76,7 @@ class LogsInline(mixins.DenyCUDMixin, admin.TabularInline):
             return default_queryset
         queryset = default_queryset.filter(application_id=application_id)
         ids = queryset.order_by('-created_at').values('pk')[: settings.REQUEST_LOGS_INLINE_LIMIT]
-        return self.model.objects.filter(pk__in=ids).order_by('-created_at')
+        return self.model.objects.filter(pk__in=ids).select_related('resource').order_by('-created_at')
 
     @staticmethod
     @admin.display(description='Remote IP/X-Real-IP')
@@ -92,3 +92,25 @@ class LogsInline(mixins.DenyCUDMixin, admin.TabularInline):
             String containing the client's IP addresses.
         """
         return f'{obj.ipaddress}/{obj.x_real_ip}'
+
+
+class WebhookDeliveriesInline(mixins.DenyCUDMixin, admin.TabularInline):
+    model = models.WebhookDelivery
+    fk_name = 'request_log'
+    classes = ('collapse',)
+    fields = (
+        'created_at',
+        'lifecycle',
+        'method',
+        'url',
+        'attempt',
+        'status_code',
+        'response_size',
+        'dns_time',
+        'connect_time',
+        'total_time',
+        'error',
+    )
+    readonly_fields = fields
+    ordering = ('created_at',)
+    extra = 0
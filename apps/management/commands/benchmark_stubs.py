@@ -0,0 +1,102 @@
+import json
+import random
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from faker import Faker
+
+from apps.benchmark import (
+    clean_up,
+    compare_results,
+    count_queries,
+    get_worker_rss,
+    run_load,
+    run_stub_server,
+    run_upstream,
+    seed_applications,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure the throughput and the latency of the stub responses under a concurrent load.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Number of the concurrent clients.')
+        parser.add_argument(
+            '--url',
+            help='Base URL of a running Stubborn instance using the same database, i.e. http://127.0.0.1:8000. '
+            'The stubs are served by this process if not set.',
+        )
+        parser.add_argument('--pidfile', help='uWSGI master pidfile to report the RSS of the workers serving the URL.')
+        parser.add_argument('--output', default='benchmark.json', help='Result file.')
+        parser.add_argument('--baseline', help='Result file of an earlier run to compare with.')
+        parser.add_argument(
+            '--tolerance', type=float, default=10, help='Allowed throughput and latency regression, percent.'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed of the templated bodies.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Seed the benchmark application, load every its resource and write the results.
+
+        Scenarios: static JSON, templated JSON with fake data, XML, hooks (wait and webhook) and a proxy to a local
+        stand-in upstream. The benchmark application is removed afterwards.
+
+        Args:
+            args: positional command arguments (not used, interface requirement).
+            options: named command arguments.
+
+        Raises:
+            CommandError if the results are worse than the baseline.
+        """
+        random.seed(options['seed'])
+        Faker.seed(options['seed'])
+
+        with ExitStack() as stack:
+            upstream_url = stack.enter_context(run_upstream())
+            base_url = options['url'] or stack.enter_context(run_stub_server())
+            stack.callback(clean_up)
+            scenarios = seed_applications(upstream_url=upstream_url)
+
+            results: dict[str, Any] = {
+                'created_at': datetime.now().isoformat(timespec='seconds'),
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'scenarios': {},
+            }
+            for scenario in scenarios:
+                stats = run_load(
+                    base_url=base_url,
+                    scenario=scenario,
+                    requests_number=options['requests'],
+                    concurrency=options['concurrency'],
+                )
+                stats['queries_per_request'] = count_queries(scenario)
+                results['scenarios'][scenario.name] = stats
+                self.stdout.write(
+                    f'{scenario.name:<16} {stats["rps"]:>8} RPS  p50 {stats["p50"]:>8} ms  p95 {stats["p95"]:>8} ms  '
+                    f'p99 {stats["p99"]:>8} ms  {stats["queries_per_request"]:g} queries/request  '
+                    f'{stats["errors"]} errors'
+                )
+
+        results['worker_rss_mb'] = get_worker_rss(pidfile=options['pidfile'] if options['url'] else None)
+        self.stdout.write(f'Worker RSS, MB: {results["worker_rss_mb"]}')
+
+        with open(options['output'], 'w') as output:
+            json.dump(results, output, indent=2)
+        self.stdout.write(f'Results are written to {options["output"]}.')
+
+        if not options['baseline']:
+            return
+        with open(options['baseline']) as baseline:
+            regressions = compare_results(results, json.load(baseline), tolerance=options['tolerance'])
+        if regressions:
+            raise CommandError('Slower than the baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
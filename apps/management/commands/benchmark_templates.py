@@ -0,0 +1,95 @@
+import json
+import random
+import tempfile
+import timeit
+import uuid
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+from faker import Faker
+from jinja2 import Template
+
+from apps.templating import TemplateCache
+
+SMALL_TEMPLATE = '{"id": "{{ random.randint(1, 100500) }}", "status": "OK"}'
+
+
+def make_large_template(size: int) -> str:
+    """Compose a JSON body template of the given size with a template tag in every record.
+
+    Args:
+        size: desired template size in bytes.
+
+    Returns:
+        Template source.
+    """
+    records = []
+    total_size = 0
+    while total_size < size:
+        record = json.dumps({'id': str(uuid.uuid4()), 'description': 'lorem ipsum ' * 4})
+        record = record[:-1] + ', "value": {{ random.randint(1, 100) }}}'
+        records.append(record)
+        total_size += len(record) + 2
+    return '[' + ', '.join(records) + ']'
+
+
+class Command(BaseCommand):
+    help = 'Measure the response body template rendering cost with and without the compiled templates cache.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument('--iterations', type=int, default=200, help='Renders per measurement.')
+        parser.add_argument('--large-size', type=int, default=100 * 1024, help='Large template size in bytes.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Render the small and the large templates in three modes and print the average render time.
+
+        Modes:
+            - uncached: a new `jinja2.Template` for every render (how it was done before);
+            - cold worker: compiled templates are loaded from the bytecode cache filled by another worker;
+            - cached: compiled templates are taken from the in-memory cache.
+        """
+        iterations = options['iterations']
+        context = {'fake': Faker(), 'random': random}
+        templates = {
+            'small': SMALL_TEMPLATE,
+            f'{options["large_size"] // 1024} KB': make_large_template(options['large_size']),
+        }
+
+        with tempfile.TemporaryDirectory() as bytecode_cache_dir:
+            for name, source in templates.items():  # fill the bytecode cache like another worker did
+                TemplateCache(size=1, bytecode_cache_dir=bytecode_cache_dir).get_template(name, name, source)
+
+            for name, source in templates.items():
+                cache = TemplateCache(size=1)
+
+                def uncached() -> str:
+                    return Template(source).render(**context)
+
+                def cold_worker() -> str:
+                    worker_cache = TemplateCache(size=1, bytecode_cache_dir=bytecode_cache_dir)
+                    return worker_cache.get_template(name, name, source).render(**context)
+
+                def cached() -> str:
+                    return cache.get_template(name, name, source).render(**context)
+
+                self.stdout.write(f'{name} template ({len(source)} bytes):')
+                self.report('uncached', uncached, iterations)
+                self.report('cold worker', cold_worker, iterations)
+                self.report('cached', cached, iterations)
+
+    def report(self, mode: str, func: Callable[[], str], iterations: int) -> None:
+        """Print the average run time of the function.
+
+        Args:
+            mode: measurement name.
+            func: function to measure.
+            iterations: number of runs.
+        """
+        func()  # warm up
+        elapsed = timeit.timeit(func, number=iterations)
+        self.stdout.write(f'  {mode:<12} {elapsed / iterations * 1000:10.3f} ms per render')
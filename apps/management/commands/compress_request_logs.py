@@ -0,0 +1,87 @@
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db.models import Q
+from django.db.models.functions import Length
+
+from apps.models import RequestLog
+from apps.utils import pack_text
+
+
+class Command(BaseCommand):
+    help = 'Compress the bodies of the existing request logs longer than the compression threshold'
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger('django.management')
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument('--batch-size', type=int, default=1000, help='Number of the logs updated at once.')
+        parser.add_argument(
+            '--threshold',
+            type=int,
+            default=settings.REQUEST_LOG_COMPRESSION_THRESHOLD,
+            help='Min length of the compressed bodies (REQUEST_LOG_COMPRESSION_THRESHOLD by default).',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Compress the request and response bodies of the request logs batch by batch.
+
+        Every batch is updated in its own query, so the command can be interrupted and run again at any moment.
+
+        Args:
+            args: positional command arguments (not used, interface requirement).
+            options: named command arguments.
+
+        Raises:
+            CommandError if the compression threshold is not set.
+        """
+        threshold, batch_size = options['threshold'], options['batch_size']
+        if threshold <= 0:
+            raise CommandError('The compression threshold must be positive.')
+
+        logs = (
+            RequestLog.objects.annotate(
+                request_body_length=Length('request_body'), response_body_length=Length('response_body')
+            )
+            # the compressed bodies keep their searchable beginning in the plain text field, it is not compressed again
+            .filter(
+                Q(request_body_compressed__isnull=True, request_body_length__gt=threshold)
+                | Q(response_body_compressed__isnull=True, response_body_length__gt=threshold)
+            )
+            .only('id', 'request_body', 'response_body', 'request_body_compressed', 'response_body_compressed')
+            .order_by('pk')
+        )
+
+        compressed_count = 0
+        last_pk = None
+        while True:
+            batch = list((logs.filter(pk__gt=last_pk) if last_pk else logs)[:batch_size])
+            if not batch:
+                break
+
+            for log in batch:
+                if log.request_body_compressed is None and log.request_body and len(log.request_body) > threshold:
+                    log.request_body, log.request_body_compressed, _ = pack_text(
+                        log.request_body, 0, threshold, settings.REQUEST_LOG_SEARCHABLE_LENGTH
+                    )
+                if log.response_body_compressed is None and log.response_body and len(log.response_body) > threshold:
+                    log.response_body, log.response_body_compressed, _ = pack_text(
+                        log.response_body, 0, threshold, settings.REQUEST_LOG_SEARCHABLE_LENGTH
+                    )
+            RequestLog.objects.bulk_update(
+                batch, fields=['request_body', 'response_body', 'request_body_compressed', 'response_body_compressed']
+            )
+
+            compressed_count += len(batch)
+            last_pk = batch[-1].pk
+            self.logger.info(f'{compressed_count} request logs compressed...')
+
+        self.stdout.write(f'Compressed {compressed_count} request logs.')
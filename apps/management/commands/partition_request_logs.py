@@ -0,0 +1,72 @@
+import logging
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+
+from apps import partitioning
+from apps.retention import delete_orphan_blobs
+
+
+class Command(BaseCommand):
+    help = 'Partition the request log table by the creation time, create the next partitions and drop expired ones'
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger('django.management')
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument(
+            '--interval',
+            choices=list(partitioning.INTERVALS),
+            default=settings.REQUEST_LOG_PARTITION_INTERVAL or None,
+            help='Partition interval (REQUEST_LOG_PARTITION_INTERVAL by default).',
+        )
+        parser.add_argument('--ahead', type=int, default=7, help='Number of the future partitions to create.')
+        parser.add_argument(
+            '--retention-days',
+            type=int,
+            default=settings.REQUEST_LOG_RETENTION_DAYS,
+            help='Remove the logs older than this number of days (REQUEST_LOG_RETENTION_DAYS by default).',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Logs deleted at once (no partitioning).')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Partition the table (on the first run), create the future partitions and remove the expired logs.
+
+        Supposed to be run daily. Without PostgreSQL or the partition interval set, the expired logs are deleted in
+        batches.
+
+        Args:
+            args: positional command arguments (not used, interface requirement).
+            options: named command arguments.
+
+        Raises:
+            CommandError if there is nothing to do.
+        """
+        interval, retention_days = options['interval'], options['retention_days']
+        if not interval and not retention_days:
+            raise CommandError('Neither the partition interval nor the retention period is set.')
+
+        if interval and not partitioning.is_supported():
+            self.logger.warning('Partitioning is supported by PostgreSQL only, expired logs will be deleted.')
+        elif interval and not partitioning.is_partitioned():
+            self.logger.info(f'Partitioning the request log table by {interval}...')
+            partitioning.partition_table(interval=interval, ahead=options['ahead'])
+        elif interval:
+            partitioning.create_future_partitions(interval=interval, ahead=options['ahead'])
+
+        if retention_days:
+            moment = timezone.now() - timedelta(days=retention_days)
+            removed = partitioning.remove_logs_before(moment=moment, batch_size=options['batch_size'])
+            self.stdout.write(f'Removed {removed} request logs created before {moment:%Y-%m-%d %H:%M}.')
+            # the blobs of the dropped partitions are not deleted with them
+            blobs = delete_orphan_blobs(chunk_size=options['batch_size'], sleep=0)
+            self.stdout.write(f'Removed {blobs} unused log blobs.')
@@ -0,0 +1,59 @@
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from apps.retention import PRUNE_LOCK_ID, advisory_lock, prune_request_logs
+
+
+class Command(BaseCommand):
+    help = 'Delete the request logs older than the retention period of their applications'
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger('django.management')
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.REQUEST_LOG_PRUNE_CHUNK_SIZE,
+            help='Number of the logs deleted with one query (REQUEST_LOG_PRUNE_CHUNK_SIZE by default).',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=settings.REQUEST_LOG_PRUNE_SLEEP,
+            help='Pause between the delete queries in seconds (REQUEST_LOG_PRUNE_SLEEP by default).',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Report the expired logs without deleting them.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Delete the expired request logs in chunks and report the deletion rate and the remaining backlog.
+
+        Args:
+            args: positional command arguments (not used, interface requirement).
+            options: named command arguments.
+
+        Raises:
+            CommandError if the logs are being pruned by another process.
+        """
+        with advisory_lock(PRUNE_LOCK_ID) as acquired:
+            if not acquired:
+                raise CommandError('The request logs are being pruned by another process.')
+            reports = prune_request_logs(
+                chunk_size=options['chunk_size'], sleep=options['sleep'], dry_run=options['dry_run']
+            )
+
+        for report in reports:
+            self.stdout.write(
+                f'{report.application.name} ({report.application.slug}): {report.deleted} logs deleted in '
+                f'{report.elapsed:.1f} s ({report.rate:.0f} logs/s), {report.backlog} expired logs left.'
+            )
+        self.stdout.write(f'Deleted {sum(report.deleted for report in reports)} request logs.')
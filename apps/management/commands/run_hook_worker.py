@@ -0,0 +1,72 @@
+import logging
+import signal
+import threading
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.hook_jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Run the after-response hooks deferred to the job table (AFTER_RESPONSE_HOOK_BACKEND=database)'
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.logger = logging.getLogger('django.management')
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add arguments to the parser.
+
+        Args:
+            parser: CommandParser
+        """
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=settings.HOOK_WORKER_CONCURRENCY,
+            help='Number of the jobs run at the same time (HOOK_WORKER_CONCURRENCY by default).',
+        )
+        parser.add_argument(
+            '--lease',
+            type=int,
+            default=settings.HOOK_JOB_LEASE,
+            help='Seconds a claimed job is hidden from other workers (HOOK_JOB_LEASE by default).',
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=settings.HOOK_JOB_MAX_ATTEMPTS,
+            help='Number of the runs of a failing job before it is dropped (HOOK_JOB_MAX_ATTEMPTS by default).',
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Pause between the job checks in seconds.')
+        parser.add_argument('--once', action='store_true', help='Exit once there are no available jobs.')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Claim and run the hook jobs until SIGINT or SIGTERM, the running jobs are finished before exiting.
+
+        Args:
+            args: positional command arguments (not used, interface requirement).
+            options: named command arguments.
+        """
+        stop = threading.Event()
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                handlers[signal_number] = signal.signal(signal_number, lambda *_: stop.set())
+
+        self.logger.info(f'Hook worker started, concurrency {options["concurrency"]}.')
+        try:
+            done_jobs = run_worker(
+                concurrency=options['concurrency'],
+                lease=options['lease'],
+                max_attempts=options['max_attempts'],
+                poll_interval=options['poll_interval'],
+                once=options['once'],
+                stop=stop,
+            )
+        finally:
+            for signal_number, handler in handlers.items():
+                signal.signal(signal_number, handler)
+        self.stdout.write(f'Hook worker stopped, {done_jobs} jobs done.')
@@ -0,0 +1,162 @@
+import atexit
+import os
+import threading
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from prometheus_client.core import REGISTRY
+
+MULTIPROC_DIR_VAR = 'PROMETHEUS_MULTIPROC_DIR'
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUESTS = Counter(
+    'stubborn_requests',
+    'Stub requests served.',
+    ['application', 'resource', 'method', 'status', 'response_type'],
+)
+REQUEST_DURATION = Histogram(
+    'stubborn_request_duration_seconds',
+    'Stub request handling time.',
+    ['application', 'resource', 'method', 'response_type'],
+    buckets=LATENCY_BUCKETS,
+)
+PROXY_DURATION = Histogram(
+    'stubborn_proxy_duration_seconds',
+    'Response time of the proxied requests by the destination host.',
+    ['host'],
+    buckets=LATENCY_BUCKETS,
+)
+HOOK_DURATION = Histogram(
+    'stubborn_hook_duration_seconds',
+    'Hook execution time by the action and the lifecycle stage.',
+    ['action', 'lifecycle'],
+    buckets=LATENCY_BUCKETS,
+)
+QUEUE_DEPTH = Gauge(
+    'stubborn_writer_queue_depth',
+    'Objects waiting for the background writer.',
+    ['model'],
+    multiprocess_mode='livesum',
+)
+QUEUE_DROPPED = Counter('stubborn_writer_dropped', 'Objects dropped because of the writer queue overflow.', ['model'])
+CACHE_LOOKUPS = Counter('stubborn_cache_lookups', 'In-memory cache lookups.', ['cache', 'result'])
+EXECUTOR_QUEUE_DEPTH = Gauge(
+    'stubborn_executor_queue_depth',
+    'Tasks waiting for the background executor.',
+    ['executor'],
+    multiprocess_mode='livesum',
+)
+EXECUTOR_DROPPED = Counter(
+    'stubborn_executor_dropped', 'Tasks dropped because of the executor queue overflow.', ['executor']
+)
+EXECUTOR_TASK_WAIT = Histogram(
+    'stubborn_executor_task_wait_seconds',
+    'Time the tasks spent in the executor queue.',
+    ['executor'],
+    buckets=LATENCY_BUCKETS,
+)
+EXECUTOR_TASK_DURATION = Histogram(
+    'stubborn_executor_task_duration_seconds',
+    'Task execution time.',
+    ['executor'],
+    buckets=LATENCY_BUCKETS,
+)
+
+_dead_process_marker_pid: int | None = None
+_dead_process_marker_lock = threading.Lock()
+
+
+def is_multiprocess() -> bool:
+    """Check if the metrics are collected from the files shared by the worker processes.
+
+    Returns:
+        True if the PROMETHEUS_MULTIPROC_DIR environment variable is set.
+    """
+    return bool(os.environ.get(MULTIPROC_DIR_VAR))
+
+
+def _mark_process_dead_at_exit() -> None:
+    # live gauges of the exited workers must not be summed up, the forked workers register it for their own pid
+    global _dead_process_marker_pid
+    if not is_multiprocess() or _dead_process_marker_pid == os.getpid():
+        return
+    with _dead_process_marker_lock:
+        if _dead_process_marker_pid != os.getpid():
+            _dead_process_marker_pid = os.getpid()
+            atexit.register(multiprocess.mark_process_dead, os.getpid())
+
+
+def observe_request(
+    application: str, resource: str, method: str, status: int, response_type: str, duration: float
+) -> None:
+    """Count the served stub request and its handling time.
+
+    Args:
+        application: application slug.
+        resource: resource path, i.e. `users/active`.
+        method: HTTP method.
+        status: response status code.
+        response_type: resource response type.
+        duration: handling time in seconds.
+    """
+    REQUESTS.labels(
+        application=application, resource=resource, method=method, status=status, response_type=response_type
+    ).inc()
+    REQUEST_DURATION.labels(
+        application=application, resource=resource, method=method, response_type=response_type
+    ).observe(duration)
+
+
+def observe_cache_lookup(cache: str, hit: bool) -> None:
+    """Count the cache lookup.
+
+    Args:
+        cache: cache name.
+        hit: True if the value was found in the cache.
+    """
+    CACHE_LOOKUPS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+def observe_queue_depth(model: str, depth: int) -> None:
+    """Set the number of the objects waiting for the background writer of the current worker.
+
+    Args:
+        model: model name.
+        depth: queue size.
+    """
+    _mark_process_dead_at_exit()
+    QUEUE_DEPTH.labels(model=model).set(depth)
+
+
+def observe_executor_depth(executor: str, depth: int) -> None:
+    """Set the number of the tasks waiting for the background executor of the current worker.
+
+    Args:
+        executor: executor name.
+        depth: queue size.
+    """
+    _mark_process_dead_at_exit()
+    EXECUTOR_QUEUE_DEPTH.labels(executor=executor).set(depth)
+
+
+def get_registry() -> CollectorRegistry:
+    """Get the registry of the metrics to expose.
+
+    Returns:
+        Registry collecting the metrics of all the workers if PROMETHEUS_MULTIPROC_DIR is set, the registry of the
+        current process otherwise.
+    """
+    if not is_multiprocess():
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> bytes:
+    """Render the metrics in the Prometheus text format.
+
+    Returns:
+        Exposition text.
+    """
+    return generate_latest(get_registry())
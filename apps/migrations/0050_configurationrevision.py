@@ -0,0 +1,24 @@
+# Generated by Django 3.2.23 on 2026-10-17 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0049_auto_20240421_1847'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConfigurationRevision',
+            fields=[
+                ('application_id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('revision', models.PositiveBigIntegerField(default=0, verbose_name='Revision')),
+            ],
+            options={
+                'verbose_name': 'configuration revision',
+                'verbose_name_plural': 'configuration revisions',
+            },
+        ),
+    ]
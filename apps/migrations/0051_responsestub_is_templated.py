@@ -0,0 +1,32 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:01
+
+from django.db import migrations, models
+from jinja2 import Environment, TemplateSyntaxError
+
+
+def classify_response_bodies(apps, schema_editor):
+    environment = Environment()
+    response_model = apps.get_model('apps', 'ResponseStub')
+    for response in response_model.objects.all():
+        try:
+            tokens = environment.lex(response.body) if response.body else []
+            response.is_templated = any(token_type != 'data' for _, token_type, _ in tokens)
+        except TemplateSyntaxError:
+            response.is_templated = True
+        response.save(update_fields=('is_templated',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0050_configurationrevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='responsestub',
+            name='is_templated',
+            field=models.BooleanField(default=True, editable=False, verbose_name='Templated'),
+        ),
+        migrations.RunPython(classify_response_bodies, migrations.RunPython.noop),
+    ]
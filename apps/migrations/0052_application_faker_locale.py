@@ -0,0 +1,19 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:10
+
+import apps.fake_data
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0051_responsestub_is_templated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='faker_locale',
+            field=models.CharField(blank=True, help_text='Locale of the fake data in the templated bodies (i.e. de_DE), default locale is used if not set.', max_length=10, null=True, validators=[apps.fake_data.validate_faker_locale], verbose_name='Fake data locale'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:20
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0052_application_faker_locale'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='log_policy',
+            field=models.CharField(choices=[('full', 'Full'), ('metadata', 'Metadata only'), ('sampled', 'Sampled'), ('errors', 'Errors only'), ('off', 'Off')], default='full', max_length=10, verbose_name='Request logging'),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='log_sample_rate',
+            field=models.FloatField(default=100, help_text='Percentage of the requests logged with the sampled policy, i.e. 1 for 1 in 100 requests.', validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='Logged requests, %'),
+        ),
+        migrations.AddField(
+            model_name='resourcestub',
+            name='log_policy',
+            field=models.CharField(choices=[('inherit', 'Same as application'), ('full', 'Full'), ('metadata', 'Metadata only'), ('sampled', 'Sampled'), ('errors', 'Errors only'), ('off', 'Off')], default='inherit', max_length=10, verbose_name='Request logging'),
+        ),
+        migrations.AddField(
+            model_name='resourcestub',
+            name='log_sample_rate',
+            field=models.FloatField(blank=True, help_text='Percentage of the requests logged with the sampled policy, the application one is used if not set.', null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='Logged requests, %'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0053_request_log_policy'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestlog',
+            name='is_truncated',
+            field=models.BooleanField(default=False, verbose_name='Truncated'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='request_body_compressed',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Compressed Request Body'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='response_body_compressed',
+            field=models.BinaryField(blank=True, null=True, verbose_name='Compressed Response Body'),
+        ),
+    ]
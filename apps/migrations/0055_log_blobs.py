@@ -0,0 +1,37 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0054_request_log_compressed_bodies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogBlob',
+            fields=[
+                ('hash', models.CharField(max_length=64, primary_key=True, serialize=False, verbose_name='SHA-256')),
+                ('content', models.TextField(blank=True, null=True, verbose_name='Content')),
+                ('content_compressed', models.BinaryField(blank=True, null=True, verbose_name='Compressed Content')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+            ],
+            options={
+                'verbose_name': 'log blob',
+                'verbose_name_plural': 'log blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='request_body_blob',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='apps.logblob'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='response_body_blob',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='apps.logblob'),
+        ),
+    ]
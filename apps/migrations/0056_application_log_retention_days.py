@@ -0,0 +1,18 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0055_log_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='log_retention_days',
+            field=models.PositiveIntegerField(blank=True, help_text='Older request logs are deleted, 0 keeps them forever. The default period is used if not set.', null=True, verbose_name='Keep request logs, days'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 3.2.23 on 2026-10-17 01:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0056_application_log_retention_days'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='requestlog',
+            name='application',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='apps.application'),
+        ),
+        migrations.AlterField(
+            model_name='requestlog',
+            name='resource',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='apps.resourcestub'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['-created_at'], name='requestlog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['application', '-created_at'], name='requestlog_app_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['application', 'status_code', '-created_at'], name='requestlog_app_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['resource', '-created_at'], name='requestlog_resource_idx'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+# keep in sync with apps.search.TrigramSearchBackend.document, the index is only used by the same expression
+POSTGRES_DOCUMENT = (
+    "id::text || ' ' || COALESCE(url, '') || ' ' || COALESCE(params::text, '') || ' ' || "
+    "COALESCE(request_headers::text, '') || ' ' || COALESCE(request_body, '') || ' ' || "
+    "COALESCE(response_headers::text, '') || ' ' || COALESCE(response_body, '') || ' ' || "
+    "COALESCE(host(ipaddress), '') || ' ' || COALESCE(host(x_real_ip), '')"
+)
+
+SQLITE_DOCUMENT = (
+    "NEW.id || ' ' || COALESCE(NEW.url, '') || ' ' || COALESCE(NEW.params, '') || ' ' || "
+    "COALESCE(NEW.request_headers, '') || ' ' || COALESCE(NEW.request_body, '') || ' ' || "
+    "COALESCE((SELECT content FROM apps_logblob WHERE hash = NEW.request_body_blob_id), '') || ' ' || "
+    "COALESCE(NEW.response_headers, '') || ' ' || COALESCE(NEW.response_body, '') || ' ' || "
+    "COALESCE((SELECT content FROM apps_logblob WHERE hash = NEW.response_body_blob_id), '') || ' ' || "
+    "COALESCE(NEW.ipaddress, '') || ' ' || COALESCE(NEW.x_real_ip, '')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+            if cursor.fetchone() is None:  # the search works without the indexes, though it scans the whole table
+                return
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX requestlog_search_idx ON apps_requestlog USING gin (({POSTGRES_DOCUMENT}) gin_trgm_ops)'
+        )
+        schema_editor.execute('CREATE INDEX logblob_search_idx ON apps_logblob USING gin (content gin_trgm_ops)')
+    elif vendor == 'sqlite':
+        # the search rows share the rowid with the logs, a migration remaking the log table has to rebuild them
+        schema_editor.execute("CREATE VIRTUAL TABLE apps_requestlog_search USING fts5(document, tokenize='trigram')")
+        insert = f'INSERT INTO apps_requestlog_search (rowid, document) VALUES (NEW.rowid, {SQLITE_DOCUMENT});'
+        delete = 'DELETE FROM apps_requestlog_search WHERE rowid = OLD.rowid;'
+        for event, body in (('INSERT', insert), ('UPDATE', delete + insert), ('DELETE', delete)):
+            schema_editor.execute(
+                f'CREATE TRIGGER apps_requestlog_search_{event.lower()} AFTER {event} ON apps_requestlog '
+                f'BEGIN {body} END'
+            )
+        schema_editor.execute(
+            f'INSERT INTO apps_requestlog_search (rowid, document) '
+            f'SELECT NEW.rowid, {SQLITE_DOCUMENT} FROM apps_requestlog NEW'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS requestlog_search_idx')
+        schema_editor.execute('DROP INDEX IF EXISTS logblob_search_idx')
+    elif vendor == 'sqlite':
+        for event in ('insert', 'update', 'delete'):
+            schema_editor.execute(f'DROP TRIGGER apps_requestlog_search_{event}')
+        schema_editor.execute('DROP TABLE apps_requestlog_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0057_request_log_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 3.2.23 on 2026-10-17 02:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0058_request_log_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestlog',
+            name='duration',
+            field=models.FloatField(blank=True, null=True, verbose_name='Duration (ms)'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='timings',
+            field=models.JSONField(blank=True, default=dict, null=True, verbose_name='Timings (ms)'),
+        ),
+    ]
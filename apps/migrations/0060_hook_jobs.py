@@ -0,0 +1,28 @@
+# Generated by Django 3.2.23 on 2026-10-17 03:05
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0059_request_log_timings'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HookJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created at')),
+                ('available_at', models.DateTimeField(db_index=True, verbose_name='Available at')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('steps', models.JSONField(default=list, verbose_name='Hook steps')),
+            ],
+            options={
+                'verbose_name': 'hook job',
+                'verbose_name_plural': 'hook jobs',
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.23 on 2026-10-17 03:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0060_hook_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hookjob',
+            name='application_id',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Application'),
+        ),
+        migrations.AddField(
+            model_name='hookjob',
+            name='request_log_id',
+            field=models.UUIDField(blank=True, null=True, verbose_name='Request log'),
+        ),
+        migrations.CreateModel(
+            name='WebhookDelivery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created at')),
+                ('lifecycle', models.CharField(choices=[('before', 'Before request processed'), ('after_req', 'After request processed'), ('after_resp', 'After response returned')], max_length=10, verbose_name='Lifecycle')),
+                ('method', models.CharField(choices=[('GET', 'GET'), ('POST', 'POST'), ('PUT', 'PUT'), ('PATCH', 'PATCH'), ('DELETE', 'DELETE'), ('HEAD', 'HEAD'), ('OPTIONS', 'OPTIONS')], max_length=10, verbose_name='HTTP Method')),
+                ('url', models.URLField(max_length=2048, verbose_name='URL')),
+                ('attempt', models.PositiveSmallIntegerField(default=1, verbose_name='Attempt')),
+                ('status_code', models.IntegerField(blank=True, null=True, verbose_name='Status Code')),
+                ('response_size', models.PositiveIntegerField(blank=True, null=True, verbose_name='Response size (bytes)')),
+                ('dns_time', models.FloatField(blank=True, null=True, verbose_name='DNS (ms)')),
+                ('connect_time', models.FloatField(blank=True, null=True, verbose_name='Connect (ms)')),
+                ('total_time', models.FloatField(blank=True, null=True, verbose_name='Total (ms)')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('application', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='webhook_deliveries', to='apps.application')),
+                ('request_log', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='webhook_deliveries', to='apps.requestlog')),
+            ],
+            options={
+                'verbose_name': 'webhook delivery',
+                'verbose_name_plural': 'webhook deliveries',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='webhookdelivery',
+            index=models.Index(fields=['application', '-created_at'], name='webhookdelivery_app_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.23 on 2026-10-17 03:54
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apps', '0061_webhook_deliveries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='logblob',
+            name='last_used_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name='Last used at'),
+        ),
+    ]
@@ -1,6 +1,11 @@
+import hashlib
+import json
 import os.path
 import random
 import uuid
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Iterable, Mapping, NamedTuple
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
@@ -8,14 +13,25 @@ from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator, URLValidator
 from django.db import models
 from django.db.models import UniqueConstraint
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
-from faker import Faker
-from jinja2 import Template
 from rest_framework.renderers import BaseRenderer, JSONRenderer
 
-from apps.enums import Action, BodyFormat, HTTPMethods, InviterChoices, Lifecycle, ResponseChoices, TeamChoices
+from apps.enums import (
+    Action,
+    BodyFormat,
+    HTTPMethods,
+    InviterChoices,
+    Lifecycle,
+    LogPolicy,
+    ResponseChoices,
+    TeamChoices,
+)
+from apps.fake_data import faker_pool, validate_faker_locale
 from apps.renderers import SimpleTextRenderer, TextToXMLRenderer
-from apps.utils import is_json, str_to_dom_document
+from apps.templating import is_template, template_cache
+from apps.utils import is_json, pack_text, str_to_dom_document, unpack_text
 
 
 class BaseStubModel(models.Model):
@@ -27,6 +43,30 @@ class BaseStubModel(models.Model):
         abstract = True
 
 
+class EncodedBody(NamedTuple):
+    text: str
+    content: bytes
+    content_type: str | None
+
+
+class HookStep(NamedTuple):
+    action: str
+    lifecycle: str
+    timeout: int
+    headers: Mapping[str, str] | None
+    body: str | None
+    method: str | None
+    uri: str | None
+    format: str | None
+    query_params: Mapping[str, Any] | None
+
+
+class HookPlan(NamedTuple):
+    before_request: tuple[HookStep, ...] = ()
+    after_request: tuple[HookStep, ...] = ()
+    after_response: tuple[HookStep, ...] = ()
+
+
 class AbstractHTTPObject(models.Model):
     body = models.TextField(verbose_name='Response Body', null=True, blank=True)
     description = models.CharField(max_length=30, verbose_name='Short Description', null=True, blank=True)
@@ -83,8 +123,23 @@ class AbstractHTTPObject(models.Model):
         if not self.body:
             return ''
 
-        jinja_template = Template(self.body)
-        return jinja_template.render(fake=Faker(), random=random)
+        jinja_template = template_cache.get_template(
+            key=(self._meta.label, self.pk, getattr(self, 'updated_at', None)),
+            name=f'{self._meta.label}:{self.pk}',
+            source=self.body,
+        )
+        return jinja_template.render(fake=faker_pool.for_render(self.faker_locale), random=random)
+
+    @property
+    def faker_locale(self) -> str | None:
+        """Return the fake data locale of the application the object belongs to.
+
+        Returns:
+            Faker locale name if set for the application, None otherwise.
+        """
+        if not getattr(self, 'application_id', None):
+            return None
+        return getattr(self, 'application').faker_locale
 
 
 class User(AbstractUser):
@@ -106,6 +161,32 @@ class Application(BaseStubModel):
         related_name='applications',
     )
     is_enabled = models.BooleanField(verbose_name='Enabled', default=True, null=False)
+    faker_locale = models.CharField(
+        max_length=10,
+        verbose_name='Fake data locale',
+        help_text='Locale of the fake data in the templated bodies (i.e. de_DE), default locale is used if not set.',
+        null=True,
+        blank=True,
+        validators=[validate_faker_locale],
+    )
+    log_policy = models.CharField(
+        max_length=10,
+        choices=[(value, label) for value, label in LogPolicy.choices if value != LogPolicy.INHERIT],
+        default=LogPolicy.FULL.value,
+        verbose_name='Request logging',
+    )
+    log_sample_rate = models.FloatField(
+        verbose_name='Logged requests, %',
+        help_text='Percentage of the requests logged with the sampled policy, i.e. 1 for 1 in 100 requests.',
+        default=100,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    )
+    log_retention_days = models.PositiveIntegerField(
+        verbose_name='Keep request logs, days',
+        help_text='Older request logs are deleted, 0 keeps them forever. The default period is used if not set.',
+        null=True,
+        blank=True,
+    )
 
     class Meta:
         verbose_name = 'application'
@@ -173,6 +254,8 @@ class ResponseStub(AbstractHTTPObject, BaseStubModel):
         related_name='responses'
     )
 
+    is_templated = models.BooleanField(verbose_name='Templated', default=True, editable=False)
+
     class Meta:
         verbose_name = 'response'
         verbose_name_plural = 'responses'
@@ -187,6 +270,37 @@ class ResponseStub(AbstractHTTPObject, BaseStubModel):
             return f'{self.status_code} {self.description}'
         return f'{self.status_code}'
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        """Save the object classifying the body as static or templated."""
+        self.is_templated = is_template(self.body)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'body' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'is_templated'}
+        super().save(*args, **kwargs)
+
+    @cached_property
+    def encoded_body(self) -> EncodedBody:
+        """Render and encode the static response body once.
+
+        Produces exactly the same content and Content-Type as the Django REST Framework response rendered with
+        the response stub renderer does, so static bodies could be sent with no parsing and serialization.
+
+        Returns:
+            EncodedBody containing the body text, the encoded content and the content type (None if the
+            content type header must be dropped).
+        """
+        renderer = self.renderer
+        text = self.body_rendered
+        data = (json.loads(text) if text else None) if self.is_json_format else text
+        content = renderer.render(data, renderer.media_type, {})
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+
+        if isinstance(content, str):
+            content = content.encode(renderer.charset)
+        elif not content:
+            content_type = None
+        return EncodedBody(text=text, content=content, content_type=content_type)
+
 
 class RequestStub(AbstractHTTPObject, BaseStubModel):
     name = models.CharField(max_length=30, null=True, blank=True)
@@ -268,6 +382,16 @@ class ResourceStub(BaseStubModel):
     )
     is_enabled = models.BooleanField(verbose_name='Enabled', default=True, null=False)
     inject_stubborn_headers = models.BooleanField(verbose_name='Inject Stubborn Headers', default=False)
+    log_policy = models.CharField(
+        max_length=10, choices=LogPolicy.choices, default=LogPolicy.INHERIT.value, verbose_name='Request logging'
+    )
+    log_sample_rate = models.FloatField(
+        verbose_name='Logged requests, %',
+        help_text='Percentage of the requests logged with the sampled policy, the application one is used if not set.',
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0), MaxValueValidator(100)],
+    )
 
     class Meta:
         verbose_name = 'resource'
@@ -292,6 +416,38 @@ class ResourceStub(BaseStubModel):
         desc = f'{self.description[:10]}...' if len(self.description) > 10 else self.description[:10]
         return f'{self.slug} ({desc})'
 
+    @property
+    def active_log_policy(self) -> tuple[str, float]:
+        """Return the request logging policy of the resource, inherited from the application if not set.
+
+        Returns:
+            Logging policy and the percentage of the logged requests for the sampled policy.
+        """
+        sample_rate = self.log_sample_rate if self.log_sample_rate is not None else self.application.log_sample_rate
+        if self.log_policy == LogPolicy.INHERIT:
+            return self.application.log_policy, sample_rate
+        return self.log_policy, sample_rate
+
+    @cached_property
+    def hook_plan(self) -> HookPlan:
+        """Return the execution plan of the resource hooks.
+
+        Built from the prefetched hooks of the resources compiled into the route table (see apps.routing), loaded
+        with one query otherwise.
+
+        Returns:
+            HookPlan instance.
+        """
+        hooks = self.hooks.all()
+        if 'hooks' not in getattr(self, '_prefetched_objects_cache', {}):
+            hooks = hooks.select_related('request')
+        steps = [hook.as_step() for hook in hooks]
+        return HookPlan(
+            before_request=tuple(step for step in steps if step.lifecycle == Lifecycle.BEFORE_REQUEST),
+            after_request=tuple(step for step in steps if step.lifecycle == Lifecycle.AFTER_REQUEST),
+            after_response=tuple(step for step in steps if step.lifecycle == Lifecycle.AFTER_RESPONSE),
+        )
+
     def copy(self, application: Application) -> 'ResourceStub':
         """Creates a copy of ResourceStub object with its hooks.
 
@@ -358,6 +514,25 @@ class ResourceHook(BaseStubModel):
                 code='invalid',
             )
 
+    def as_step(self) -> HookStep:
+        """Return the hook as an execution plan step with the webhook request data inlined.
+
+        Returns:
+            HookStep instance.
+        """
+        request = self.request
+        return HookStep(
+            action=self.action,
+            lifecycle=self.lifecycle,
+            timeout=self.timeout,
+            headers=MappingProxyType(request.headers) if request else None,
+            body=request.body if request else None,
+            method=request.method if request else None,
+            uri=request.uri if request else None,
+            format=request.format if request else None,
+            query_params=MappingProxyType(request.query_params) if request else None,
+        )
+
     class Meta:
         verbose_name = 'hook'
         verbose_name_plural = 'hooks'
@@ -374,6 +549,84 @@ class ResourceHook(BaseStubModel):
         ]
 
 
+class LogBlob(models.Model):
+    """Logged body stored once per content and referenced by the request logs."""
+
+    hash = models.CharField(verbose_name='SHA-256', max_length=64, primary_key=True)
+    content = models.TextField(verbose_name='Content', null=True, blank=True)
+    content_compressed = models.BinaryField(verbose_name='Compressed Content', null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created at')
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name='Last used at')
+
+    class Meta:
+        verbose_name = 'log blob'
+        verbose_name_plural = 'log blobs'
+
+    def __str__(self) -> str:
+        """Object's string representation.
+
+        Returns:
+            String representation.
+        """
+        return f'Log Blob {self.hash}'
+
+    @classmethod
+    def from_text(cls, text: str) -> 'LogBlob':
+        """Make an unsaved blob of the text, compressed if longer than REQUEST_LOG_COMPRESSION_THRESHOLD.
+
+        Args:
+            text: blob content.
+
+        Returns:
+            LogBlob instance.
+        """
+        content, content_compressed, _ = pack_text(
+            text, 0, settings.REQUEST_LOG_COMPRESSION_THRESHOLD, settings.REQUEST_LOG_SEARCHABLE_LENGTH
+        )
+        return cls(
+            hash=hashlib.sha256(text.encode()).hexdigest(), content=content, content_compressed=content_compressed
+        )
+
+    @property
+    def text(self) -> str | None:
+        """Return the blob content, decompressed if needed.
+
+        Returns:
+            Blob content.
+        """
+        return unpack_text(self.content, self.content_compressed)
+
+
+# the blobs reused within this interval are not refreshed, it must be much shorter than the orphan blobs grace period
+LOG_BLOB_REFRESH_INTERVAL = timedelta(minutes=1)
+
+
+def save_log_blobs(logs: Iterable['RequestLog']) -> None:
+    """Save the new blobs of the request logs, the last use time of the blobs already stored is refreshed.
+
+    Args:
+        logs: request logs with the bodies set by `RequestLog.set_bodies`.
+    """
+    blobs = {blob.hash: blob for log in logs for blob in getattr(log, '_pending_blobs', ())}
+    if blobs:
+        now = timezone.now()
+        # refreshed before the insert: a blob deleted as an orphan in the meantime is inserted again
+        LogBlob.objects.filter(hash__in=sorted(blobs), last_used_at__lt=now - LOG_BLOB_REFRESH_INTERVAL).update(
+            last_used_at=now
+        )
+        # sorted to lock the rows in the same order in the concurrent transactions
+        LogBlob.objects.bulk_create([blobs[key] for key in sorted(blobs)], ignore_conflicts=True)
+    for log in logs:
+        log._pending_blobs = []
+
+
+class RequestLogManager(models.Manager):
+    def bulk_create(self, objs: Iterable['RequestLog'], *args: Any, **kwargs: Any) -> list['RequestLog']:
+        objs = list(objs)
+        save_log_blobs(objs)
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 class RequestLog(BaseStubModel):
     destination_url = models.URLField(verbose_name='Proxied to', default=None, null=True, blank=True)
     ipaddress = models.GenericIPAddressField(verbose_name='Remote IP', default='127.0.0.1')
@@ -391,6 +644,7 @@ class RequestLog(BaseStubModel):
         Application,
         on_delete=models.CASCADE,
         related_name='logs',
+        db_index=False,  # covered by the composite indexes
     )
     resource = models.ForeignKey(
         ResourceStub,
@@ -398,6 +652,7 @@ class RequestLog(BaseStubModel):
         blank=True,
         null=True,
         related_name='logs',
+        db_index=False,  # covered by the composite indexes
     )
     response = models.ForeignKey(
         ResponseStub,
@@ -407,10 +662,30 @@ class RequestLog(BaseStubModel):
         null=True,
         blank=True,
     )
+    request_body_compressed = models.BinaryField(verbose_name='Compressed Request Body', null=True, blank=True)
+    response_body_compressed = models.BinaryField(verbose_name='Compressed Response Body', null=True, blank=True)
+    request_body_blob = models.ForeignKey(
+        LogBlob, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True
+    )
+    response_body_blob = models.ForeignKey(
+        LogBlob, related_name='+', on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True
+    )
+    is_truncated = models.BooleanField(verbose_name='Truncated', default=False)
+    duration = models.FloatField(verbose_name='Duration (ms)', null=True, blank=True)
+    timings = models.JSONField(verbose_name='Timings (ms)', default=dict, null=True, blank=True)
+
+    objects = RequestLogManager()
 
     class Meta:
         verbose_name = 'request log'
         verbose_name_plural = 'request logs'
+        # the admin changelist and the application inline always order the logs by the creation time
+        indexes = [
+            models.Index(fields=['-created_at'], name='requestlog_created_idx'),
+            models.Index(fields=['application', '-created_at'], name='requestlog_app_created_idx'),
+            models.Index(fields=['application', 'status_code', '-created_at'], name='requestlog_app_status_idx'),
+            models.Index(fields=['resource', '-created_at'], name='requestlog_resource_idx'),
+        ]
 
     def __str__(self) -> str:
         """Object's string representation.
@@ -420,9 +695,72 @@ class RequestLog(BaseStubModel):
         """
         return f'Request Log Record #{self.id}'
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        save_log_blobs([self])
+        super().save(*args, **kwargs)
+
+    def set_bodies(self, request_body: str | None, response_body: str | None) -> None:
+        """Store the bodies truncated to REQUEST_LOG_BODY_LIMIT.
+
+        Bodies longer than REQUEST_LOG_BLOB_THRESHOLD are stored once per content in the LogBlob table (the blobs are
+        saved together with the log), other bodies longer than REQUEST_LOG_COMPRESSION_THRESHOLD are compressed. The
+        first REQUEST_LOG_SEARCHABLE_LENGTH characters of the compressed bodies are kept as plain text for the search.
+
+        Args:
+            request_body: request body.
+            response_body: response body.
+        """
+        self._pending_blobs: list[LogBlob] = []
+        self.is_truncated = False
+        self.request_body, self.request_body_compressed, self.request_body_blob = self._pack_body(request_body)
+        self.response_body, self.response_body_compressed, self.response_body_blob = self._pack_body(response_body)
+
+    def _pack_body(self, body: str | None) -> tuple[str | None, bytes | None, LogBlob | None]:
+        text, _, is_truncated = pack_text(body, settings.REQUEST_LOG_BODY_LIMIT, 0)
+        self.is_truncated |= is_truncated
+
+        if text is not None and settings.REQUEST_LOG_BLOB_THRESHOLD and len(text) > settings.REQUEST_LOG_BLOB_THRESHOLD:
+            blob = LogBlob.from_text(text)
+            self._pending_blobs.append(blob)
+            return None, None, blob
+
+        text, compressed, _ = pack_text(
+            text, 0, settings.REQUEST_LOG_COMPRESSION_THRESHOLD, settings.REQUEST_LOG_SEARCHABLE_LENGTH
+        )
+        return text, compressed, None
+
+    def _get_blob_text(self, field_name: str) -> str | None:
+        try:
+            blob: LogBlob = getattr(self, field_name)
+        except LogBlob.DoesNotExist:
+            return None
+        return blob.text
+
+    @property
+    def request_body_text(self) -> str | None:
+        """Return the request body, decompressed if needed.
+
+        Returns:
+            Request body.
+        """
+        if self.request_body_blob_id:
+            return self._get_blob_text('request_body_blob')
+        return unpack_text(self.request_body, self.request_body_compressed)
+
+    @property
+    def response_body_text(self) -> str | None:
+        """Return the response body, decompressed if needed.
+
+        Returns:
+            Response body.
+        """
+        if self.response_body_blob_id:
+            return self._get_blob_text('response_body_blob')
+        return unpack_text(self.response_body, self.response_body_compressed)
+
     @property
     def response_format(self) -> str:
-        content_type = self.response_headers.get('Content-Type', '')
+        content_type = (self.response_headers or {}).get('Content-Type', '')
 
         if 'json' in content_type:
             return BodyFormat.JSON
@@ -467,3 +805,105 @@ class Team(BaseStubModel):
                 name="unique_team_slug_per_owner",
             ),
         ]
+
+
+class ConfigurationRevision(models.Model):
+    """Revision counter of the application configuration.
+
+    Bumped on every change of the application, its resources, responses, requests and hooks. Workers compare
+    the counters with the ones they have seen before to drop outdated in-memory data. There is no foreign key
+    to the Application on purpose: the counter of a deleted application is bumped as well.
+    """
+
+    application_id = models.UUIDField(primary_key=True, editable=False)
+    revision = models.PositiveBigIntegerField(verbose_name='Revision', default=0)
+
+    class Meta:
+        verbose_name = 'configuration revision'
+        verbose_name_plural = 'configuration revisions'
+
+    def __str__(self) -> str:
+        """Object's string representation.
+
+        Returns:
+            String representation.
+        """
+        return f'{self.application_id} (revision {self.revision})'
+
+
+class HookJob(models.Model):
+    """Deferred run of the after-response hooks of a stub request, executed by the `run_hook_worker` command.
+
+    A worker claims the job by moving `available_at` forward by the lease time and deletes it once the hooks are
+    run, so the jobs of a crashed worker become available again when the lease expires.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created at')
+    available_at = models.DateTimeField(verbose_name='Available at', db_index=True)
+    attempts = models.PositiveSmallIntegerField(verbose_name='Attempts', default=0)
+    steps = models.JSONField(verbose_name='Hook steps', default=list)
+    application_id = models.UUIDField(verbose_name='Application', null=True, blank=True)
+    request_log_id = models.UUIDField(verbose_name='Request log', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'hook job'
+        verbose_name_plural = 'hook jobs'
+
+    def __str__(self) -> str:
+        """Object's string representation.
+
+        Returns:
+            String representation.
+        """
+        return f'{self.id} (attempts {self.attempts})'
+
+
+class WebhookDelivery(models.Model):
+    """Webhook delivery attempt with the destination response and the connection timings.
+
+    The request log is not a database constraint: the deliveries are written before the log is saved (and the log is
+    not saved at all if the request is not logged by the policy), and the log table can be partitioned.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Created at')
+    application = models.ForeignKey(
+        Application,
+        on_delete=models.CASCADE,
+        related_name='webhook_deliveries',
+        db_index=False,  # covered by the composite index
+    )
+    request_log = models.ForeignKey(
+        RequestLog,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        blank=True,
+        related_name='webhook_deliveries',
+    )
+    lifecycle = models.CharField(max_length=10, choices=Lifecycle.choices, verbose_name='Lifecycle')
+    method = models.CharField(max_length=10, choices=HTTPMethods.choices, verbose_name='HTTP Method')
+    url = models.URLField(max_length=2048, verbose_name='URL')
+    attempt = models.PositiveSmallIntegerField(verbose_name='Attempt', default=1)
+    status_code = models.IntegerField(verbose_name='Status Code', null=True, blank=True)
+    response_size = models.PositiveIntegerField(verbose_name='Response size (bytes)', null=True, blank=True)
+    dns_time = models.FloatField(verbose_name='DNS (ms)', null=True, blank=True)
+    connect_time = models.FloatField(verbose_name='Connect (ms)', null=True, blank=True)
+    total_time = models.FloatField(verbose_name='Total (ms)', null=True, blank=True)
+    error = models.TextField(verbose_name='Error', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'webhook delivery'
+        verbose_name_plural = 'webhook deliveries'
+        indexes = [
+            models.Index(fields=['application', '-created_at'], name='webhookdelivery_app_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """Object's string representation.
+
+        Returns:
+            String representation.
+        """
+        return f'{self.method} {self.url} (attempt {self.attempt})'
@@ -0,0 +1,142 @@
+from datetime import datetime
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ORDER_VAR, PAGE_VAR, ChangeList
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from apps.models import BaseStubModel
+
+AFTER_VAR = 'after'
+BEFORE_VAR = 'before'
+KEYSET_ORDERING = ['-created_at', '-id']
+
+
+def estimate_count(queryset: QuerySet) -> int | None:
+    """Get the number of the queryset objects estimated by the PostgreSQL planner.
+
+    Args:
+        queryset: QuerySet instance.
+
+    Returns:
+        Estimated number of the objects, None if the database can not estimate it.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator taking the number of the objects from the planner statistics if it is big.
+
+    Exact counts scan every matching row, the estimates cost the same at any table size. Estimates up to
+    REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD are replaced by the exact counts.
+    """
+
+    is_estimated = False
+
+    @cached_property
+    def count(self) -> int:  # type: ignore[override]
+        if settings.REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD:
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate > settings.REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD:
+                self.is_estimated = True
+                return estimate
+        return super().count
+
+
+def make_cursor(obj: BaseStubModel) -> str:
+    """Make the keyset pagination cursor pointing at the object.
+
+    Args:
+        obj: model instance.
+
+    Returns:
+        Cursor string.
+    """
+    return f'{obj.created_at.isoformat()}_{obj.pk}'
+
+
+def parse_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Parse the keyset pagination cursor.
+
+    Args:
+        cursor: cursor made by `make_cursor`.
+
+    Returns:
+        Creation time and primary key of the object.
+
+    Raises:
+        IncorrectLookupParameters if the cursor is malformed.
+    """
+    created_at, _, pk = cursor.rpartition('_')
+    try:
+        return datetime.fromisoformat(created_at), UUID(pk)
+    except ValueError as error:
+        raise IncorrectLookupParameters(f'Invalid cursor: {cursor}') from error
+
+
+class KeysetChangeList(ChangeList):
+    """Changelist paginated by the (created_at, id) keyset if sorted by the default ordering.
+
+    Instead of the page numbers, the pages are linked by the cursors of their first and last objects, so every page
+    is selected by an index range and costs the same at any depth. Lists sorted by other columns and the explicitly
+    requested page numbers are paginated by offset as usual.
+    """
+
+    is_keyset = False
+    newer_url = None
+    older_url = None
+
+    def get_filters_params(self, params: dict | None = None) -> dict:
+        lookup_params = super().get_filters_params(params)  # type: ignore[arg-type]
+        lookup_params.pop(AFTER_VAR, None)
+        lookup_params.pop(BEFORE_VAR, None)
+        return lookup_params
+
+    def get_results(self, request: WSGIRequest) -> None:
+        super().get_results(request)
+        self.result_count_estimated = getattr(self.paginator, 'is_estimated', False)
+        # the links changing the filters or the ordering lead to the first page, like Django does with the page number
+        after, before = self.params.pop(AFTER_VAR, None), self.params.pop(BEFORE_VAR, None)
+        self.is_keyset = (
+            (self.multi_page or bool(after or before))
+            and not self.show_all
+            and PAGE_VAR not in request.GET
+            and ORDER_VAR not in self.params
+            and list(self.model_admin.get_ordering(request)) == KEYSET_ORDERING
+        )
+        if not self.is_keyset:
+            return
+
+        if before:
+            created_at, pk = parse_cursor(before)
+            newer = self.queryset.filter(created_at__gte=created_at).exclude(created_at=created_at, pk__lte=pk)
+            page = list(newer.order_by('created_at', 'id')[: self.list_per_page + 1])
+            has_newer, has_older = len(page) > self.list_per_page, True
+            page = page[: self.list_per_page][::-1]
+        else:
+            older = self.queryset
+            if after:
+                created_at, pk = parse_cursor(after)
+                older = older.filter(created_at__lte=created_at).exclude(created_at=created_at, pk__gte=pk)
+            page = list(older[: self.list_per_page + 1])
+            has_newer, has_older = bool(after), len(page) > self.list_per_page
+            page = page[: self.list_per_page]
+
+        self.result_list = page
+        if page and has_newer:
+            self.newer_url = self.get_query_string({BEFORE_VAR: make_cursor(page[0])})  # type: ignore[dict-item]
+        if page and has_older:
+            self.older_url = self.get_query_string({AFTER_VAR: make_cursor(page[-1])})  # type: ignore[dict-item]
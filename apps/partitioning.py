@@ -0,0 +1,322 @@
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection, transaction
+
+from apps.models import RequestLog
+from apps.retention import delete_in_chunks
+
+logger = logging.getLogger(__name__)
+
+INTERVALS = {'day': timedelta(days=1), 'week': timedelta(weeks=1)}
+
+_BOUNDS_PATTERN = re.compile(r"FROM \('(?P<start>[^']+)'\) TO \('(?P<end>[^']+)'\)")
+
+
+@dataclass(frozen=True)
+class Partition:
+    name: str
+    start: datetime | None  # None for the default partition
+    end: datetime | None
+
+
+def is_supported() -> bool:
+    """Check if the database supports the declarative partitioning.
+
+    Returns:
+        True for PostgreSQL, False otherwise.
+    """
+    return connection.vendor == 'postgresql'
+
+
+def is_partitioned() -> bool:
+    """Check if the request log table is partitioned.
+
+    Returns:
+        True if the table is partitioned, False otherwise.
+    """
+    if not is_supported():
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = %s::regclass', [RequestLog._meta.db_table])
+        return cursor.fetchone()[0] == 'p'
+
+
+def get_partition_start(moment: datetime, interval: str) -> datetime:
+    """Get the start of the partition the moment belongs to.
+
+    Daily partitions start at midnight UTC, weekly partitions start on Monday.
+
+    Args:
+        moment: timezone-aware datetime.
+        interval: partition interval, `day` or `week`.
+
+    Returns:
+        Partition start.
+    """
+    start = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == 'week':
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def get_partitions() -> list[Partition]:
+    """List the partitions of the request log table.
+
+    Returns:
+        Partitions ordered by the start, the default partition goes first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) '
+            'FROM pg_inherits JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = %s::regclass',
+            [RequestLog._meta.db_table],
+        )
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bounds in rows:
+        if match := _BOUNDS_PATTERN.search(bounds):
+            start, end = datetime.fromisoformat(match['start']), datetime.fromisoformat(match['end'])
+            partitions.append(Partition(name=name, start=start, end=end))
+        else:
+            partitions.append(Partition(name=name, start=None, end=None))
+    return sorted(partitions, key=lambda partition: partition.start or datetime.min.replace(tzinfo=timezone.utc))
+
+
+def create_partitions(since: datetime, until: datetime, interval: str) -> list[str]:
+    """Create the missing partitions covering the period.
+
+    Logs of the period already stored in the default partition are moved to the new partitions.
+
+    Args:
+        since: period start.
+        until: period end.
+        interval: partition interval, `day` or `week`.
+
+    Returns:
+        Names of the created partitions.
+    """
+    table = RequestLog._meta.db_table
+    partitions = get_partitions()
+    existing = [(p.start, p.end) for p in partitions if p.start and p.end]
+    default = next((p.name for p in partitions if p.start is None), None)
+    created = []
+
+    start = get_partition_start(since, interval)
+    while start < until:
+        end = start + INTERVALS[interval]
+        # partitions of the previous interval (if it has been changed) may already cover a part of the period
+        if overlapping := [e for s, e in existing if s < end and start < e]:
+            start = max(overlapping)
+            continue
+
+        name = f'{table}_p{start:%Y%m%d}'
+        _create_partition(name, start, end, default)
+        created.append(name)
+        start = end
+
+    if created:
+        logger.info(f'Request log partitions created: {", ".join(created)}.')
+    return created
+
+
+def _create_partition(name: str, start: datetime, end: datetime, default: str | None) -> None:
+    # a partition can not be created while the default partition holds the rows of its range: such partition is
+    # created detached, filled with the rows and attached, the default partition is locked until the commit
+    table = RequestLog._meta.db_table
+    quote = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if default is not None:
+            cursor.execute(f'LOCK TABLE {quote(default)} IN ACCESS EXCLUSIVE MODE')
+            cursor.execute(
+                f'SELECT EXISTS (SELECT 1 FROM {quote(default)} WHERE created_at >= %s AND created_at < %s)',
+                [start, end],
+            )
+        if default is None or not cursor.fetchone()[0]:
+            cursor.execute(
+                f'CREATE TABLE {quote(name)} PARTITION OF {quote(table)} FOR VALUES FROM (%s) TO (%s)', [start, end]
+            )
+            return
+
+        cursor.execute(f'CREATE TABLE {quote(name)} (LIKE {quote(table)} INCLUDING DEFAULTS INCLUDING STORAGE)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {quote(default)} WHERE created_at >= %s AND created_at < %s RETURNING *) '
+            f'INSERT INTO {quote(name)} SELECT * FROM moved',
+            [start, end],
+        )
+        logger.info(f'{cursor.rowcount} request logs moved from the default partition to {name}.')
+        cursor.execute(
+            f'ALTER TABLE {quote(table)} ATTACH PARTITION {quote(name)} FOR VALUES FROM (%s) TO (%s)', [start, end]
+        )
+
+
+def create_future_partitions(interval: str, ahead: int) -> list[str]:
+    """Create the current partition and the partitions for the next intervals.
+
+    Args:
+        interval: partition interval, `day` or `week`.
+        ahead: number of the future partitions.
+
+    Returns:
+        Names of the created partitions.
+    """
+    current_start = get_partition_start(datetime.now(timezone.utc), interval)
+    return create_partitions(
+        since=current_start, until=current_start + INTERVALS[interval] * (ahead + 1), interval=interval
+    )
+
+
+def partition_table(interval: str, ahead: int) -> None:
+    """Convert the request log table into a table partitioned by the creation time.
+
+    The existing logs are copied into the partitions, so the conversion of a big table takes a while and locks the
+    table for its whole duration: run it in a maintenance window. Indexes and foreign keys are recreated with the
+    same names, the primary key is extended with the partition key (PostgreSQL requirement). Logs which do not fit
+    any partition (i.e. created with a wrong clock) go to the default partition.
+
+    Args:
+        interval: partition interval, `day` or `week`.
+        ahead: number of the future partitions to create.
+    """
+    table = RequestLog._meta.db_table
+    legacy_table = f'{table}_legacy'
+    quote = connection.ops.quote_name
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')  # the table can not be altered with the pending checks
+        cursor.execute(f'LOCK TABLE {quote(table)} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [table])
+        primary_key = cursor.fetchone()[0]
+        cursor.execute(
+            'SELECT index.relname, pg_get_indexdef(index.oid) '
+            'FROM pg_index JOIN pg_class index ON index.oid = pg_index.indexrelid '
+            'WHERE pg_index.indrelid = %s::regclass AND NOT pg_index.indisprimary',
+            [table],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            'SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint '
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [table],
+        )
+        foreign_keys = cursor.fetchall()
+
+        # free the names of the indexes and constraints for the new table
+        for name, _ in foreign_keys:
+            cursor.execute(f'ALTER TABLE {quote(table)} DROP CONSTRAINT {quote(name)}')
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {quote(name)}')
+        cursor.execute(
+            f'ALTER TABLE {quote(table)} RENAME CONSTRAINT {quote(primary_key)} TO {quote(legacy_table + "_pkey")}'
+        )
+        cursor.execute(f'ALTER TABLE {quote(table)} RENAME TO {quote(legacy_table)}')
+
+        cursor.execute(
+            f'CREATE TABLE {quote(table)} (LIKE {quote(legacy_table)} INCLUDING DEFAULTS INCLUDING STORAGE) '
+            'PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(primary_key)} PRIMARY KEY (id, created_at)')
+        cursor.execute(f'CREATE TABLE {quote(table + "_default")} PARTITION OF {quote(table)} DEFAULT')
+
+        cursor.execute(f'SELECT MIN(created_at) FROM {quote(legacy_table)}')
+        if oldest := cursor.fetchone()[0]:
+            create_partitions(since=oldest, until=datetime.now(timezone.utc), interval=interval)
+        create_future_partitions(interval=interval, ahead=ahead)
+
+        cursor.execute(f'INSERT INTO {quote(table)} SELECT * FROM {quote(legacy_table)}')
+        cursor.execute(f'DROP TABLE {quote(legacy_table)}')
+
+        for _, definition in indexes:
+            cursor.execute(re.sub(r' ON (\S+\.)?\S+ ', f' ON {quote(table)} ', definition, count=1))
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {quote(table)} ADD CONSTRAINT {quote(name)} {definition}')
+
+    logger.info(f'Request log table is partitioned by {interval}.')
+
+
+def delete_logs_before(moment: datetime, batch_size: int) -> int:
+    """Delete the request logs created before the moment in batches.
+
+    Every batch is deleted in its own short transaction, so the table is never locked for long.
+
+    Args:
+        moment: timezone-aware datetime.
+        batch_size: number of the logs deleted with one query.
+
+    Returns:
+        Number of the deleted logs.
+    """
+    return delete_in_chunks(RequestLog.objects.filter(created_at__lt=moment), chunk_size=batch_size)
+
+
+def delete_partition_logs_before(partition: str, moment: datetime, batch_size: int) -> int:
+    """Delete the logs of the partition created before the moment in id ordered batches.
+
+    Every batch is deleted in its own short transaction, like the logs of the non-partitioned table.
+
+    Args:
+        partition: partition table name.
+        moment: timezone-aware datetime.
+        batch_size: number of the logs deleted with one query.
+
+    Returns:
+        Number of the deleted logs.
+    """
+    table = connection.ops.quote_name(partition)
+    deleted = 0
+    last_id = None
+    with connection.cursor() as cursor:
+        while True:
+            if last_id:
+                cursor.execute(
+                    f'SELECT id FROM {table} WHERE created_at < %s AND id > %s ORDER BY id LIMIT %s',
+                    [moment, last_id, batch_size],
+                )
+            else:
+                cursor.execute(
+                    f'SELECT id FROM {table} WHERE created_at < %s ORDER BY id LIMIT %s', [moment, batch_size]
+                )
+            ids = [row[0] for row in cursor.fetchall()]
+            if not ids:
+                return deleted
+
+            cursor.execute(f'DELETE FROM {table} WHERE id = ANY(%s::uuid[]) AND created_at < %s', [ids, moment])
+            deleted += cursor.rowcount
+            last_id = ids[-1]
+
+
+def remove_logs_before(moment: datetime, batch_size: int) -> int:
+    """Remove the request logs created before the moment.
+
+    Partitions holding only the expired logs are dropped as a whole, the expired logs in the default partition are
+    deleted in batches. Partitions holding both the expired and the actual logs are kept until all their logs expire.
+    Logs of the non-partitioned table are deleted in batches.
+
+    Args:
+        moment: timezone-aware datetime.
+        batch_size: number of the logs deleted with one query (for the non-partitioned table and the default
+            partition).
+
+    Returns:
+        Number of the removed logs (estimated by the table statistics for the dropped partitions).
+    """
+    if not is_partitioned():
+        return delete_logs_before(moment=moment, batch_size=batch_size)
+
+    removed = 0
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for partition in get_partitions():
+            if partition.end is None:
+                removed += delete_partition_logs_before(partition.name, moment=moment, batch_size=batch_size)
+            elif partition.end <= moment:
+                cursor.execute('SELECT reltuples FROM pg_class WHERE oid = %s::regclass', [partition.name])
+                removed += max(int(cursor.fetchone()[0]), 0)
+                cursor.execute(f'DROP TABLE {quote(partition.name)}')
+                logger.info(f'Request log partition {partition.name} dropped.')
+    return removed
@@ -0,0 +1,250 @@
+import logging
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Iterator
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from apps.models import Application, LogBlob, RequestLog, WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+PRUNE_LOCK_ID = zlib.crc32(b'stubborn.prune_request_logs')
+
+# blobs unused for a shorter time are kept, as the logs referencing them may still be in the writer queue
+ORPHAN_BLOB_GRACE_PERIOD = timedelta(hours=1)
+
+
+@dataclass
+class PruneReport:
+    """Result of the request logs pruning of an application."""
+
+    application: Application
+    deleted: int
+    backlog: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        return self.deleted / self.elapsed if self.elapsed else 0.0
+
+
+def delete_in_chunks(
+    queryset: QuerySet,
+    chunk_size: int,
+    sleep: float = 0,
+    on_chunk: Callable[[int], None] | None = None,
+) -> int:
+    """Delete the objects of the queryset in primary key ordered chunks.
+
+    Chunks are selected by the primary key range following the previous chunk, so every chunk costs the same and
+    is deleted in its own short transaction: the table is never locked for long and the replicas keep up.
+
+    Args:
+        queryset: objects to delete.
+        chunk_size: number of the objects deleted with one query.
+        sleep: pause between the chunks in seconds.
+        on_chunk: callback receiving the number of the objects deleted by every chunk.
+
+    Returns:
+        Number of the deleted objects.
+    """
+    deleted = 0
+    last_pk = None
+    queryset = queryset.order_by('pk')
+    while True:
+        chunk = queryset.filter(pk__gt=last_pk) if last_pk else queryset
+        pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            return deleted
+
+        # the conditions are checked again, the objects could have changed since the selection
+        count = queryset.filter(pk__in=pks).delete()[0]
+        deleted += count
+        last_pk = pks[-1]
+        if on_chunk:
+            on_chunk(count)
+        if sleep and len(pks) == chunk_size:
+            time.sleep(sleep)
+
+
+def get_retention_days(application: Application) -> int:
+    """Get the number of days the request logs of the application are kept.
+
+    Args:
+        application: Application instance.
+
+    Returns:
+        Number of days, 0 if the logs are kept forever.
+    """
+    if application.log_retention_days is not None:
+        return application.log_retention_days
+    return settings.REQUEST_LOG_RETENTION_DAYS
+
+
+def prune_application_logs(
+    application: Application, chunk_size: int, sleep: float, dry_run: bool = False
+) -> PruneReport | None:
+    """Delete the expired request logs and webhook deliveries of the application.
+
+    Args:
+        application: Application instance.
+        chunk_size: number of the logs deleted with one query.
+        sleep: pause between the chunks in seconds.
+        dry_run: count the expired logs without deleting them.
+
+    Returns:
+        PruneReport instance, None if the application logs are kept forever.
+    """
+    retention_days = get_retention_days(application)
+    if not retention_days:
+        return None
+
+    expired = RequestLog.objects.filter(
+        application=application, created_at__lt=timezone.now() - timedelta(days=retention_days)
+    )
+    report = PruneReport(application=application, deleted=0, backlog=expired.count(), elapsed=0.0)
+    if dry_run:
+        return report
+
+    def on_chunk(count: int) -> None:
+        report.deleted += count
+        report.backlog = max(report.backlog - count, 0)
+        report.elapsed = time.monotonic() - started_at
+        logger.debug(f'{application}: {report.deleted} logs deleted ({report.rate:.0f}/s), {report.backlog} left.')
+
+    started_at = time.monotonic()
+    delete_in_chunks(expired, chunk_size=chunk_size, sleep=sleep, on_chunk=on_chunk)
+    # the webhook deliveries are kept as long as the logs of the requests triggered them
+    expired_deliveries = WebhookDelivery.objects.filter(
+        application=application, created_at__lt=timezone.now() - timedelta(days=retention_days)
+    )
+    delete_in_chunks(expired_deliveries, chunk_size=chunk_size, sleep=sleep)
+    report.elapsed = time.monotonic() - started_at
+    return report
+
+
+def delete_orphan_blobs(chunk_size: int, sleep: float) -> int:
+    """Delete the log blobs not referenced by any request log and unused for ORPHAN_BLOB_GRACE_PERIOD.
+
+    A blob reused by a log being saved has its last use time refreshed first, so the row lock and the refreshed time
+    keep it from the deletion.
+
+    Args:
+        chunk_size: number of the blobs deleted with one query.
+        sleep: pause between the chunks in seconds.
+
+    Returns:
+        Number of the deleted blobs.
+    """
+    orphans = LogBlob.objects.filter(
+        ~Exists(RequestLog.objects.filter(request_body_blob=OuterRef('pk'))),
+        ~Exists(RequestLog.objects.filter(response_body_blob=OuterRef('pk'))),
+        last_used_at__lt=timezone.now() - ORPHAN_BLOB_GRACE_PERIOD,
+    )
+    return delete_in_chunks(orphans, chunk_size=chunk_size, sleep=sleep)
+
+
+def prune_request_logs(chunk_size: int, sleep: float, dry_run: bool = False) -> list[PruneReport]:
+    """Delete the expired request logs of all the applications and the log blobs left unused.
+
+    Args:
+        chunk_size: number of the logs deleted with one query.
+        sleep: pause between the chunks in seconds.
+        dry_run: count the expired logs without deleting them.
+
+    Returns:
+        Reports of the applications with the limited logs retention.
+    """
+    reports = []
+    for application in Application.objects.order_by('pk'):
+        if report := prune_application_logs(application, chunk_size=chunk_size, sleep=sleep, dry_run=dry_run):
+            reports.append(report)
+
+    if not dry_run:
+        # also collects the blobs of the dropped partitions and the blobs kept by the grace period last time
+        delete_orphan_blobs(chunk_size=chunk_size, sleep=sleep)
+    return reports
+
+
+@contextmanager
+def advisory_lock(lock_id: int) -> Iterator[bool]:
+    """Hold the PostgreSQL session advisory lock, other databases always get the lock.
+
+    Args:
+        lock_id: lock key.
+
+    Yields:
+        True if the lock is acquired, False if it is held by another session.
+    """
+    if connection.vendor != 'postgresql':
+        yield True
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_lock(%s)', [lock_id])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id])
+
+
+class PruneScheduler:
+    """In-process scheduler pruning the request logs every REQUEST_LOG_PRUNE_INTERVAL minutes.
+
+    Every worker runs its own scheduler thread (started on the first request, as threads do not survive the worker
+    fork), the database advisory lock makes sure only one of them prunes at a time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def ensure_started(self) -> None:
+        """Start the scheduler thread if the scheduler is on and the thread is not running."""
+        if not settings.REQUEST_LOG_PRUNE_INTERVAL or (self._thread and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name='request-log-pruner', daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(settings.REQUEST_LOG_PRUNE_INTERVAL * 60)
+            close_old_connections()
+            try:
+                self.run_once()
+            except Exception:  # the thread must survive any failure
+                logger.exception('Request logs pruning failed.')
+
+    def run_once(self) -> list[PruneReport] | None:
+        """Prune the request logs unless another worker does it.
+
+        Returns:
+            Pruning reports, None if the pruning is run by another worker.
+        """
+        with advisory_lock(PRUNE_LOCK_ID) as acquired:
+            if not acquired:
+                return None
+            reports = prune_request_logs(
+                chunk_size=settings.REQUEST_LOG_PRUNE_CHUNK_SIZE, sleep=settings.REQUEST_LOG_PRUNE_SLEEP
+            )
+        for report in reports:
+            if report.deleted:
+                logger.info(f'{report.application}: {report.deleted} expired request logs deleted.')
+        return reports
+
+
+prune_scheduler = PruneScheduler()
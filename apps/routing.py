@@ -0,0 +1,238 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch
+from django.http import Http404
+
+from apps.enums import ResponseChoices
+from apps.metrics import observe_cache_lookup
+from apps.models import Application, ConfigurationRevision, ResourceHook, ResourceStub
+
+logger = logging.getLogger(__name__)
+
+RouteKey = tuple[str, str | None, str]
+
+NEGATIVE_CACHE_LIMIT = 1024
+
+
+@dataclass(frozen=True)
+class CompiledApplication:
+    """Enabled resources of an application compiled into lookup tables."""
+
+    application: Application
+    routes: dict[RouteKey, ResourceStub]
+    global_proxies: dict[str, ResourceStub]
+    response_ids: frozenset[UUID]
+
+    def resolve(self, resource_slug: str, method: str, tail: str) -> ResourceStub | None:
+        """Find the resource serving the given request.
+
+        A custom response wins over a specific URL proxy (both are compiled into the same route key),
+        the global proxy of the resource slug is used as a fallback.
+
+        Args:
+            resource_slug: resource slug from the URL.
+            method: HTTP method of the request.
+            tail: URL tail following the resource slug.
+
+        Returns:
+            ResourceStub instance if found, None otherwise.
+        """
+        if resource := self.routes.get((resource_slug, method, tail)):
+            return resource
+        return self.global_proxies.get(resource_slug)
+
+
+def compile_application(app_slug: str) -> CompiledApplication | None:
+    """Load the enabled application with all its enabled resources and compile them into lookup tables.
+
+    Hooks of the resources are prefetched, so their plans are built with no queries while serving the stubs.
+
+    Args:
+        app_slug: application slug.
+
+    Returns:
+        CompiledApplication instance if there is an enabled application with the given slug, None otherwise.
+    """
+    application = Application.objects.filter(slug=app_slug, is_enabled=True).order_by('pk').last()
+    if not application:
+        return None
+
+    resources = (
+        ResourceStub.objects.filter(application=application, is_enabled=True)
+        .select_related('response')
+        .prefetch_related(Prefetch('hooks', queryset=ResourceHook.objects.select_related('request')))
+        .order_by('pk')
+    )
+    routes: dict[RouteKey, ResourceStub] = {}
+    custom_routes: dict[RouteKey, ResourceStub] = {}
+    global_proxies: dict[str, ResourceStub] = {}
+
+    for resource in resources:
+        resource.application = application
+        if resource.response and resource.response.application_id == application.pk:
+            resource.response.application = application
+        key = (resource.slug, resource.method, resource.tail)
+        if resource.response_type == ResponseChoices.CUSTOM:
+            custom_routes[key] = resource
+        elif resource.response_type == ResponseChoices.PROXY_CURRENT:
+            routes[key] = resource
+        elif resource.response_type == ResponseChoices.PROXY_GLOBAL:
+            global_proxies[resource.slug] = resource
+
+    routes.update(custom_routes)
+    response_ids = frozenset(resource.response_id for resource in routes.values() if resource.response_id)
+    return CompiledApplication(
+        application=application, routes=routes, global_proxies=global_proxies, response_ids=response_ids
+    )
+
+
+def bump_configuration_revision(application_id: UUID) -> None:
+    """Increase the configuration revision of the application.
+
+    Runs in the same transaction as the configuration change, so other workers can not see the new revision
+    before the changed data.
+
+    Args:
+        application_id: primary key of the changed application.
+    """
+    revisions = ConfigurationRevision.objects.filter(application_id=application_id)
+    if revisions.update(revision=F('revision') + 1):
+        return
+    try:
+        with transaction.atomic():
+            ConfigurationRevision.objects.create(application_id=application_id, revision=1)
+    except IntegrityError:  # created by a concurrent transaction
+        revisions.update(revision=F('revision') + 1)
+
+
+class RouteTable:
+    """Per-worker cache of the compiled applications keyed by the application slug.
+
+    Every application is compiled on the first hit and stays in memory until one of its objects is changed.
+    Changes made by the current worker are applied immediately (see apps.signals), changes made by other
+    workers and nodes are detected by comparing configuration revisions once in CONFIGURATION_CHECK_INTERVAL
+    seconds. Resolving a stub resource costs no database queries in between.
+    """
+
+    def __init__(self) -> None:
+        self._applications: dict[str, CompiledApplication] = {}
+        self._missing: set[str] = set()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._revisions: dict[UUID, int | None] = {}
+        self._next_check = 0.0
+
+    def synchronize(self) -> None:
+        """Drop the applications changed by other workers since the last check.
+
+        Does nothing if the previous check was less than CONFIGURATION_CHECK_INTERVAL seconds ago.
+        """
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + settings.CONFIGURATION_CHECK_INTERVAL
+
+        revisions = dict(ConfigurationRevision.objects.values_list('application_id', 'revision'))
+        changed = {pk for pk, revision in revisions.items() if self._revisions.get(pk) != revision}
+        changed |= self._revisions.keys() - revisions.keys()
+        self._revisions = revisions
+
+        for application_id in changed:
+            self.invalidate(application_id=application_id)
+        if changed:
+            logger.debug(f'Configuration of {len(changed)} application(s) changed, routes invalidated.')
+
+    def resolve(self, app_slug: str, resource_slug: str, method: str, tail: str) -> ResourceStub:
+        """Find the resource stub for the incoming request.
+
+        Args:
+            app_slug: application slug from the URL.
+            resource_slug: resource slug from the URL.
+            method: HTTP method of the request.
+            tail: URL tail following the resource slug.
+
+        Returns:
+            ResourceStub instance with the application and the response objects attached.
+
+        Raises:
+            Http404 if there is no enabled application or resource matching the request.
+        """
+        self.synchronize()
+        compiled = self.get_application(app_slug)
+        if not compiled:
+            raise Http404('No application found.')
+
+        if resource := compiled.resolve(resource_slug=resource_slug, method=method, tail=tail):
+            return resource
+        raise Http404('No stub resource found.')
+
+    def get_application(self, app_slug: str) -> CompiledApplication | None:
+        """Get the compiled application, compile it if needed.
+
+        Args:
+            app_slug: application slug.
+
+        Returns:
+            CompiledApplication instance if the application exists, None otherwise.
+        """
+        if compiled := self._applications.get(app_slug):
+            observe_cache_lookup(cache='routes', hit=True)
+            return compiled
+        if app_slug in self._missing:
+            observe_cache_lookup(cache='routes', hit=True)
+            return None
+
+        observe_cache_lookup(cache='routes', hit=False)
+        generation = self._generation
+        compiled = compile_application(app_slug)
+
+        with self._lock:
+            if generation != self._generation:
+                # the configuration was changed while compiling, the result may be outdated
+                return compiled
+            if compiled:
+                self._applications[app_slug] = compiled
+            else:
+                if len(self._missing) >= NEGATIVE_CACHE_LIMIT:
+                    self._missing.clear()
+                self._missing.add(app_slug)
+        return compiled
+
+    def invalidate(
+        self, application_id: UUID | None = None, slug: str | None = None, response_id: UUID | None = None
+    ) -> None:
+        """Drop the compiled applications affected by a configuration change.
+
+        Args:
+            application_id: primary key of the changed application.
+            slug: slug of the changed application.
+            response_id: primary key of the changed response stub.
+        """
+        with self._lock:
+            self._generation += 1
+            self._missing.clear()
+            for app_slug, compiled in list(self._applications.items()):
+                if (
+                    app_slug == slug
+                    or compiled.application.pk == application_id
+                    or (response_id and response_id in compiled.response_ids)
+                ):
+                    del self._applications[app_slug]
+
+    def clear(self) -> None:
+        """Drop all the compiled applications and the seen configuration revisions."""
+        with self._lock:
+            self._generation += 1
+            self._applications.clear()
+            self._missing.clear()
+            self._revisions = {}
+            self._next_check = 0.0
+
+
+route_table = RouteTable()
@@ -0,0 +1,137 @@
+from abc import ABC, abstractmethod
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.text import smart_split, unescape_string_literal
+
+from apps.models import LogBlob, RequestLog
+
+
+def escape_like(term: str) -> str:
+    """Escape the LIKE pattern wildcards of the term.
+
+    Args:
+        term: search term.
+
+    Returns:
+        Term matching itself only.
+    """
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def split_search_term(search_term: str) -> list[str]:
+    """Split the search query into the terms the way the admin site does, quoted phrases are kept whole.
+
+    Args:
+        search_term: search query.
+
+    Returns:
+        Terms.
+    """
+    terms = []
+    for term in smart_split(search_term):
+        if term.startswith(('"', "'")) and term[0] == term[-1]:
+            term = unescape_string_literal(term)
+        if term:
+            terms.append(term)
+    return terms
+
+
+class SearchBackend(ABC):
+    """Request log search over an index maintained by the database.
+
+    Every log has a search document made of its id, URL, query params, headers, bodies and IP addresses. Logs
+    match a term if their document contains it, case-insensitively. Compressed bodies are only searchable by their
+    first REQUEST_LOG_SEARCHABLE_LENGTH characters.
+    """
+
+    vendor = ''
+
+    def search(self, queryset: QuerySet, search_term: str) -> QuerySet:
+        """Filter the request logs matching all the terms of the search query.
+
+        Args:
+            queryset: request logs.
+            search_term: search query.
+
+        Returns:
+            Filtered queryset.
+        """
+        for term in split_search_term(search_term):
+            queryset = queryset.filter(pk__in=self.get_matching_ids(term))
+        return queryset
+
+    @abstractmethod
+    def get_matching_ids(self, term: str) -> RawSQL:
+        """Make the subquery selecting the ids of the logs matching the term.
+
+        Args:
+            term: search term.
+
+        Returns:
+            RawSQL subquery.
+        """
+
+
+class TrigramSearchBackend(SearchBackend):
+    """PostgreSQL search using the pg_trgm GIN indexes of the log documents and the log blobs.
+
+    Terms shorter than 3 characters can not use the trigram indexes.
+    """
+
+    vendor = 'postgresql'
+    document = (
+        "id::text || ' ' || COALESCE(url, '') || ' ' || COALESCE(params::text, '') || ' ' || "
+        "COALESCE(request_headers::text, '') || ' ' || COALESCE(request_body, '') || ' ' || "
+        "COALESCE(response_headers::text, '') || ' ' || COALESCE(response_body, '') || ' ' || "
+        "COALESCE(host(ipaddress), '') || ' ' || COALESCE(host(x_real_ip), '')"
+    )
+
+    def get_matching_ids(self, term: str) -> RawSQL:
+        log_table, blob_table = RequestLog._meta.db_table, LogBlob._meta.db_table
+        blobs = f'SELECT hash FROM {blob_table} WHERE content ILIKE %s'
+        pattern = f'%{escape_like(term)}%'
+        return RawSQL(
+            f'SELECT id FROM {log_table} WHERE ({self.document}) ILIKE %s '
+            f'UNION SELECT id FROM {log_table} WHERE request_body_blob_id IN ({blobs}) '
+            f'UNION SELECT id FROM {log_table} WHERE response_body_blob_id IN ({blobs})',
+            [pattern, pattern, pattern],
+        )
+
+
+class FTS5SearchBackend(SearchBackend):
+    """SQLite search using the FTS5 trigram table filled by the log table triggers.
+
+    The document includes the bodies stored in the log blobs.
+    """
+
+    vendor = 'sqlite'
+
+    def get_matching_ids(self, term: str) -> RawSQL:
+        if len(term) >= 3:
+            # a quoted FTS5 string is matched as a substring by the trigram tokenizer
+            condition, param = 'apps_requestlog_search MATCH %s', '"{}"'.format(term.replace('"', '""'))
+        else:  # too short for the trigrams, scan the documents
+            condition, param = "document LIKE %s ESCAPE '\\'", f'%{escape_like(term)}%'
+        return RawSQL(
+            f'SELECT id FROM {RequestLog._meta.db_table} WHERE rowid IN '
+            f'(SELECT rowid FROM apps_requestlog_search WHERE {condition})',
+            [param],
+        )
+
+
+SEARCH_BACKENDS: dict[str, type[SearchBackend]] = {
+    TrigramSearchBackend.vendor: TrigramSearchBackend,
+    FTS5SearchBackend.vendor: FTS5SearchBackend,
+}
+
+
+def get_search_backend() -> SearchBackend | None:
+    """Get the request log search backend of the database.
+
+    Returns:
+        SearchBackend instance, None if the database has no search backend.
+    """
+    backend = SEARCH_BACKENDS.get(connection.vendor)
+    return backend() if backend else None
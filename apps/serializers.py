@@ -4,6 +4,7 @@ from django.db.utils import IntegrityError
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from apps.enums import LogPolicy
 from apps.models import Application, RequestStub, ResourceHook, ResourceStub, ResponseStub
 
 
@@ -79,6 +80,8 @@ class ResourceStubSerializer(serializers.ModelSerializer):
     tail = serializers.CharField(required=False, allow_blank=True)
     is_enabled = serializers.BooleanField(required=False, allow_null=False)
     inject_stubborn_headers = serializers.BooleanField(required=False, allow_null=False)
+    log_policy = serializers.ChoiceField(choices=LogPolicy.choices, required=False)
+    log_sample_rate = serializers.FloatField(required=False, allow_null=True, min_value=0, max_value=100)
     hooks = ResourceHookSerializer(many=True, required=False, allow_null=True)
     response = ResponseStubSerializer(required=False, allow_null=True)
 
@@ -93,6 +96,8 @@ class ResourceStubSerializer(serializers.ModelSerializer):
             'tail',
             'is_enabled',
             'inject_stubborn_headers',
+            'log_policy',
+            'log_sample_rate',
             'hooks',
             'response',
         ]
@@ -145,7 +150,18 @@ class ApplicationSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Application
-        fields = ['description', 'name', 'slug', 'resources', 'responses', 'requests']
+        fields = [
+            'description',
+            'name',
+            'slug',
+            'faker_locale',
+            'log_policy',
+            'log_sample_rate',
+            'log_retention_days',
+            'resources',
+            'responses',
+            'requests',
+        ]
 
     @staticmethod
     def make_dependency_object_list(
@@ -1,25 +1,31 @@
 import json
 import logging
 import os
+import random
+import uuid
 from json import JSONDecodeError
 from typing import Any, TypeVar, cast
+from urllib.parse import urlparse
 
 import requests
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import QuerySet
-from django.http import Http404
-from django.shortcuts import get_object_or_404
+from django.http import Http404, HttpResponse
 from requests import Response
 from rest_framework.request import Request
 from rest_framework.response import Response as RestResponse
 from rest_framework_xml.renderers import XMLRenderer
 
-from apps import enums, hooks, models
+from apps import enums, hooks
+from apps.bulk_writer import request_log_writer
 from apps.enums import ResponseChoices
-from apps.models import Application, RequestLog, ResourceStub, ResponseStub, User
+from apps.facets import facet_cache
+from apps.metrics import PROXY_DURATION
+from apps.models import Application, EncodedBody, RequestLog, ResourceStub, ResponseStub, User
 from apps.renderers import SimpleTextRenderer
+from apps.routing import route_table
 from apps.serializers import ApplicationSerializer
+from apps.timing import Phase, RequestTimer
 from apps.utils import add_stubborn_headers, clean_headers, log_response
 
 logger = logging.getLogger(__name__)
@@ -39,27 +45,92 @@ def request_log_create(
     response_headers: dict = None,
     proxied: bool = False,
     destination_url: str = None,
-) -> RequestLog:
-    log_record = RequestLog.objects.create(
+    inject_stubborn_headers: bool = False,
+    timer: RequestTimer | None = None,
+    log_id: uuid.UUID | None = None,
+) -> RequestLog | None:
+    """Save the request log record according to the logging policy of the resource.
+
+    The record is saved in the response path, or queued for the background writer if REQUEST_LOG_ASYNC is on. In
+    both cases the record id is known in advance, so the Stubborn headers are added before the record is saved.
+
+    Args:
+        application: called application.
+        resource_stub: called resource.
+        request: incoming request.
+        response_stub: response stub sent.
+        response_status_code: status code of the response.
+        response_body: response body.
+        response_headers: response headers.
+        proxied: True if the request was proxied.
+        destination_url: proxy destination URL.
+        inject_stubborn_headers: add the Stubborn headers to the logged response headers.
+        timer: request timer, the handling time measured so far is logged, the log write is added to it.
+        log_id: id of the record, generated in advance so the hooks deliveries can link to it.
+
+    Returns:
+        RequestLog instance, None if the request is not logged by the policy.
+    """
+    log_policy, sample_rate = resource_stub.active_log_policy
+    if not is_request_logged(log_policy=log_policy, sample_rate=sample_rate, status_code=response_status_code):
+        return None
+
+    log_record = RequestLog(
+        id=log_id or uuid.uuid4(),
         url=os.path.join(settings.DOMAIN_DISPLAY, request.META.get('PATH_INFO')[1:]),
         application=application,
         resource=resource_stub,
         response=response_stub,
         method=request.method,
         params=request.query_params,
-        request_body=request.body.decode(),
         request_headers=dict(request.headers),
         status_code=response_status_code,
-        response_body=response_body,
         response_headers=response_headers,
         ipaddress=request.META.get('REMOTE_ADDR'),
         x_real_ip=request.headers.get('X-REAL-IP'),
         proxied=proxied,
         destination_url=destination_url,
     )
+    if log_policy == enums.LogPolicy.METADATA:
+        log_record.request_headers = log_record.response_headers = {}
+    else:
+        log_record.set_bodies(request_body=request.body.decode(), response_body=response_body)
+        if inject_stubborn_headers:
+            headers = add_stubborn_headers(initial_headers=response_headers or {}, log_id=log_record.id)
+            log_record.response_headers = headers
+
+    timer = timer or RequestTimer()
+    log_record.duration, log_record.timings = timer.elapsed, dict(timer.phases)
+
+    facet_cache.add(log_record)
+    with timer.measure(Phase.LOG):
+        if settings.REQUEST_LOG_ASYNC:
+            request_log_writer.put(log_record)
+        else:
+            log_record.save(force_insert=True)
     return log_record
 
 
+def is_request_logged(log_policy: str, sample_rate: float, status_code: int | None) -> bool:
+    """Check if the request must be logged according to the logging policy.
+
+    Args:
+        log_policy: logging policy of the resource.
+        sample_rate: percentage of the logged requests for the sampled policy.
+        status_code: status code of the response.
+
+    Returns:
+        True if the request must be logged, False otherwise.
+    """
+    if log_policy == enums.LogPolicy.OFF:
+        return False
+    if log_policy == enums.LogPolicy.ERRORS:
+        return status_code is not None and status_code >= 400
+    if log_policy == enums.LogPolicy.SAMPLED:
+        return random.random() * 100 < sample_rate
+    return True
+
+
 def proxy_request(incoming_request: Request, destination_url: str) -> Response:
     """Making a request identical to received one to the destination URL.
 
@@ -75,20 +146,68 @@ def proxy_request(incoming_request: Request, destination_url: str) -> Response:
     body = incoming_request.body.decode()
     headers = clean_headers(incoming_request.headers)
 
-    destination_response = requests.request(
-        method=method, url=destination_url, params=query_params, headers=headers, data=body.encode('utf8')
-    )
+    with PROXY_DURATION.labels(host=urlparse(destination_url).netloc).time():
+        destination_response = requests.request(
+            method=method, url=destination_url, params=query_params, headers=headers, data=body.encode('utf8')
+        )
 
     return destination_response
 
 
-def get_regular_response(application: Application, request: Request, resource: ResourceStub) -> RestResponse:
-    hooks.before_request(resource)
+def make_static_response(encoded_body: EncodedBody, status_code: int, headers: dict[str, str]) -> HttpResponse:
+    """Compose a response with the pre-encoded body.
+
+    Headers are set in the same way as the Django REST Framework response does: the Content-Type header is
+    taken from the renderer and dropped for the empty body.
+
+    Args:
+        encoded_body: pre-encoded response body.
+        status_code: response status code.
+        headers: response headers.
+
+    Returns:
+        Response instance.
+    """
+    response = HttpResponse(content=encoded_body.content, status=status_code)
+    for name, value in headers.items():
+        response[name] = value
+
+    if encoded_body.content_type:
+        response['Content-Type'] = encoded_body.content_type
+    else:
+        del response['Content-Type']
+    response['Content-Length'] = str(len(encoded_body.content))
+    return response
+
+
+def get_regular_response(
+    application: Application, request: Request, resource: ResourceStub, timer: RequestTimer | None = None
+) -> HttpResponse:
+    timer = timer or RequestTimer()
+    log_id = uuid.uuid4()
+    with timer.measure(Phase.HOOKS_BEFORE):
+        hooks.before_request(resource, request_log_id=log_id)
     response_stub = cast(ResponseStub, resource.response)
     request.accepted_renderer = response_stub.renderer
-    response_body = response_stub.body_rendered
+
+    with timer.measure(Phase.RENDER):
+        # static bodies are sent pre-encoded unless the client asked for the renderer options (i.e. JSON indent)
+        encoded_body = None
+        if not response_stub.is_templated and ';' not in request.accepted_media_type:
+            encoded_body = response_stub.encoded_body
+
+        response_body = encoded_body.text if encoded_body else response_stub.body_rendered
+        if encoded_body:
+            response_data = response_body
+        elif response_stub.is_json_format:
+            response_data = json.loads(response_body) if response_body else None
+        else:
+            response_data = response_body
     headers = response_stub.headers
 
+    with timer.measure(Phase.HOOKS_AFTER):
+        hooks.after_request(resource, request_log_id=log_id)
+
     request_log_record = request_log_create(
         application=application,
         resource_stub=resource,
@@ -97,38 +216,40 @@ def get_regular_response(application: Application, request: Request, resource: R
         response_status_code=response_stub.status_code,
         response_body=response_body,
         response_headers=headers,
+        inject_stubborn_headers=resource.inject_stubborn_headers,
+        timer=timer,
+        log_id=log_id,
     )
-
-    if resource.inject_stubborn_headers:
-        headers = add_stubborn_headers(initial_headers=response_stub.headers, log_id=request_log_record.id)
-        request_log_record.response_headers = headers
-        request_log_record.save()
-
-    if response_stub.is_json_format:
-        response_data = json.loads(response_body) if response_body else None
-    else:
-        response_data = response_body
-
-    hooks.after_request(resource)
+    if request_log_record and resource.inject_stubborn_headers:
+        headers = add_stubborn_headers(initial_headers=headers, log_id=request_log_record.id)
+    if settings.SERVER_TIMING_HEADER:
+        headers = headers | {'Server-Timing': timer.get_server_timing()}
 
     log_response(
         response_logger=logger,
         resource_type='STUB',
         status_code=response_stub.status_code,
-        request_log_id=request_log_record.id,
+        request_log_id=request_log_record.id if request_log_record else None,
         body=response_data,
         headers=headers,
     )
 
     try:
+        if encoded_body:
+            return make_static_response(
+                encoded_body=encoded_body, status_code=response_stub.status_code, headers=headers
+            )
         return RestResponse(data=response_data, status=response_stub.status_code, headers=headers)
     finally:
-        if resource.hooks.filter(lifecycle=enums.Lifecycle.AFTER_RESPONSE).exists():
-            hooks.after_response(resource.pk)
+        hooks.after_response(resource, request_log_id=request_log_record.id if request_log_record else None)
 
 
 def get_third_party_service_response(
-    application: Application, request: Request, resource: ResourceStub, tail: str = None
+    application: Application,
+    request: Request,
+    resource: ResourceStub,
+    tail: str = None,
+    timer: RequestTimer | None = None,
 ) -> RestResponse:
     if tail and resource.response_type == ResponseChoices.PROXY_CURRENT:
         raise Http404()
@@ -136,9 +257,14 @@ def get_third_party_service_response(
     destination_address = str(resource.proxy_destination_address)
     remote_url = os.path.join(destination_address, tail) if tail else destination_address
 
-    hooks.before_request(resource)
-    destination_response = proxy_request(incoming_request=request, destination_url=remote_url)
-    hooks.after_request(resource)
+    timer = timer or RequestTimer()
+    log_id = uuid.uuid4()
+    with timer.measure(Phase.HOOKS_BEFORE):
+        hooks.before_request(resource, request_log_id=log_id)
+    with timer.measure(Phase.PROXY):
+        destination_response = proxy_request(incoming_request=request, destination_url=remote_url)
+    with timer.measure(Phase.HOOKS_AFTER):
+        hooks.after_request(resource, request_log_id=log_id)
     response_body = destination_response.content.decode()
     response_headers = clean_headers(dict(destination_response.headers))
 
@@ -159,12 +285,14 @@ def get_third_party_service_response(
         response_headers=response_headers,
         proxied=True,
         destination_url=remote_url,
+        inject_stubborn_headers=resource.inject_stubborn_headers,
+        timer=timer,
+        log_id=log_id,
     )
-
-    if resource.inject_stubborn_headers:
+    if request_log_record and resource.inject_stubborn_headers:
         response_headers = add_stubborn_headers(initial_headers=response_headers, log_id=request_log_record.id)
-        request_log_record.response_headers = response_headers
-        request_log_record.save()
+    if settings.SERVER_TIMING_HEADER:
+        response_headers['Server-Timing'] = timer.get_server_timing()
 
     try:
         response_body = destination_response.json()
@@ -175,7 +303,7 @@ def get_third_party_service_response(
         response_logger=logger,
         resource_type='PROXY',
         status_code=destination_response.status_code,
-        request_log_id=request_log_record.id,
+        request_log_id=request_log_record.id if request_log_record else None,
         body=response_body,
         headers=str(response_headers),
     )
@@ -183,33 +311,28 @@ def get_third_party_service_response(
     try:
         return RestResponse(data=response_body, status=destination_response.status_code, headers=response_headers)
     finally:
-        if resource.hooks.filter(lifecycle=enums.Lifecycle.AFTER_RESPONSE).exists():
-            hooks.after_response(resource.pk)
+        hooks.after_response(resource, request_log_id=request_log_record.id if request_log_record else None)
 
 
 def get_resource_from_request(request: Request, kwargs: dict[Any, Any]) -> ResourceStub:
-    slug = kwargs.get('resource_slug', '')
-    tail = kwargs.get('tail', '')
-
-    application = get_object_or_404(models.Application, slug=kwargs.get('app_slug', ''))
-    resources: QuerySet[ResourceStub] = models.ResourceStub.objects.filter(
-        application=application, slug=slug, is_enabled=True
-    )
-
-    if resource := resources.filter(
-        method=request.method, tail=tail, response_type=ResponseChoices.CUSTOM
-    ).last():  # custom response
-        return resource
+    """Find the enabled resource stub serving the incoming request.
 
-    if resource := resources.filter(
-        method=request.method, tail=tail, response_type=ResponseChoices.PROXY_CURRENT
-    ).last():  # proxy specific URL
-        return resource
+    Args:
+        request: incoming request instance.
+        kwargs: URL keyword arguments.
 
-    if resource := resources.filter(response_type=ResponseChoices.PROXY_GLOBAL).last():  # global proxy
-        return resource
+    Returns:
+        ResourceStub instance with the application and the response objects attached.
 
-    raise Http404('No stub resource found.')
+    Raises:
+        Http404 if there is no enabled application or resource matching the request.
+    """
+    return route_table.resolve(
+        app_slug=kwargs.get('app_slug', ''),
+        resource_slug=kwargs.get('resource_slug', ''),
+        method=request.method,
+        tail=kwargs.get('tail', ''),
+    )
 
 
 def get_same_enabled_resource_stub(reference_obj: ResourceStub) -> ResourceStub | None:
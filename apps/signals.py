@@ -0,0 +1,62 @@
+from typing import Any
+from uuid import UUID
+
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.facets import facet_cache
+from apps.models import Application, RequestStub, ResourceHook, ResourceStub, ResponseStub
+from apps.retention import prune_scheduler
+from apps.routing import bump_configuration_revision, route_table
+
+
+def _configuration_changed(application_id: UUID | None, **kwargs: Any) -> None:
+    """Publish the configuration change for other workers and drop the affected compiled routes.
+
+    The routes are dropped now and once again after the transaction is committed: the second pass protects
+    from the concurrent threads compiling the routes from the not yet committed state.
+
+    Args:
+        application_id: primary key of the changed application.
+        kwargs: extra arguments for the route table invalidation.
+    """
+    if application_id:
+        bump_configuration_revision(application_id)
+    route_table.invalidate(application_id=application_id, **kwargs)
+    transaction.on_commit(lambda: route_table.invalidate(application_id=application_id, **kwargs))
+
+
+@receiver([post_save, post_delete], sender=Application)
+def application_changed(sender: type[Application], instance: Application, **kwargs: Any) -> None:
+    _configuration_changed(application_id=instance.pk, slug=instance.slug)
+
+
+@receiver([post_save, post_delete], sender=ResourceStub)
+def resource_changed(sender: type[ResourceStub], instance: ResourceStub, **kwargs: Any) -> None:
+    _configuration_changed(application_id=instance.application_id)
+    facet_cache.invalidate_resources(instance.application_id)
+
+
+@receiver([post_save, post_delete], sender=ResponseStub)
+def response_changed(sender: type[ResponseStub], instance: ResponseStub, **kwargs: Any) -> None:
+    _configuration_changed(application_id=instance.application_id, response_id=instance.pk)
+
+
+@receiver([post_save, post_delete], sender=RequestStub)
+def request_changed(sender: type[RequestStub], instance: RequestStub, **kwargs: Any) -> None:
+    _configuration_changed(application_id=instance.application_id)
+
+
+@receiver([post_save, post_delete], sender=ResourceHook)
+def hook_changed(sender: type[ResourceHook], instance: ResourceHook, **kwargs: Any) -> None:
+    application_id = (
+        ResourceStub.objects.filter(pk=instance.resource_id).values_list('application_id', flat=True).first()
+    )
+    _configuration_changed(application_id=application_id)
+
+
+@receiver(request_started)
+def start_background_tasks(**kwargs: Any) -> None:
+    prune_scheduler.ensure_started()
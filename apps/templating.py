@@ -0,0 +1,137 @@
+import logging
+import os
+import stat
+import threading
+from typing import Hashable
+
+from django.conf import settings
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, Template, TemplateSyntaxError
+from jinja2.utils import LRUCache
+
+from apps.metrics import observe_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class TemplateCache:
+    """Bounded LRU cache of the compiled Jinja templates sharing the same environment.
+
+    Templates are compiled with the same default options as the `jinja2.Template` constructor does. If the
+    bytecode cache is on, the compiled code is also stored on disk, so freshly started workers load the bytecode
+    instead of compiling the same templates again.
+
+    Jinja loads the code from the cache files, so the directory must be private: None uses the per-user temporary
+    directory Jinja creates and checks itself, other directories are created with 0700 permissions and rejected if
+    they are owned by another user or writable by others. An empty value turns the bytecode cache off.
+    """
+
+    def __init__(self, size: int, bytecode_cache_dir: str | None = '') -> None:
+        bytecode_cache = None
+        if bytecode_cache_dir is None or bytecode_cache_dir:
+            try:
+                bytecode_cache = make_bytecode_cache(bytecode_cache_dir)
+            except OSError as error:
+                logger.warning(f'Template bytecode cache disabled: {error}')
+        self.environment = Environment(bytecode_cache=bytecode_cache, cache_size=0)
+        self._templates = LRUCache(size)
+        self._lock = threading.Lock()
+
+    def get_template(self, key: Hashable, name: str, source: str) -> Template:
+        """Get the compiled template, compile it if there is no template for the key in the cache.
+
+        The cached template is used only if it was compiled from the same source, so an object changed in memory
+        (e.g. validated in the admin form before saving) is never rendered with an outdated template.
+
+        Args:
+            key: cache key, i.e. object's id and modification time.
+            name: template name, used as a bytecode cache key and in the tracebacks.
+            source: template source.
+
+        Returns:
+            Compiled template.
+        """
+        cached = self._templates.get(key)
+        if cached and cached[0] == source:
+            observe_cache_lookup(cache='templates', hit=True)
+            return cached[1]
+
+        observe_cache_lookup(cache='templates', hit=False)
+        template = self.compile(name=name, source=source)
+        with self._lock:
+            self._templates[key] = (source, template)
+        return template
+
+    def compile(self, name: str, source: str) -> Template:
+        """Compile the template using the bytecode cache if available.
+
+        Args:
+            name: template name.
+            source: template source.
+
+        Returns:
+            Compiled template.
+        """
+        bytecode_cache: BytecodeCache | None = self.environment.bytecode_cache
+        if bytecode_cache is None:
+            code = self.environment.compile(source, name)
+        else:
+            bucket = bytecode_cache.get_bucket(self.environment, name, None, source)
+            if bucket.code is None:
+                bucket.code = self.environment.compile(source, name)
+                try:
+                    bytecode_cache.set_bucket(bucket)
+                except OSError as error:
+                    logger.warning(f'Could not store the template bytecode: {error}')
+            code = bucket.code
+        return self.environment.template_class.from_code(
+            self.environment, code, self.environment.make_globals(None), None
+        )
+
+    def clear(self) -> None:
+        """Drop all the compiled templates kept in memory."""
+        with self._lock:
+            self._templates.clear()
+
+
+def make_bytecode_cache(directory: str | None) -> FileSystemBytecodeCache:
+    """Make the file system bytecode cache in a directory only the current user can write to.
+
+    Args:
+        directory: cache directory, None for the private per-user temporary directory made by Jinja.
+
+    Returns:
+        FileSystemBytecodeCache instance.
+
+    Raises:
+        OSError if the directory can not be created or is not private.
+    """
+    if directory is None:
+        return FileSystemBytecodeCache()
+
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    directory_stat = os.stat(directory)
+    if directory_stat.st_uid != os.getuid() or directory_stat.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f'{directory} must be owned by the current user and not writable by others')
+    return FileSystemBytecodeCache(directory=directory)
+
+
+def is_template(source: str | None) -> bool:
+    """Check if the string contains any template tags.
+
+    Args:
+        source: string for checking.
+
+    Returns:
+        True if the string contains template tags (or can not be parsed as a template), False if it is static.
+    """
+    if not source:
+        return False
+    try:
+        return any(token_type != 'data' for _, token_type, _ in template_cache.environment.lex(source))
+    except TemplateSyntaxError:
+        return True
+
+
+template_cache = TemplateCache(
+    size=settings.TEMPLATE_CACHE_SIZE, bytecode_cache_dir=settings.TEMPLATE_BYTECODE_CACHE_DIR
+)
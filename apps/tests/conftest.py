@@ -1,11 +1,36 @@
+from typing import Iterator
+from unittest.mock import patch
+
 import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APIClient
 
+from apps.bulk_writer import webhook_delivery_writer
+from apps.facets import facet_cache
+from apps.routing import route_table
 from apps.tests.application_json_mock import JSON_data
 from apps.tests.data import create_user
 
 
+@pytest.fixture(autouse=True)
+def clean_route_table() -> None:
+    route_table.clear()
+
+
+@pytest.fixture(autouse=True)
+def clean_facet_cache() -> None:
+    facet_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def webhook_delivery_writer_stopped() -> Iterator[None]:
+    # the writer thread would save the deliveries outside the test transaction, the tests flush them instead
+    with patch.object(webhook_delivery_writer, 'start'):
+        yield
+    while webhook_delivery_writer._take_batch():
+        pass
+
+
 @pytest.fixture
 def api_client() -> APIClient:
     return APIClient()
@@ -1,7 +1,7 @@
 from faker import Faker
 
 from apps.enums import Action, HTTPMethods, Lifecycle, ResponseChoices
-from apps.models import Application, RequestStub, ResourceHook, ResourceStub, ResponseStub, User
+from apps.models import Application, RequestLog, RequestStub, ResourceHook, ResourceStub, ResponseStub, User
 from apps.tests import factories
 
 fake = Faker()
@@ -70,3 +70,12 @@ def create_request_stub(**kwargs) -> RequestStub:
     kwargs.setdefault('description', fake.sentence(nb_words=3)[:30])
 
     return factories.RequestStub.create(**kwargs)
+
+
+def create_request_log(**kwargs) -> RequestLog:
+    kwargs.setdefault('method', HTTPMethods.GET.value)
+    kwargs.setdefault('url', fake.url())
+    kwargs.setdefault('status_code', 200)
+    kwargs.setdefault('application', create_application())
+
+    return factories.RequestLog.create(**kwargs)
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from apps.benchmark import compare_results, percentile
+from apps.models import Application
+
+
+def make_results(rps, p95, queries):
+    stats = {'rps': rps, 'p50': 1, 'p95': p95, 'p99': p95, 'queries_per_request': queries}
+    return {'scenarios': {'static-json': stats}}
+
+
+def test_percentile():
+    assert percentile([5.0], 95) == 5.0
+    assert percentile([float(value) for value in range(1, 101)], 50) == 50.5
+
+
+def test_compare_results():
+    baseline = make_results(rps=1000, p95=10, queries=1)
+
+    assert compare_results(make_results(rps=950, p95=10.5, queries=1), baseline, tolerance=10) == []
+    assert compare_results(make_results(rps=850, p95=10, queries=1), baseline, tolerance=10) == [
+        'static-json: 850 RPS, was 1000'
+    ]
+    assert compare_results(make_results(rps=1000, p95=12, queries=2), baseline, tolerance=10) == [
+        'static-json: p95 12 ms, was 10',
+        'static-json: p99 12 ms, was 10',
+        'static-json: 2 queries per request, was 1',
+    ]
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_stubs(tmp_path):
+    output = tmp_path / 'benchmark.json'
+
+    call_command('benchmark_stubs', requests=50, concurrency=4, output=str(output))
+
+    results = json.loads(output.read_text())
+    assert set(results['scenarios']) == {'static-json', 'templated-json', 'xml', 'hooks', 'proxy'}
+    for stats in results['scenarios'].values():
+        assert stats['errors'] == 0
+        assert stats['rps'] > 0
+        assert stats['p50'] <= stats['p95'] <= stats['p99']
+    assert results['worker_rss_mb']
+    assert not Application.objects.exists()
+
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(make_results(rps=10**9, p95=0.001, queries=0)))
+    with pytest.raises(CommandError, match='Slower than the baseline'):
+        call_command('benchmark_stubs', requests=10, concurrency=2, output=str(output), baseline=str(baseline))
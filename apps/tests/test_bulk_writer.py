@@ -0,0 +1,64 @@
+from unittest.mock import patch
+
+import pytest
+
+from apps.bulk_writer import BulkWriter, OverflowPolicy
+from apps.models import RequestLog
+from apps.tests.data import create_application
+
+
+def make_log(application) -> RequestLog:
+    return RequestLog(application=application, method='GET', url='http://testserver/app/resource')
+
+
+@pytest.mark.django_db
+class TestBulkWriter:
+    @pytest.fixture(autouse=True)
+    def no_flusher_thread(self):
+        with patch.object(BulkWriter, 'start'):
+            yield
+
+    def test_objects_saved_in_batches(self, django_assert_num_queries):
+        application = create_application()
+        writer = BulkWriter(model=RequestLog, queue_size=10, batch_size=2, flush_interval=1)
+        logs = [make_log(application) for _ in range(3)]
+        for log in logs:
+            assert writer.put(log)
+
+        with django_assert_num_queries(6):  # 2 batches: savepoint, insert, release
+            assert writer.flush() == 3
+
+        assert set(RequestLog.objects.values_list('id', flat=True)) == {log.id for log in logs}
+        assert writer.stats == {'queued': 0, 'written': 3, 'dropped': 0, 'failed': 0}
+
+    def test_overflow_dropped(self):
+        application = create_application()
+        writer = BulkWriter(model=RequestLog, queue_size=1, batch_size=10, flush_interval=1)
+
+        assert writer.put(make_log(application))
+        assert not writer.put(make_log(application))
+        assert writer.stats['dropped'] == 1
+        assert writer.flush() == 1
+
+    def test_overflow_blocks(self):
+        writer = BulkWriter(
+            model=RequestLog, queue_size=1, batch_size=10, flush_interval=1, overflow=OverflowPolicy.BLOCK
+        )
+        writer.put(make_log(create_application()))
+
+        with patch.object(writer._queue, 'put') as mocked_put:
+            writer.put(make_log(create_application()))
+        mocked_put.assert_called_once()
+        assert mocked_put.call_args.kwargs == {'block': True}
+
+    def test_invalid_objects_skipped(self):
+        application = create_application()
+        writer = BulkWriter(model=RequestLog, queue_size=10, batch_size=10, flush_interval=1)
+        valid_log = make_log(application)
+        writer.put(valid_log)
+        writer.put(make_log(application))
+        writer.put(valid_log)  # duplicate primary key
+
+        assert writer.flush() == 2
+        assert writer.stats['failed'] == 1
+        assert RequestLog.objects.filter(pk=valid_log.pk).exists()
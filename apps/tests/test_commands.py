@@ -0,0 +1,241 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps import partitioning
+from apps.models import Application, LogBlob, RequestLog, save_log_blobs
+from apps.retention import ORPHAN_BLOB_GRACE_PERIOD, PRUNE_LOCK_ID, prune_scheduler
+from apps.tests.data import create_application, create_request_log
+
+
+@pytest.mark.django_db
+class TestCompressRequestLogs:
+    def test_long_bodies_compressed(self, settings):
+        settings.REQUEST_LOG_SEARCHABLE_LENGTH = 10
+        application = create_request_log().application
+        logs = [
+            create_request_log(application=application, request_body='a' * 200, response_body='short'),
+            create_request_log(application=application, request_body=None, response_body='b' * 200),
+        ]
+        short_log = create_request_log(application=application, request_body='short', response_body='short')
+
+        call_command('compress_request_logs', threshold=100, batch_size=1)
+
+        for log in logs:
+            stored_log = RequestLog.objects.get(pk=log.pk)
+            assert stored_log.request_body_text == log.request_body
+            assert stored_log.response_body_text == log.response_body
+        stored_log = RequestLog.objects.get(pk=logs[0].pk)
+        assert stored_log.request_body == 'a' * 10
+        assert stored_log.request_body_compressed is not None
+        assert stored_log.response_body == 'short'
+        assert RequestLog.objects.get(pk=short_log.pk).request_body_compressed is None
+
+    def test_compressed_bodies_not_compressed_again(self, settings):
+        settings.REQUEST_LOG_SEARCHABLE_LENGTH = 100
+        log = create_request_log(request_body='a' * 1000, response_body='b' * 150)
+        call_command('compress_request_logs', threshold=500)
+
+        call_command('compress_request_logs', threshold=50, stdout=StringIO())
+
+        stored_log = RequestLog.objects.get(pk=log.pk)
+        assert stored_log.request_body_text == 'a' * 1000
+        assert stored_log.response_body_text == 'b' * 150
+        assert stored_log.response_body_compressed is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL partitioning')
+class TestPartitionRequestLogs:
+    def create_logs(self, *ages: int) -> list[RequestLog]:
+        application = create_request_log().application
+        RequestLog.objects.all().delete()
+        logs = [create_request_log(application=application) for _ in ages]
+        for log, age in zip(logs, ages):
+            RequestLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=age))
+        return logs
+
+    def test_table_partitioned(self):
+        logs = self.create_logs(0, 3, 10)
+
+        call_command('partition_request_logs', interval='day', ahead=2, retention_days=0)
+
+        assert partitioning.is_partitioned()
+        partitions = partitioning.get_partitions()
+        assert partitions[0].start is None  # default partition
+        assert len(partitions) == 1 + 11 + 2
+        assert set(RequestLog.objects.values_list('pk', flat=True)) == {log.pk for log in logs}
+        assert RequestLog.objects.get(pk=logs[0].pk).application_id == logs[0].application_id
+
+        create_request_log(application=logs[0].application)
+        with pytest.raises(IntegrityError), transaction.atomic():
+            create_request_log(application_id=uuid.uuid4())  # foreign keys restored
+
+    def test_expired_partitions_dropped(self):
+        logs = self.create_logs(0, 3, 25)
+        call_command('partition_request_logs', interval='week', ahead=1, retention_days=0)
+
+        call_command('partition_request_logs', interval='week', ahead=1, retention_days=18)
+
+        moment = timezone.now() - timedelta(days=18)
+        assert all(partition.end > moment for partition in partitioning.get_partitions() if partition.end)
+        assert set(RequestLog.objects.values_list('pk', flat=True)) == {logs[0].pk, logs[1].pk}
+
+    def test_blobs_of_dropped_partitions_deleted(self, settings):
+        settings.REQUEST_LOG_BLOB_THRESHOLD = 10
+        application = create_application()
+        for age, body in ((0, 'kept body' * 2), (25, 'deleted body' * 2)):
+            log = RequestLog(application=application)
+            log.set_bodies(request_body=None, response_body=body)
+            log.save()
+            RequestLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=age))
+        LogBlob.objects.update(last_used_at=timezone.now() - ORPHAN_BLOB_GRACE_PERIOD * 2)
+        call_command('partition_request_logs', interval='week', ahead=1, retention_days=0)
+
+        call_command('partition_request_logs', interval='week', ahead=1, retention_days=18, stdout=StringIO())
+
+        assert list(LogBlob.objects.values_list('content', flat=True)) == ['kept body' * 2]
+
+    def test_default_partition_logs_deleted_in_batches(self):
+        logs = self.create_logs(0, 3, 3, 3)
+        call_command('partition_request_logs', interval='day', ahead=1, retention_days=0)
+        # older than the oldest partition, so the logs go to the default partition
+        RequestLog.objects.filter(pk__in=[log.pk for log in logs[1:]]).update(
+            created_at=timezone.now() - timedelta(days=30)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            removed = partitioning.remove_logs_before(timezone.now() - timedelta(days=10), batch_size=2)
+
+        assert removed == 3
+        assert len([query for query in queries if query['sql'].startswith('DELETE')]) == 2
+        assert set(RequestLog.objects.values_list('pk', flat=True)) == {logs[0].pk}
+
+    def test_default_partition_logs_moved(self):
+        logs = self.create_logs(0)
+        call_command('partition_request_logs', interval='day', ahead=1, retention_days=0)
+        future_logs = [create_request_log(application=logs[0].application) for _ in range(2)]
+        RequestLog.objects.filter(pk__in=[log.pk for log in future_logs]).update(
+            created_at=timezone.now() + timedelta(days=5)
+        )
+
+        created = partitioning.create_future_partitions(interval='day', ahead=6)
+
+        assert len(created) == 5
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT tableoid::regclass::text FROM {RequestLog._meta.db_table} WHERE id = ANY(%s)',
+                [[log.pk for log in future_logs]],
+            )
+            assert {row[0] for row in cursor.fetchall()} <= set(created)
+        assert RequestLog.objects.count() == 3
+        create_request_log(application=logs[0].application, created_at=timezone.now() + timedelta(days=5))
+        with pytest.raises(IntegrityError), transaction.atomic():
+            create_request_log(application_id=uuid.uuid4(), created_at=timezone.now() + timedelta(days=5))
+
+    def test_batched_delete_without_partitioning(self):
+        logs = self.create_logs(0, 3, 10)
+
+        call_command('partition_request_logs', retention_days=5, batch_size=1)
+
+        assert not partitioning.is_partitioned()
+        assert set(RequestLog.objects.values_list('pk', flat=True)) == {logs[0].pk, logs[1].pk}
+
+
+@pytest.mark.django_db
+class TestPruneRequestLogs:
+    def create_log(self, application: Application, age: int, **kwargs) -> RequestLog:
+        log = create_request_log(application=application, **kwargs)
+        RequestLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=age))
+        return log
+
+    def test_expired_logs_deleted(self, settings):
+        settings.REQUEST_LOG_RETENTION_DAYS = 30
+        short_ttl_application = create_application(log_retention_days=7)
+        default_ttl_application = create_application()
+        forever_application = create_application(log_retention_days=0)
+        kept_logs = [
+            self.create_log(short_ttl_application, age=1),
+            self.create_log(default_ttl_application, age=10),
+            self.create_log(forever_application, age=100),
+        ]
+        for _ in range(3):
+            self.create_log(short_ttl_application, age=10)
+        self.create_log(default_ttl_application, age=31)
+
+        output = StringIO()
+        call_command('prune_request_logs', chunk_size=2, sleep=0, stdout=output)
+
+        assert set(RequestLog.objects.values_list('pk', flat=True)) == {log.pk for log in kept_logs}
+        assert f'({short_ttl_application.slug}): 3 logs deleted' in output.getvalue()
+        assert 'Deleted 4 request logs.' in output.getvalue()
+
+    def test_dry_run(self, settings):
+        settings.REQUEST_LOG_RETENTION_DAYS = 1
+        application = create_application()
+        self.create_log(application, age=2)
+
+        output = StringIO()
+        call_command('prune_request_logs', dry_run=True, stdout=output)
+
+        assert RequestLog.objects.count() == 1
+        assert '1 expired logs left' in output.getvalue()
+
+    def test_orphan_blobs_deleted(self, settings):
+        settings.REQUEST_LOG_RETENTION_DAYS = 1
+        settings.REQUEST_LOG_BLOB_THRESHOLD = 10
+        application = create_application()
+        for age, body in ((0, 'kept body' * 2), (2, 'kept body' * 2), (2, 'deleted body' * 2)):
+            log = RequestLog(application=application)
+            log.set_bodies(request_body=None, response_body=body)
+            log.save()
+            RequestLog.objects.filter(pk=log.pk).update(created_at=timezone.now() - timedelta(days=age))
+
+        LogBlob.objects.update(last_used_at=timezone.now() - ORPHAN_BLOB_GRACE_PERIOD * 2)
+
+        call_command('prune_request_logs', stdout=StringIO())
+
+        assert list(LogBlob.objects.values_list('content', flat=True)) == ['kept body' * 2]
+
+    def test_recently_used_orphan_blobs_kept(self, settings):
+        settings.REQUEST_LOG_BLOB_THRESHOLD = 10
+        stale_log = RequestLog(application=create_application())
+        stale_log.set_bodies(request_body=None, response_body='reused body' * 2)
+        stale_log.save()
+        RequestLog.objects.all().delete()
+        LogBlob.objects.update(last_used_at=timezone.now() - ORPHAN_BLOB_GRACE_PERIOD * 2)
+        # the log reusing the blob is still in the writer queue
+        queued_log = RequestLog(application=stale_log.application)
+        queued_log.set_bodies(request_body=None, response_body='reused body' * 2)
+        save_log_blobs([queued_log])
+
+        call_command('prune_request_logs', stdout=StringIO())
+
+        assert LogBlob.objects.count() == 1
+        queued_log.save()
+        assert RequestLog.objects.get().response_body_text == 'reused body' * 2
+
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL advisory locks')
+    def test_scheduler_skips_locked_run(self, settings):
+        settings.REQUEST_LOG_RETENTION_DAYS = 1
+        self.create_log(create_application(), age=2)
+
+        another_session = connection.copy()
+        try:
+            with another_session.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_lock(%s)', [PRUNE_LOCK_ID])
+            assert prune_scheduler.run_once() is None
+        finally:
+            with another_session.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(%s)', [PRUNE_LOCK_ID])
+            another_session.close()
+
+        reports = prune_scheduler.run_once()
+        assert reports is not None
+        assert sum(report.deleted for report in reports) == 1
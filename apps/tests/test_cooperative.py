@@ -0,0 +1,44 @@
+import time
+
+import gevent
+import psycopg2
+import pytest
+from django.db import connection
+from psycopg2 import extensions
+
+from apps.cooperative import gevent_wait_callback, make_psycopg_cooperative
+
+
+@pytest.fixture
+def wait_callback():
+    yield
+    extensions.set_wait_callback(None)
+
+
+def test_not_patched(wait_callback):
+    assert not make_psycopg_cooperative()
+    assert extensions.get_wait_callback() is None
+
+
+def test_patched(wait_callback, monkeypatch):
+    monkeypatch.setattr('apps.cooperative.is_gevent_patched', lambda: True)
+
+    assert make_psycopg_cooperative()
+    assert extensions.get_wait_callback() is gevent_wait_callback
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='psycopg2 wait callback')
+def test_queries_run_concurrently(wait_callback):
+    extensions.set_wait_callback(gevent_wait_callback)
+    params = connection.get_connection_params()  # type: ignore[func-returns-value]
+
+    def query() -> None:
+        with psycopg2.connect(**params) as db_connection, db_connection.cursor() as cursor:
+            cursor.execute('SELECT pg_sleep(0.5)')
+        db_connection.close()
+
+    started_at = time.perf_counter()
+    gevent.joinall([gevent.spawn(query) for _ in range(4)], raise_error=True)
+
+    assert time.perf_counter() - started_at < 1.5  # 2 seconds one by one
@@ -0,0 +1,77 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from apps.bulk_writer import OverflowPolicy
+from apps.enums import Action, Lifecycle
+from apps.executor import BoundedExecutor
+from apps.hooks import after_response_executor
+from apps.tests.data import create_request_stub, create_resource_hook, create_resource_stub
+from apps.tests.utils import get_url
+
+
+class TestBoundedExecutor:
+    def test_tasks_run_by_fixed_pool(self):
+        executor = BoundedExecutor(name='test', workers=2, queue_size=100)
+        thread_names = set()
+
+        for _ in range(20):
+            executor.submit(lambda: thread_names.add(threading.current_thread().name))
+        executor.join()
+
+        assert thread_names <= {'test-0', 'test-1'}
+        assert executor.stats == {'queued': 0, 'completed': 20, 'dropped': 0, 'failed': 0}
+
+    def test_task_arguments_passed(self):
+        executor = BoundedExecutor(name='test', workers=1, queue_size=10)
+        results: list[int] = []
+
+        executor.submit(results.append, 1)
+        executor.submit(results.extend, [2, 3])
+        executor.join()
+
+        assert results == [1, 2, 3]
+
+    def test_overflow_dropped(self):
+        executor = BoundedExecutor(name='test', workers=1, queue_size=1)
+
+        with patch.object(BoundedExecutor, 'start'):
+            assert executor.submit(print)
+            assert not executor.submit(print)
+        assert executor.stats['dropped'] == 1
+
+    def test_overflow_blocks(self):
+        executor = BoundedExecutor(name='test', workers=1, queue_size=1, overflow=OverflowPolicy.BLOCK)
+
+        with patch.object(BoundedExecutor, 'start'), patch.object(executor._queue, 'put') as mocked_put:
+            executor.submit(print)
+        mocked_put.assert_called_once()
+        assert mocked_put.call_args.kwargs == {'block': True}
+
+    def test_failed_task_counted(self):
+        executor = BoundedExecutor(name='test', workers=1, queue_size=10)
+
+        executor.submit(lambda: 1 / 0)
+        executor.submit(print)
+        executor.join()
+
+        assert executor.stats == {'queued': 0, 'completed': 1, 'failed': 1, 'dropped': 0}
+
+
+@pytest.mark.django_db
+@patch('requests.Session.request', return_value=None)
+def test_after_response_hooks_executed(mocked_request, api_client):
+    resource = create_resource_stub(method='GET')
+    hook_request = create_request_stub(application=resource.application, method='POST', uri='https://test.com')
+    create_resource_hook(
+        resource=resource, lifecycle=Lifecycle.AFTER_RESPONSE, action=Action.WEBHOOK, request=hook_request
+    )
+
+    response = api_client.get(path=get_url(resource))
+    after_response_executor.join()
+
+    assert response.status_code == 200
+    mocked_request.assert_called_once_with(
+        method='POST', url='https://test.com', params={}, headers={}, data=None, timeout=(5, 30)
+    )
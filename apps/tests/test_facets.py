@@ -0,0 +1,69 @@
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from apps.facets import facet_cache
+from apps.models import RequestLog
+from apps.tests.data import create_application, create_request_log, create_resource_stub, create_user
+
+
+@pytest.mark.django_db
+class TestFacetCache:
+    def test_values_cached(self, django_assert_num_queries):
+        application = create_application()
+        create_request_log(application=application, status_code=404)
+        create_request_log(application=application, status_code=200)
+        create_request_log(status_code=500)
+
+        assert facet_cache.get_values('status_code', application.pk) == [200, 404]
+        with django_assert_num_queries(0):
+            assert facet_cache.get_values('status_code', application.pk) == [200, 404]
+        assert facet_cache.get_values('status_code') == [200, 404, 500]
+
+    def test_new_log_values_added(self):
+        application = create_application()
+        create_request_log(application=application, status_code=200)
+        facet_cache.get_values('status_code', application.pk)
+        facet_cache.get_values('status_code', create_application().pk)
+
+        facet_cache.add(RequestLog(application=application, status_code=None))
+
+        assert facet_cache.get_values('status_code', application.pk) == [200, None]
+
+    def test_expired_values_reloaded(self, settings):
+        settings.REQUEST_LOG_FACET_TTL = 0
+        application = create_application()
+        create_request_log(application=application, method='GET')
+        facet_cache.get_values('method', application.pk)
+
+        create_request_log(application=application, method='POST')
+
+        assert facet_cache.get_values('method', application.pk) == ['GET', 'POST']
+
+    def test_resources_invalidated(self):
+        application = create_application()
+        resource = create_resource_stub(application=application, slug='first')
+        assert facet_cache.get_resources(application.pk) == [(resource.pk, str(resource))]
+
+        resource.slug = 'second'
+        resource.save()
+
+        assert facet_cache.get_resources(application.pk) == [(resource.pk, str(resource))]
+
+    def test_admin_filters_cached(self):
+        application = create_application()
+        create_resource_stub(application=application)
+        create_request_log(application=application, status_code=201)
+        client = Client()
+        client.force_login(create_user(is_superuser=True, is_staff=True))
+        url = f'/admin/apps/requestlog/?application={application.pk}'
+        client.get(url)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(url)
+
+        assert response.status_code == 200
+        assert f'?application={application.pk}&amp;status_code=201' in response.content.decode()
+        assert not [query for query in context.captured_queries if 'DISTINCT' in query['sql']]
+        assert not [query for query in context.captured_queries if 'FROM "apps_resourcestub"' in query['sql']]
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from apps.fake_data import FakerPool, PregeneratedFaker, faker_pool, validate_faker_locale
+from apps.tests.data import create_application, create_response_stub
+
+
+class TestFakerPool:
+    def test_faker_reused(self):
+        pool = FakerPool()
+
+        assert pool.get() is pool.get()
+        assert pool.get('de_DE') is not pool.get()
+        assert pool.get('de_DE').locales == ['de_DE']
+
+    def test_pregenerated_values(self, settings):
+        settings.FAKE_DATA_POOL_SIZE = 3
+        settings.FAKE_DATA_POOL_PROVIDERS = ['name']
+        faker = FakerPool().get()
+        assert isinstance(faker, PregeneratedFaker)
+
+        faker.warm_up()
+        with patch.object(faker.faker, 'name') as mocked_name:
+            names = {faker.name() for _ in range(50)}
+
+        mocked_name.assert_not_called()
+        assert names <= set(faker.get_pool('name'))
+        assert len(faker.get_pool('name')) == 3
+
+    def test_pregenerated_values_with_arguments(self, settings):
+        settings.FAKE_DATA_POOL_SIZE = 3
+        settings.FAKE_DATA_POOL_PROVIDERS = ['pyint']
+        faker = FakerPool().get()
+
+        assert faker.pyint(min_value=7, max_value=7) == 7
+        assert 'pyint' not in faker._pools
+        assert faker.word()
+
+    def test_validate_faker_locale(self):
+        validate_faker_locale('de_DE')
+        validate_faker_locale(None)
+        with pytest.raises(ValidationError):
+            validate_faker_locale('xx_XX')
+
+
+@pytest.mark.django_db
+class TestApplicationLocale:
+    def test_body_rendered_with_application_locale(self):
+        application = create_application(faker_locale='ru_RU')
+        response = create_response_stub(application=application, body='{{ fake.locales[0] }}')
+
+        assert response.body_rendered == 'ru_RU'
+
+    def test_body_rendered_with_default_locale(self):
+        response = create_response_stub(body='{{ fake.locales[0] }}')
+
+        assert response.body_rendered == 'en_US'
+
+    @pytest.mark.parametrize('pool_size', [0, 3])
+    def test_unique_values_tracked_per_render(self, settings, pool_size, request):
+        settings.FAKE_DATA_POOL_SIZE = pool_size
+        faker_pool.clear()
+        request.addfinalizer(faker_pool.clear)
+        response = create_response_stub(body='{{ fake.unique.random_int(1, 2) }},{{ fake.unique.random_int(1, 2) }}')
+
+        for _ in range(5):  # the values of the previous renders are not taken
+            assert sorted(response.body_rendered.split(',')) == ['1', '2']
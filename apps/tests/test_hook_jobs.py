@@ -0,0 +1,144 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.enums import Action, Lifecycle
+from apps.hook_jobs import claim_jobs, run_job, run_worker
+from apps.hooks import HookBackend, defer_hooks, process_action
+from apps.models import HookJob, RequestLog
+from apps.tests.data import create_request_stub, create_resource_hook, create_resource_stub
+from apps.tests.utils import get_url
+
+
+def create_webhook_resource():
+    resource = create_resource_stub(method='GET')
+    request = create_request_stub(
+        application=resource.application, method='POST', uri='https://test.com', headers={'X-Hook': '1'}
+    )
+    create_resource_hook(resource=resource, lifecycle=Lifecycle.AFTER_RESPONSE, action=Action.WEBHOOK, request=request)
+    return resource
+
+
+@pytest.mark.django_db
+@patch('requests.Session.request', return_value=None)
+class TestHookJobs:
+    def test_hooks_deferred(self, mocked_request, settings, api_client):
+        settings.AFTER_RESPONSE_HOOK_BACKEND = HookBackend.DATABASE
+        resource = create_webhook_resource()
+
+        response = api_client.get(path=get_url(resource))
+
+        assert response.status_code == 200
+        mocked_request.assert_not_called()
+        job = HookJob.objects.get()
+        assert job.application_id == resource.application_id
+        assert job.request_log_id == RequestLog.objects.get().pk
+        [step] = job.steps
+        assert step['action'] == Action.WEBHOOK
+        assert step['lifecycle'] == Lifecycle.AFTER_RESPONSE
+        assert step['headers'] == {'X-Hook': '1'}
+        assert step['method'] == 'POST'
+        assert step['uri'] == 'https://test.com'
+
+    def test_claimed_jobs_leased(self, mocked_request):
+        steps = create_webhook_resource().hook_plan.after_response
+        first_job = defer_hooks(steps)
+        second_job = defer_hooks(steps)
+        HookJob.objects.filter(pk=second_job.pk).update(available_at=timezone.now() + timedelta(minutes=1))
+
+        jobs = claim_jobs(limit=10, lease=60)
+
+        assert jobs == [first_job]
+        assert jobs[0].attempts == 1
+        assert HookJob.objects.get(pk=first_job.pk).available_at > timezone.now() + timedelta(seconds=50)
+        assert claim_jobs(limit=10, lease=60) == []
+
+    def test_job_run_and_deleted(self, mocked_request):
+        defer_hooks(create_webhook_resource().hook_plan.after_response)
+        job = claim_jobs(limit=1, lease=60)[0]
+
+        assert run_job(job, max_attempts=3)
+
+        mocked_request.assert_called_once_with(
+            method='POST', url='https://test.com', params={}, headers={'X-Hook': '1'}, data=None, timeout=(5, 30)
+        )
+        assert not HookJob.objects.exists()
+
+    def test_failed_job_retried(self, mocked_request, settings):
+        settings.WEBHOOK_RETRIES = 0
+        mocked_request.side_effect = requests.ConnectionError('Connection refused')
+        defer_hooks(create_webhook_resource().hook_plan.after_response)
+        job = claim_jobs(limit=1, lease=0)[0]
+
+        assert not run_job(job, max_attempts=2)
+        assert HookJob.objects.filter(pk=job.pk).exists()
+
+        job = claim_jobs(limit=1, lease=0)[0]
+        assert job.attempts == 2
+        assert not run_job(job, max_attempts=2)
+        assert not HookJob.objects.exists()
+        assert mocked_request.call_count == 2
+
+    def test_delivered_webhooks_not_retried(self, mocked_request, settings):
+        settings.WEBHOOK_RETRIES = 0
+        resource = create_webhook_resource()
+        failing_request = create_request_stub(application=resource.application, method='POST', uri='https://fail.com')
+        create_resource_hook(
+            resource=resource,
+            lifecycle=Lifecycle.AFTER_RESPONSE,
+            action=Action.WEBHOOK,
+            request=failing_request,
+            order=2,
+        )
+        create_resource_hook(
+            resource=resource, lifecycle=Lifecycle.AFTER_RESPONSE, action=Action.WAIT, timeout=0, order=3
+        )
+        defer_hooks(resource.hook_plan.after_response)
+
+        def send(url, **kwargs):
+            if url == 'https://fail.com':
+                raise requests.ConnectionError('Connection refused')
+            return Mock(status_code=200, content=b'')
+
+        mocked_request.side_effect = send
+        for _ in range(3):
+            assert not run_job(claim_jobs(limit=1, lease=0)[0], max_attempts=3)
+
+        sent_urls = [call.kwargs['url'] for call in mocked_request.call_args_list]
+        assert sorted(sent_urls) == ['https://fail.com'] * 3 + ['https://test.com']
+        assert not HookJob.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@patch('requests.Session.request', return_value=None)
+def test_run_hook_worker(mocked_request):
+    steps = create_webhook_resource().hook_plan.after_response
+    for _ in range(5):
+        defer_hooks(steps)
+    out = StringIO()
+
+    call_command('run_hook_worker', concurrency=2, poll_interval=0.01, once=True, stdout=out)
+
+    assert mocked_request.call_count == 5
+    assert not HookJob.objects.exists()
+    assert '5 jobs done' in out.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_long_job_lease_extended():
+    resource = create_resource_stub(method='GET')
+    create_resource_hook(resource=resource, lifecycle=Lifecycle.AFTER_RESPONSE, action=Action.WAIT, timeout=1)
+    defer_hooks(resource.hook_plan.after_response)
+    mocked_wait = Mock(side_effect=lambda **kwargs: time.sleep(0.5))
+
+    with patch.dict(process_action, {Action.WAIT: mocked_wait}):
+        done_jobs = run_worker(concurrency=2, lease=0.2, max_attempts=3, poll_interval=0.01, once=True)
+
+    assert done_jobs == 1
+    mocked_wait.assert_called_once()
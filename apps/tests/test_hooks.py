@@ -0,0 +1,202 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from apps import hooks, webhooks
+from apps.bulk_writer import webhook_delivery_writer
+from apps.enums import Action, Lifecycle
+from apps.models import HookStep, RequestLog, WebhookDelivery
+from apps.tests.data import create_application, create_request_stub, create_resource_hook, create_resource_stub
+from apps.tests.utils import get_url
+
+
+def make_step(action: str, uri: str | None = None) -> HookStep:
+    return HookStep(
+        action=action,
+        lifecycle=Lifecycle.AFTER_REQUEST,
+        timeout=0,
+        headers={},
+        body=None,
+        method='POST',
+        uri=uri,
+        format=None,
+        query_params={},
+    )
+
+
+class TestWebhooks:
+    def test_session_per_host(self):
+        session = webhooks.get_session('https://hooks.example.com/foo')
+
+        assert webhooks.get_session('https://hooks.example.com/bar?baz=1') is session
+        assert webhooks.get_session('https://other.example.com/foo') is not session
+        assert webhooks.get_session('http://hooks.example.com/foo') is not session
+        assert isinstance(session.get_adapter('https://hooks.example.com/foo'), webhooks.TimedHTTPAdapter)
+
+    def test_adjacent_webhooks_sent_at_once(self):
+        barrier = threading.Barrier(2, timeout=5)
+        called = []
+
+        def send(uri, **kwargs):
+            if uri:
+                barrier.wait()  # fails unless both webhooks are sent at the same time
+            called.append(uri)
+
+        steps = (make_step(Action.WEBHOOK, 'https://a.com'), make_step(Action.WEBHOOK, 'https://b.com'))
+        with patch.dict(hooks.process_action, {Action.WEBHOOK: send}):
+            hooks.process_hook(steps=steps)
+
+        assert sorted(called) == ['https://a.com', 'https://b.com']
+
+    def test_wait_splits_webhooks(self):
+        steps = (
+            make_step(Action.WEBHOOK, 'https://a.com'),
+            make_step(Action.WEBHOOK, 'https://b.com'),
+            make_step(Action.WAIT),
+            make_step(Action.WAIT),
+            make_step(Action.WEBHOOK, 'https://c.com'),
+        )
+
+        batches = [[step.uri for step in batch] for batch in hooks._split_into_batches(steps)]
+
+        assert batches == [['https://a.com', 'https://b.com'], [None], [None], ['https://c.com']]
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    status_codes: list[int] = []
+
+    def do_POST(self):
+        body = b'{"ok": true}'
+        self.send_response(self.status_codes.pop(0))
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_server():
+    server = ThreadingHTTPServer(('localhost', 0), FlakyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_port}/hook'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+class TestWebhookDeliveries:
+    def test_attempts_recorded(self, settings, webhook_server):
+        settings.WEBHOOK_RETRIES = 2
+        application = create_application()
+        FlakyHandler.status_codes = [503, 200]
+
+        response = webhooks.send_webhook(
+            method='POST',
+            url=webhook_server,
+            params={'a': '1'},
+            headers={},
+            body='{}',
+            lifecycle=Lifecycle.AFTER_RESPONSE,
+            application_id=application.pk,
+        )
+        webhook_delivery_writer.flush()
+
+        assert response is not None and response.status_code == 200
+        first, second = WebhookDelivery.objects.order_by('attempt')
+        assert (first.attempt, first.status_code, second.attempt, second.status_code) == (1, 503, 2, 200)
+        for delivery in (first, second):
+            assert delivery.application == application
+            assert delivery.url == webhook_server
+            assert delivery.response_size == len(b'{"ok": true}')
+            assert delivery.dns_time is not None and delivery.connect_time is not None
+            assert delivery.total_time is not None
+            assert 0 <= delivery.dns_time + delivery.connect_time <= delivery.total_time
+            assert delivery.error is None
+
+    def test_connection_errors_retried(self, settings):
+        settings.WEBHOOK_RETRIES = 1
+        with socket.socket() as closed_socket:
+            closed_socket.bind(('localhost', 0))
+            url = f'http://localhost:{closed_socket.getsockname()[1]}/hook'
+
+        with pytest.raises(requests.ConnectionError):
+            webhooks.send_webhook(
+                method='POST',
+                url=url,
+                params=None,
+                headers=None,
+                body=None,
+                lifecycle=Lifecycle.AFTER_REQUEST,
+                application_id=create_application().pk,
+            )
+        webhook_delivery_writer.flush()
+
+        deliveries = WebhookDelivery.objects.order_by('attempt')
+        assert [delivery.attempt for delivery in deliveries] == [1, 2]
+        assert all(delivery.status_code is None and delivery.error for delivery in deliveries)
+
+    def test_dropped_connections_not_retried(self, settings):
+        settings.WEBHOOK_RETRIES = 2
+        accepted = []
+
+        def drop_after_request(server_socket):
+            while True:
+                try:
+                    connection, _ = server_socket.accept()
+                except OSError:  # the server socket is closed
+                    return
+                accepted.append(connection)
+                connection.recv(65536)  # the destination gets the request and drops the connection
+                connection.close()
+
+        with socket.socket() as server_socket:
+            server_socket.bind(('localhost', 0))
+            server_socket.listen()
+            threading.Thread(target=drop_after_request, args=(server_socket,), daemon=True).start()
+
+            with pytest.raises(requests.ConnectionError):
+                webhooks.send_webhook(
+                    method='POST',
+                    url=f'http://localhost:{server_socket.getsockname()[1]}/hook',
+                    params=None,
+                    headers=None,
+                    body='{"order": 42}',
+                    lifecycle=Lifecycle.AFTER_REQUEST,
+                    application_id=create_application().pk,
+                )
+        webhook_delivery_writer.flush()
+
+        assert len(accepted) == 1
+        delivery = WebhookDelivery.objects.get()
+        assert delivery.status_code is None and delivery.error
+
+    def test_not_recorded_without_application(self):
+        with patch('requests.Session.request', return_value=Mock(status_code=200, content=b'')):
+            webhooks.send_webhook(
+                method='POST', url='https://test.com', params=None, headers=None, body=None, lifecycle='before'
+            )
+
+        assert webhook_delivery_writer.flush() == 0
+
+    @patch('requests.Session.request', return_value=Mock(status_code=201, content=b'created'))
+    def test_linked_to_request_log(self, mocked_request, api_client):
+        resource = create_resource_stub(method='GET')
+        request = create_request_stub(application=resource.application, method='POST', uri='https://test.com')
+        create_resource_hook(
+            resource=resource, lifecycle=Lifecycle.BEFORE_REQUEST, action=Action.WEBHOOK, request=request
+        )
+
+        response = api_client.get(path=get_url(resource))
+        webhook_delivery_writer.flush()
+
+        assert response.status_code == 200
+        delivery = WebhookDelivery.objects.get()
+        assert delivery.request_log == RequestLog.objects.get()
+        assert (delivery.lifecycle, delivery.status_code, delivery.response_size) == (Lifecycle.BEFORE_REQUEST, 201, 7)
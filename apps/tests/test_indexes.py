@@ -0,0 +1,65 @@
+import os
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+from apps.models import RequestLog
+from apps.tests.data import create_application, create_resource_stub
+
+# set REQUEST_LOG_BENCHMARK_ROWS to a few millions to check the plans on a production-like table
+BENCHMARK_ROWS = int(os.environ.get('REQUEST_LOG_BENCHMARK_ROWS', 50000))
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL query plans only'),
+]
+
+
+@pytest.fixture
+def seeded_logs():
+    applications = [create_application() for _ in range(5)]
+    resources = [create_resource_stub(application=application) for application in applications]
+    with connection.cursor() as cursor:
+        # spread the logs over the applications, resources, status codes and the last 30 days
+        cursor.execute(
+            f'INSERT INTO {RequestLog._meta.db_table} '
+            '(id, created_at, updated_at, ipaddress, proxied, is_truncated, method, status_code, application_id, '
+            'resource_id) '
+            "SELECT md5(random()::text || i)::uuid, now() - random() * interval '30 days', now(), '127.0.0.1', "
+            "false, false, 'GET', (ARRAY[200, 201, 400, 404, 500])[i %% 5 + 1], "
+            '(%s::uuid[])[i %% 5 + 1], (%s::uuid[])[(i / 5) %% 5 + 1] '
+            'FROM generate_series(1, %s) AS i',
+            [[a.pk for a in applications], [r.pk for r in resources], BENCHMARK_ROWS],
+        )
+        cursor.execute(f'ANALYZE {RequestLog._meta.db_table}')
+    return applications, resources
+
+
+def assert_index_used(queryset, index_name):
+    plan = queryset.explain()
+    assert index_name in plan, plan
+    assert f'Seq Scan on {RequestLog._meta.db_table}' not in plan, plan
+
+
+def test_changelist_indexes(seeded_logs):
+    applications, resources = seeded_logs
+    page_size = 100
+
+    assert_index_used(RequestLog.objects.order_by('-created_at')[:page_size], 'requestlog_created_idx')
+    logs = RequestLog.objects.filter(application=applications[0]).order_by('-created_at')
+    assert_index_used(logs[:page_size], 'requestlog_app_created_idx')
+    assert_index_used(logs.filter(status_code=404)[:page_size], 'requestlog_app_status_idx')
+    logs = RequestLog.objects.filter(resource__pk__in=[resources[1].pk]).order_by('-created_at')
+    assert_index_used(logs[:page_size], 'requestlog_resource_idx')
+
+
+def test_inline_index(seeded_logs):
+    applications, _ = seeded_logs
+    ids = (
+        RequestLog.objects.filter(application_id=applications[0].pk)
+        .order_by('-created_at')
+        .values('pk')[: settings.REQUEST_LOGS_INLINE_LIMIT]
+    )
+
+    assert_index_used(RequestLog.objects.filter(pk__in=ids).order_by('-created_at'), 'requestlog_app_created_idx')
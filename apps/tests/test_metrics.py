@@ -0,0 +1,141 @@
+from unittest.mock import patch
+
+import pytest
+from prometheus_client import REGISTRY, CollectorRegistry
+
+from apps import metrics
+from apps.bulk_writer import BulkWriter
+from apps.enums import Action, Lifecycle, ResponseChoices
+from apps.models import RequestLog
+from apps.tests.data import create_application, create_resource_hook, create_resource_stub, create_response_stub
+from apps.tests.utils import get_url
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    def test_request_counted(self, api_client):
+        response_stub = create_response_stub(status_code=201)
+        resource = create_resource_stub(method='GET', slug='users', tail='active', response=response_stub)
+        labels = {
+            'application': resource.application.slug,
+            'resource': 'users/active',
+            'method': 'GET',
+            'response_type': ResponseChoices.CUSTOM,
+        }
+        requests_before = sample('stubborn_requests_total', status='201', **labels)
+        observed_before = sample('stubborn_request_duration_seconds_count', **labels)
+
+        api_client.get(path=f'{get_url(resource)}/active')
+
+        assert sample('stubborn_requests_total', status='201', **labels) == (requests_before + 1)
+        assert sample('stubborn_request_duration_seconds_count', **labels) == observed_before + 1
+
+    def test_unknown_resource_counted(self, api_client):
+        labels = {'application': '', 'resource': '', 'method': 'GET', 'status': '404', 'response_type': ''}
+        requests_before = sample('stubborn_requests_total', **labels)
+
+        response = api_client.get(path='/no-such-application/no-such-resource')
+
+        assert response.status_code == 404
+        assert sample('stubborn_requests_total', **labels) == requests_before + 1
+
+    def test_failed_request_counted(self, api_client):
+        resource = create_resource_stub(method='GET')
+        labels = {
+            'application': resource.application.slug,
+            'resource': resource.slug,
+            'method': 'GET',
+            'status': '500',
+            'response_type': ResponseChoices.CUSTOM,
+        }
+        requests_before = sample('stubborn_requests_total', **labels)
+
+        with patch('apps.views.get_regular_response', side_effect=RuntimeError), pytest.raises(RuntimeError):
+            api_client.get(path=get_url(resource))
+
+        assert sample('stubborn_requests_total', **labels) == requests_before + 1
+
+    @patch('requests.request')
+    def test_proxy_latency_by_host(self, mock_requests_request, api_client):
+        mock_requests_request.return_value.status_code = 200
+        mock_requests_request.return_value.json.return_value = {'Status': 'OK'}
+        mock_requests_request.return_value.content.decode.return_value = '{"Status": "OK"}'
+        mock_requests_request.return_value.headers = {'Content-Type': 'application/json'}
+        resource = create_resource_stub(
+            method='GET',
+            proxy_destination_address='https://metrics.example.com/foo',
+            response_type=ResponseChoices.PROXY_CURRENT,
+        )
+        observed_before = sample('stubborn_proxy_duration_seconds_count', host='metrics.example.com')
+
+        api_client.get(path=get_url(resource))
+
+        assert sample('stubborn_proxy_duration_seconds_count', host='metrics.example.com') == observed_before + 1
+        assert sample(
+            'stubborn_requests_total',
+            application=resource.application.slug,
+            resource=resource.slug,
+            method='GET',
+            status='200',
+            response_type=ResponseChoices.PROXY_CURRENT,
+        )
+
+    def test_hook_duration(self, api_client):
+        resource = create_resource_stub(method='GET')
+        create_resource_hook(resource=resource, action=Action.WAIT, lifecycle=Lifecycle.BEFORE_REQUEST, timeout=0)
+        labels = {'action': Action.WAIT, 'lifecycle': Lifecycle.BEFORE_REQUEST}
+        observed_before = sample('stubborn_hook_duration_seconds_count', **labels)
+
+        api_client.generic(method=resource.method, path=get_url(resource))
+
+        assert sample('stubborn_hook_duration_seconds_count', **labels) == observed_before + 1
+
+    def test_route_cache_lookups(self, api_client):
+        resource = create_resource_stub(method='GET')
+        misses_before = sample('stubborn_cache_lookups_total', cache='routes', result='miss')
+        api_client.generic(method=resource.method, path=get_url(resource))
+        assert sample('stubborn_cache_lookups_total', cache='routes', result='miss') == misses_before + 1
+
+        hits_before = sample('stubborn_cache_lookups_total', cache='routes', result='hit')
+        for _ in range(2):
+            api_client.generic(method=resource.method, path=get_url(resource))
+
+        assert sample('stubborn_cache_lookups_total', cache='routes', result='hit') == hits_before + 2
+
+    def test_writer_queue_depth(self):
+        application = create_application()
+        writer = BulkWriter(model=RequestLog, queue_size=1, batch_size=10, flush_interval=1)
+        dropped_before = sample('stubborn_writer_dropped_total', model='RequestLog')
+
+        with patch.object(BulkWriter, 'start'):
+            writer.put(RequestLog(application=application))
+            assert sample('stubborn_writer_queue_depth', model='RequestLog') == 1
+            writer.put(RequestLog(application=application))
+        assert sample('stubborn_writer_dropped_total', model='RequestLog') == dropped_before + 1
+
+        writer.flush()
+        assert sample('stubborn_writer_queue_depth', model='RequestLog') == 0
+
+    def test_metrics_endpoint(self, api_client):
+        api_client.generic(method='GET', path=get_url(create_resource_stub(method='GET')))
+
+        response = api_client.get('/srv/metrics')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        assert b'stubborn_requests_total{' in response.content
+        assert b'stubborn_request_duration_seconds_bucket{' in response.content
+
+
+def test_multiprocess_registry(monkeypatch, tmp_path):
+    assert metrics.get_registry() is REGISTRY
+
+    monkeypatch.setenv(metrics.MULTIPROC_DIR_VAR, str(tmp_path))
+    registry = metrics.get_registry()
+
+    assert isinstance(registry, CollectorRegistry)
+    assert registry is not REGISTRY
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from apps.admin import RequestLogAdmin
+from apps.models import RequestLog
+from apps.pagination import EstimatedCountPaginator, make_cursor, parse_cursor
+from apps.tests.data import create_application, create_request_log, create_user
+
+
+@pytest.fixture
+def admin_client():
+    client = Client()
+    client.force_login(create_user(is_superuser=True, is_staff=True))
+    return client
+
+
+@pytest.fixture
+def logs():
+    application = create_application()
+    logs = [create_request_log(application=application) for _ in range(7)]
+    now = timezone.now()
+    for index, log in enumerate(logs):
+        # two pairs of the logs share the creation time
+        log.created_at = now - timedelta(minutes=index // 2)
+        RequestLog.objects.filter(pk=log.pk).update(created_at=log.created_at)
+    return sorted(logs, key=lambda log: (log.created_at, log.pk), reverse=True)
+
+
+def get_page(client, url, **params):
+    response = client.get(url, params)
+    assert response.status_code == 200
+    return response.context['cl']
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    url = '/admin/apps/requestlog/'
+
+    def test_pages_walked(self, admin_client, logs, monkeypatch):
+        monkeypatch.setattr(RequestLogAdmin, 'list_per_page', 3)
+
+        cl = get_page(admin_client, self.url)
+        pages = [cl.result_list]
+        assert cl.is_keyset and cl.newer_url is None
+        while cl.older_url:
+            cl = get_page(admin_client, self.url + cl.older_url)
+            pages.append(cl.result_list)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        assert [log for page in pages for log in page] == logs
+
+        cl = get_page(admin_client, self.url + cl.newer_url)
+        assert cl.result_list == logs[3:6]
+        cl = get_page(admin_client, self.url + cl.newer_url)
+        assert cl.result_list == logs[:3]
+        assert cl.newer_url is None
+
+    def test_page_query_count(self, admin_client, logs, monkeypatch, django_assert_max_num_queries):
+        monkeypatch.setattr(RequestLogAdmin, 'list_per_page', 3)
+        cursor = make_cursor(logs[2])
+
+        with django_assert_max_num_queries(8):
+            cl = get_page(admin_client, self.url, after=cursor)
+
+        assert cl.result_list == logs[3:6]
+
+    def test_offset_pagination_when_sorted(self, admin_client, logs, monkeypatch):
+        monkeypatch.setattr(RequestLogAdmin, 'list_per_page', 3)
+
+        cl = get_page(admin_client, self.url, o='2')
+
+        assert not cl.is_keyset
+        assert len(cl.result_list) == 3
+
+    def test_invalid_cursor(self, admin_client, logs):
+        response = admin_client.get(self.url, {'after': 'invalid'})
+
+        assert response.status_code == 302
+        assert 'e=1' in response.url
+
+    def test_cursor(self, logs):
+        assert parse_cursor(make_cursor(logs[0])) == (logs[0].created_at, logs[0].pk)
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL planner estimates')
+class TestEstimatedCount:
+    def test_estimated(self, logs, settings):
+        settings.REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD = 1
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {RequestLog._meta.db_table}')
+
+        paginator = EstimatedCountPaginator(RequestLog.objects.order_by('-created_at'), 3)
+
+        assert paginator.count == len(logs)
+        assert paginator.is_estimated
+
+    def test_exact_below_threshold(self, logs, settings):
+        settings.REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD = 1000
+
+        paginator = EstimatedCountPaginator(RequestLog.objects.order_by('-created_at'), 3)
+
+        assert paginator.count == len(logs)
+        assert not paginator.is_estimated
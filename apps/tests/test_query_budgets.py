@@ -0,0 +1,164 @@
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+
+from apps.bulk_writer import BulkWriter, request_log_writer
+from apps.enums import Action, Lifecycle, LogPolicy, ResponseChoices
+from apps.tests.data import (
+    create_application,
+    create_request_log,
+    create_resource_hook,
+    create_resource_stub,
+    create_response_stub,
+    create_user,
+)
+from apps.tests.utils import get_url
+
+# Exact numbers of the SQL statements made by the hot paths. A change adding a query fails these tests, a change
+# removing one must lower the budget, so the numbers only go down.
+STATIC_STUB_QUERIES = 1
+TEMPLATED_STUB_QUERIES = 1
+PROXY_QUERIES = 1
+HOOKED_STUB_QUERIES = 1
+UNLOGGED_STUB_QUERIES = 0
+ASYNC_LOGGED_STUB_QUERIES = 0
+SHARED_BODY_STUB_QUERIES = 3  # the log insert, the blob insert and the blob last use refresh
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_configuration_checks(settings):
+    # the configuration revisions are checked with one query once in the interval, keep it out of the budgets
+    settings.CONFIGURATION_CHECK_INTERVAL = 3600
+
+
+@pytest.fixture
+def call_stub(api_client):
+    def call(resource, warm_up=True):
+        if warm_up:  # the routes are compiled on the first request of the worker
+            api_client.get(get_url(resource))
+        response = api_client.get(get_url(resource))
+        assert response.status_code == (resource.response.status_code if resource.response else 200)
+        return response
+
+    return call
+
+
+def test_static_stub(call_stub, django_assert_num_queries):
+    resource = create_resource_stub(method='GET', response=create_response_stub(body='{"status": "OK"}'))
+    call_stub(resource)
+
+    with django_assert_num_queries(STATIC_STUB_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+def test_templated_stub(call_stub, django_assert_num_queries):
+    response = create_response_stub(body='{"id": {{ random.randint(1, 100) }}, "name": "{{ fake.name() }}"}')
+    resource = create_resource_stub(method='GET', response=response)
+    call_stub(resource)
+
+    with django_assert_num_queries(TEMPLATED_STUB_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+@patch('requests.request')
+def test_proxy(mock_requests_request, call_stub, django_assert_num_queries):
+    mock_requests_request.return_value.status_code = 200
+    mock_requests_request.return_value.json.return_value = {'Status': 'OK'}
+    mock_requests_request.return_value.content.decode.return_value = '{"Status": "OK"}'
+    mock_requests_request.return_value.headers = {'Content-Type': 'application/json'}
+    resource = create_resource_stub(
+        method='GET',
+        response=None,
+        proxy_destination_address='https://example.com/foo',
+        response_type=ResponseChoices.PROXY_CURRENT,
+    )
+    call_stub(resource)
+
+    with django_assert_num_queries(PROXY_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+def test_stub_with_hooks(call_stub, django_assert_num_queries):
+    resource = create_resource_stub(method='GET')
+    create_resource_hook(resource=resource, action=Action.WAIT, lifecycle=Lifecycle.BEFORE_REQUEST, timeout=0)
+    create_resource_hook(resource=resource, action=Action.WAIT, lifecycle=Lifecycle.AFTER_REQUEST, timeout=0)
+    call_stub(resource)
+
+    with django_assert_num_queries(HOOKED_STUB_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+def test_unlogged_stub(call_stub, django_assert_num_queries):
+    resource = create_resource_stub(method='GET', log_policy=LogPolicy.OFF)
+    call_stub(resource)
+
+    with django_assert_num_queries(UNLOGGED_STUB_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+def test_async_logged_stub(settings, call_stub, django_assert_num_queries):
+    settings.REQUEST_LOG_ASYNC = True
+    resource = create_resource_stub(method='GET')
+
+    with patch.object(BulkWriter, 'start'):
+        call_stub(resource)
+        with django_assert_num_queries(ASYNC_LOGGED_STUB_QUERIES):
+            call_stub(resource, warm_up=False)
+    request_log_writer.flush()
+
+
+def test_shared_body_stub(settings, call_stub, django_assert_num_queries):
+    settings.REQUEST_LOG_BLOB_THRESHOLD = 16
+    resource = create_resource_stub(method='GET', response=create_response_stub(body='{"status": "a long body"}'))
+    call_stub(resource)
+
+    with django_assert_num_queries(SHARED_BODY_STUB_QUERIES):
+        call_stub(resource, warm_up=False)
+
+
+@pytest.fixture
+def admin_client():
+    client = Client()
+    client.force_login(create_user(username='admin', email='admin@example.com', is_superuser=True, is_staff=True))
+    return client
+
+
+@pytest.fixture
+def objects():
+    # several objects of every kind, so the queries made for every listed object are caught
+    owner = create_user(username='owner', email='owner@example.com')
+    resources = []
+    for application in [create_application(owner=owner) for _ in range(3)]:
+        for _ in range(3):
+            resource = create_resource_stub(application=application)
+            create_resource_hook(resource=resource)
+            create_request_log(application=application, resource=resource, response=resource.response)
+            resources.append(resource)
+    return resources[0].application, resources
+
+
+@pytest.mark.parametrize(
+    'url, queries',
+    [
+        ('/admin/apps/application/', 5),
+        ('/admin/apps/application/{application.pk}/change/', 7),
+        ('/admin/apps/resourcestub/?application={application.pk}', 6),
+        ('/admin/apps/resourcestub/{resource.pk}/change/', 14),
+        ('/admin/apps/responsestub/?application={application.pk}', 6),
+        ('/admin/apps/requestlog/?application={application.pk}', 6),
+        ('/admin/apps/requestlog/', 5),
+        ('/admin/apps/requestlog/{log.pk}/change/', 9),
+        ('/admin/apps/webhookdelivery/', 6),
+    ],
+)
+def test_admin_pages(url, queries, objects, admin_client, django_assert_num_queries):
+    application, resources = objects
+    url = url.format(application=application, resource=resources[0], log=resources[0].logs.get())
+    admin_client.get(url)  # fill the per-worker caches
+
+    with django_assert_num_queries(queries):
+        response = admin_client.get(url)
+    assert response.status_code == 200
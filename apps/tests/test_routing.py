@@ -0,0 +1,185 @@
+import pytest
+from django.http import Http404
+
+from apps.enums import Action, Lifecycle, ResponseChoices
+from apps.models import ConfigurationRevision, ResourceStub
+from apps.routing import bump_configuration_revision, route_table
+from apps.tests.data import (
+    create_application,
+    create_request_stub,
+    create_resource_hook,
+    create_resource_stub,
+    create_response_stub,
+)
+
+
+@pytest.mark.django_db
+class TestRouteTable:
+    def test_resolve_without_queries(self, settings, django_assert_num_queries):
+        settings.CONFIGURATION_CHECK_INTERVAL = 60
+        application = create_application()
+        resource = create_resource_stub(application=application, method='GET', tail='')
+        route_table.resolve(app_slug=application.slug, resource_slug=resource.slug, method='GET', tail='')
+
+        with django_assert_num_queries(0):
+            resolved = route_table.resolve(
+                app_slug=application.slug, resource_slug=resource.slug, method='GET', tail=''
+            )
+            assert resolved.response
+
+        assert resolved == resource
+        assert resolved.application == application
+
+    def test_resolve_specific_url_proxy(self):
+        application = create_application()
+        proxy = create_resource_stub(
+            application=application,
+            slug='foo',
+            method='GET',
+            tail='bar',
+            response=None,
+            proxy_destination_address='https://example.com/foo',
+            response_type=ResponseChoices.PROXY_CURRENT,
+        )
+
+        resolved = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='bar')
+        assert resolved == proxy
+
+    def test_resolve_global_proxy_fallback(self):
+        application = create_application()
+        global_proxy = create_resource_stub(
+            application=application,
+            slug='foo',
+            method=None,
+            response=None,
+            proxy_destination_address='https://example.com/',
+            response_type=ResponseChoices.PROXY_GLOBAL,
+        )
+
+        resolved = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='POST', tail='bar/baz')
+        assert resolved == global_proxy
+
+    def test_resolve_not_found(self):
+        application = create_application()
+        create_resource_stub(application=application, slug='foo', method='GET', tail='')
+
+        with pytest.raises(Http404):
+            route_table.resolve(app_slug=application.slug, resource_slug='foo', method='POST', tail='')
+        with pytest.raises(Http404):
+            route_table.resolve(app_slug=f'{application.slug}-missing', resource_slug='foo', method='GET', tail='')
+
+    def test_disabled_application_not_resolved(self):
+        application = create_application(is_enabled=False)
+        create_resource_stub(application=application, slug='foo', method='GET', tail='')
+
+        with pytest.raises(Http404):
+            route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+    def test_invalidated_on_resource_change(self):
+        application = create_application()
+        resource = create_resource_stub(application=application, slug='foo', method='GET', tail='')
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        resource.is_enabled = False
+        resource.save()
+
+        with pytest.raises(Http404):
+            route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+    def test_invalidated_on_response_change(self):
+        application = create_application()
+        response = create_response_stub(application=application, status_code=200)
+        create_resource_stub(application=application, slug='foo', method='GET', tail='', response=response)
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        response.status_code = 201
+        response.save()
+
+        resolved = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+        assert resolved.response
+        assert resolved.response.status_code == 201
+
+    def test_hook_plan_without_queries(self, settings, django_assert_num_queries):
+        settings.CONFIGURATION_CHECK_INTERVAL = 60
+        application = create_application()
+        resource = create_resource_stub(application=application, slug='foo', method='GET', tail='')
+        request = create_request_stub(application=application, uri='https://example.com/hook', method='POST')
+        create_resource_hook(resource=resource, lifecycle=Lifecycle.AFTER_REQUEST, order=2)
+        create_resource_hook(
+            resource=resource, lifecycle=Lifecycle.AFTER_REQUEST, action=Action.WEBHOOK, request=request
+        )
+        create_resource_hook(resource=resource, lifecycle=Lifecycle.AFTER_RESPONSE, timeout=1)
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        with django_assert_num_queries(0):
+            plan = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='').hook_plan
+
+        assert plan.before_request == ()
+        assert [step.action for step in plan.after_request] == [Action.WEBHOOK, Action.WAIT]
+        assert plan.after_request[0].uri == 'https://example.com/hook'
+        assert plan.after_request[0].method == 'POST'
+        assert plan.after_request[1].uri is None
+        assert [step.timeout for step in plan.after_response] == [1]
+
+    def test_hook_plan_invalidated_on_hook_change(self):
+        application = create_application()
+        resource = create_resource_stub(application=application, slug='foo', method='GET', tail='')
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        create_resource_hook(resource=resource, lifecycle=Lifecycle.BEFORE_REQUEST)
+
+        resolved = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+        assert len(resolved.hook_plan.before_request) == 1
+
+    def test_invalidated_on_application_creation(self):
+        with pytest.raises(Http404):
+            route_table.resolve(app_slug='brand-new-app', resource_slug='foo', method='GET', tail='')
+
+        application = create_application(slug='brand-new-app')
+        resource = create_resource_stub(application=application, slug='foo', method='GET', tail='')
+
+        resolved = route_table.resolve(app_slug='brand-new-app', resource_slug='foo', method='GET', tail='')
+        assert resolved == resource
+
+
+@pytest.mark.django_db
+class TestConfigurationRevision:
+    def test_bump_configuration_revision(self):
+        application = create_application()
+        revision = ConfigurationRevision.objects.get(application_id=application.pk).revision
+
+        bump_configuration_revision(application.pk)
+
+        assert ConfigurationRevision.objects.get(application_id=application.pk).revision == revision + 1
+
+    def test_revision_bumped_on_resource_change(self):
+        application = create_application()
+        resource = create_resource_stub(application=application)
+        revision = ConfigurationRevision.objects.get(application_id=application.pk).revision
+
+        resource.delete()
+
+        assert ConfigurationRevision.objects.get(application_id=application.pk).revision == revision + 1
+
+    def test_changes_made_by_other_workers_applied(self, settings):
+        settings.CONFIGURATION_CHECK_INTERVAL = 0
+        application = create_application()
+        resource = create_resource_stub(application=application, slug='foo', method='GET', tail='')
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        # no signals sent, like if the change was made by another worker
+        ResourceStub.objects.filter(pk=resource.pk).update(method='POST')
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        ConfigurationRevision.objects.filter(application_id=application.pk).update(revision=100500)
+        resolved = route_table.resolve(app_slug=application.slug, resource_slug='foo', method='POST', tail='')
+        assert resolved == resource
+
+    def test_revisions_not_checked_within_interval(self, settings, django_assert_num_queries):
+        settings.CONFIGURATION_CHECK_INTERVAL = 60
+        application = create_application()
+        create_resource_stub(application=application, slug='foo', method='GET', tail='')
+        route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
+
+        with django_assert_num_queries(0):
+            route_table.resolve(app_slug=application.slug, resource_slug='foo', method='GET', tail='')
@@ -0,0 +1,107 @@
+import pytest
+from django.db import connection
+from django.test import Client
+
+from apps.models import RequestLog
+from apps.search import TrigramSearchBackend, get_search_backend, split_search_term
+from apps.tests.data import create_application, create_request_log, create_user
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(connection.vendor != 'postgresql', reason='PostgreSQL search backend'),
+]
+
+
+@pytest.fixture
+def logs(settings):
+    settings.REQUEST_LOG_BLOB_THRESHOLD = 20
+    application = create_application()
+    logs = {
+        'url': create_request_log(application=application, url='https://example.com/orders/42'),
+        'params': create_request_log(application=application, params={'coupon': 'SPRING-SALE'}),
+        'headers': create_request_log(application=application, request_headers={'X-Trace-Id': 'trace-7f3a'}),
+        'body': create_request_log(application=application, response_body='{"status": "declined"}'),
+        'ip': create_request_log(application=application, x_real_ip='10.20.30.40'),
+        'percent': create_request_log(application=application, request_body='discount 100% off'),
+    }
+    blob_log = RequestLog(application=application)
+    blob_log.set_bodies(request_body='a very long body of the refund request', response_body=None)
+    blob_log.save()
+    logs['blob'] = blob_log
+    return logs
+
+
+def search(term):
+    backend = get_search_backend()
+    assert isinstance(backend, TrigramSearchBackend)
+    return set(backend.search(RequestLog.objects.all(), term))
+
+
+@pytest.mark.parametrize(
+    'term, key',
+    [
+        ('ORDERS/42', 'url'),
+        ('spring-sale', 'params'),
+        ('trace-7f3a', 'headers'),
+        ('x-trace-id', 'headers'),
+        ('Declined', 'body'),
+        ('10.20.30.40', 'ip'),
+        ('of the refund', 'blob'),
+        ('100%', 'percent'),
+    ],
+)
+def test_search_fields(logs, term, key):
+    assert search(term) == {logs[key]}
+
+
+def test_search_by_id(logs):
+    assert search(str(logs['body'].pk)[:13]) == {logs['body']}
+
+
+def test_all_terms_matched(logs):
+    assert search('example.com orders') == {logs['url']}
+    assert search('example.com declined') == set()
+    assert search('"of the refund"') == {logs['blob']}
+
+
+def test_compressed_body_searchable_by_beginning(settings):
+    settings.REQUEST_LOG_COMPRESSION_THRESHOLD = 50
+    settings.REQUEST_LOG_SEARCHABLE_LENGTH = 30
+    log = RequestLog(application=create_application())
+    log.set_bodies(request_body='invoice 2024-117 ' + 'x' * 100 + ' paid', response_body=None)
+    log.save()
+
+    assert log.request_body_compressed is not None
+    assert search('invoice 2024-117') == {log}
+    assert search('paid') == set()
+
+
+def test_split_search_term():
+    assert split_search_term('"a phrase" word \'another phrase\'') == ['a phrase', 'word', 'another phrase']
+
+
+def test_search_uses_index(logs):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            pytest.skip('pg_trgm extension is not available')
+
+    backend = get_search_backend()
+    assert backend is not None
+    queryset = backend.search(RequestLog.objects.order_by('-created_at'), 'declined')
+    with connection.cursor() as cursor:
+        cursor.execute('SET LOCAL enable_seqscan = off')  # the test table is too small for the planner to bother
+    plan = queryset.explain()
+
+    assert 'requestlog_search_idx' in plan, plan
+    assert 'logblob_search_idx' in plan, plan
+
+
+def test_admin_search(logs):
+    client = Client()
+    client.force_login(create_user(is_superuser=True, is_staff=True))
+
+    response = client.get('/admin/apps/requestlog/', {'q': 'declined'})
+
+    assert response.status_code == 200
+    assert list(response.context['cl'].result_list) == [logs['body']]
@@ -2,7 +2,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from apps.services import get_same_enabled_resource_stub, proxy_request, turn_off_same_resource
+from apps.enums import LogPolicy
+from apps.services import get_same_enabled_resource_stub, is_request_logged, proxy_request, turn_off_same_resource
 from apps.tests.data import create_application, create_resource_stub
 
 
@@ -92,3 +93,24 @@ class TestProxy:
         resource_disabled = create_resource_stub(application=application, method='GET', is_enabled=False)
         turned_off_resource = turn_off_same_resource(resource=resource_disabled)
         assert not turned_off_resource
+
+
+class TestLogPolicy:
+    @pytest.mark.parametrize(
+        'log_policy, status_code, logged',
+        [
+            (LogPolicy.FULL, 200, True),
+            (LogPolicy.METADATA, 200, True),
+            (LogPolicy.OFF, 500, False),
+            (LogPolicy.ERRORS, 399, False),
+            (LogPolicy.ERRORS, 400, True),
+            (LogPolicy.ERRORS, None, False),
+        ],
+    )
+    def test_is_request_logged(self, log_policy, status_code, logged):
+        assert is_request_logged(log_policy=log_policy, sample_rate=100, status_code=status_code) == logged
+
+    @pytest.mark.parametrize('sample_rate, random_value, logged', [(10, 0.05, True), (10, 0.1, False), (0, 0, False)])
+    def test_sampled_request_logged(self, sample_rate, random_value, logged):
+        with patch('apps.services.random.random', return_value=random_value):
+            assert is_request_logged(log_policy=LogPolicy.SAMPLED, sample_rate=sample_rate, status_code=200) == logged
@@ -0,0 +1,54 @@
+import os
+import random
+import stat
+from unittest.mock import patch
+
+from apps.templating import TemplateCache
+
+
+class TestTemplateCache:
+    def test_compiled_template_cached(self):
+        cache = TemplateCache(size=2)
+        template = cache.get_template(key=('id', 1), name='id', source='{{ 2 + 2 }}')
+
+        assert cache.get_template(key=('id', 1), name='id', source='{{ 2 + 2 }}') is template
+        assert template.render() == '4'
+
+    def test_template_recompiled_on_source_change(self):
+        cache = TemplateCache(size=2)
+        cache.get_template(key=('id', 1), name='id', source='{{ 2 + 2 }}')
+
+        template = cache.get_template(key=('id', 1), name='id', source='{{ 3 + 3 }}')
+        assert template.render() == '6'
+
+    def test_cache_bounded(self):
+        cache = TemplateCache(size=1)
+        first = cache.get_template(key=('id', 1), name='id-1', source='{{ 1 }}')
+        cache.get_template(key=('id', 2), name='id-2', source='{{ 2 }}')
+
+        assert cache.get_template(key=('id', 1), name='id-1', source='{{ 1 }}') is not first
+
+    def test_bytecode_cache_shared(self, tmp_path):
+        source = '{{ random.randint(5, 5) }}'
+        TemplateCache(size=1, bytecode_cache_dir=str(tmp_path)).get_template(key=1, name='id', source=source)
+        assert os.listdir(tmp_path)
+
+        cache = TemplateCache(size=1, bytecode_cache_dir=str(tmp_path))
+        with patch.object(cache.environment, 'compile') as mocked_compile:
+            template = cache.get_template(key=1, name='id', source=source)
+
+        mocked_compile.assert_not_called()
+        assert template.render(random=random) == '5'
+
+    def test_bytecode_cache_dir_private(self, tmp_path):
+        directory = tmp_path / 'bytecode'
+        TemplateCache(size=1, bytecode_cache_dir=str(directory))
+
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    def test_shared_bytecode_cache_dir_rejected(self, tmp_path):
+        directory = tmp_path / 'bytecode'
+        directory.mkdir(mode=0o777)
+        directory.chmod(0o777)
+
+        assert TemplateCache(size=1, bytecode_cache_dir=str(directory)).environment.bytecode_cache is None
@@ -5,7 +5,15 @@ from typing import List
 import pytest
 from django.utils.safestring import SafeString
 
-from apps.utils import clean_headers, is_json, prettify_data_to_html, run_in_separate_thread, str_to_dom_document
+from apps.utils import (
+    clean_headers,
+    is_json,
+    pack_text,
+    prettify_data_to_html,
+    run_in_separate_thread,
+    str_to_dom_document,
+    unpack_text,
+)
 
 
 class TestUtils:
@@ -85,3 +93,41 @@ class TestUtils:
         call_result.join()
         assert len(test_list) == 1
         assert 10 in test_list
+
+
+class TestTextPacking:
+    @pytest.mark.parametrize(
+        'text, limit, threshold, packed',
+        [
+            (None, 10, 10, (None, None, False)),
+            ('short', 10, 10, ('short', None, False)),
+            ('long text', 4, 10, ('long', None, True)),
+            ('long text', 0, 0, ('long text', None, False)),
+        ],
+    )
+    def test_pack_text(self, text, limit, threshold, packed):
+        assert pack_text(text, limit=limit, compression_threshold=threshold) == packed
+
+    def test_text_compressed(self):
+        text = '{"key": "value"}' * 100
+        plain, compressed, is_truncated = pack_text(text, limit=0, compression_threshold=100)
+
+        assert plain is None
+        assert compressed is not None
+        assert not is_truncated
+        assert len(compressed) < len(text) / 10
+        assert unpack_text(plain, compressed) == text
+        assert unpack_text(plain, memoryview(compressed)) == text
+
+    @pytest.mark.parametrize('searchable_length, plain', [(0, None), (5, 'aaaaa'), (1000, 'a' * 100)])
+    def test_searchable_text_kept(self, searchable_length, plain):
+        packed_plain, compressed, _ = pack_text('a' * 200, 0, 100, searchable_length)
+
+        assert packed_plain == plain
+        assert unpack_text(packed_plain, compressed) == 'a' * 200
+
+    def test_truncated_text_compressed(self):
+        plain, compressed, is_truncated = pack_text('a' * 1000, limit=500, compression_threshold=100)
+
+        assert is_truncated
+        assert unpack_text(plain, compressed) == 'a' * 500
@@ -4,9 +4,12 @@ from unittest.mock import patch
 import pytest
 from django.urls import reverse
 from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 
 from apps import models
-from apps.enums import Action, Lifecycle, ResponseChoices
+from apps.bulk_writer import request_log_writer
+from apps.enums import Action, Lifecycle, LogPolicy, ResponseChoices
+from apps.routing import route_table
 from apps.tests.data import (
     create_application,
     create_request_stub,
@@ -73,6 +76,71 @@ class TestResponseStub:
         response = api_client.get(path=get_url(resource))
         assert response.status_code == 200
 
+    @pytest.mark.parametrize(
+        'body_format, body, content, content_type',
+        [
+            ('JSON', '{"Status": "OK", "Items": [1, 2]}', b'{"Status":"OK","Items":[1,2]}', 'application/json'),
+            ('JSON', '', b'', None),
+            ('XML', '<Status>OK</Status>', b'<?xml version="1.0" encoding="utf-8"?><Status>OK</Status>', None),
+            ('PLAIN_TEXT', 'Status: OK', b'Status: OK', 'application/text; charset=utf-8'),
+        ],
+    )
+    def test_static_body_pre_encoded(self, body_format, body, content, content_type, api_client):
+        application = create_application()
+        response_stub = create_response_stub(
+            application=application, status_code=200, body=body, format=body_format, headers={'X-Custom': 'Value'}
+        )
+        assert not response_stub.is_templated
+        resource = create_resource_stub(application=application, response=response_stub, method='GET')
+
+        with patch('apps.services.RestResponse') as mocked_rest_response:
+            response = api_client.get(path=get_url(resource))
+            mocked_rest_response.assert_not_called()
+
+        assert response.status_code == 200
+        assert response.content == content
+        assert response.headers.get('X-Custom') == 'Value'
+        assert response.headers.get('Content-Length') == str(len(content))
+        if content_type:
+            assert response.headers.get('Content-Type') == content_type
+
+    def test_static_body_encoded_once(self, api_client):
+        application = create_application()
+        response_stub = create_response_stub(
+            application=application, status_code=200, body='{"Status": "OK"}', format='JSON'
+        )
+        resource = create_resource_stub(application=application, response=response_stub, method='GET')
+
+        with patch.object(JSONRenderer, 'render', autospec=True, side_effect=JSONRenderer.render) as mocked_render:
+            for _ in range(3):
+                response = api_client.get(path=get_url(resource))
+                assert response.json() == {'Status': 'OK'}
+
+        mocked_render.assert_called_once()
+
+    def test_templated_body_rendered(self, api_client):
+        application = create_application()
+        response_stub = create_response_stub(
+            application=application, status_code=200, body='{"Sum": {{ 2 + 2 }}}', format='JSON'
+        )
+        assert response_stub.is_templated
+        resource = create_resource_stub(application=application, response=response_stub, method='GET')
+
+        response = api_client.get(path=get_url(resource))
+        assert response.status_code == 200
+        assert response.json() == {'Sum': 4}
+
+    def test_static_body_with_renderer_options(self, api_client):
+        application = create_application()
+        response_stub = create_response_stub(
+            application=application, status_code=200, body='{"Status": "OK"}', format='JSON'
+        )
+        resource = create_resource_stub(application=application, response=response_stub, method='GET')
+
+        response = api_client.get(path=get_url(resource), HTTP_ACCEPT='application/json; indent=2')
+        assert response.status_code == 200
+        assert response.content == b'{\n  "Status": "OK"\n}'
+
     def test_response_timeout(self, api_client):
         application = create_application()
         response_stub = create_response_stub(application=application, status_code=200)
@@ -153,7 +221,7 @@ class TestResponseStub:
         assert response.headers.get('Content-Type') == 'application/json'
 
     @pytest.mark.parametrize('lifecycle', [Lifecycle.BEFORE_REQUEST.value, Lifecycle.AFTER_REQUEST.value])
-    @patch('requests.request', return_value=None)
+    @patch('requests.Session.request', return_value=None)
     def test_after_response_webhook_call(self, mocked_request, lifecycle, api_client):
         application = create_application()
         response_stub = create_response_stub(application=application, status_code=200)
@@ -168,7 +236,7 @@ class TestResponseStub:
         assert response.status_code == 200
         mocked_request.assert_called_once()
         mocked_request.assert_called_with(
-            method='GET', url='https://test.com', params={'a': 'b'}, headers={}, data=None
+            method='GET', url='https://test.com', params={'a': 'b'}, headers={}, data=None, timeout=(5, 30)
         )
 
 
@@ -275,6 +343,149 @@ class TestLogging:
             assert request_log.request_body is not None
             assert json.loads(request_log.request_body) == request_body
 
+    def test_stubborn_headers_logged(self, api_client, django_assert_num_queries):
+        response_stub = create_response_stub(headers={'Custom-Header': 'value'}, body='OK')
+        resource = create_resource_stub(
+            application=response_stub.application, response=response_stub, method='GET', inject_stubborn_headers=True
+        )
+        api_client.get(path=get_url(resource))  # compile the routes
+
+        with django_assert_num_queries(2):  # revisions check, a single log insert
+            route_table._next_check = 0.0
+            response = api_client.get(path=get_url(resource))
+
+        request_log = models.RequestLog.objects.get(pk=response['Stubborn-Log-Id'])
+        assert request_log.response_headers['Stubborn-Log-Id'] == response['Stubborn-Log-Id']
+        assert request_log.response_headers['Custom-Header'] == 'value'
+
+    def test_async_request_logging(self, settings, api_client):
+        settings.REQUEST_LOG_ASYNC = True
+        response_stub = create_response_stub(body='OK')
+        resource = create_resource_stub(
+            application=response_stub.application, response=response_stub, method='GET', inject_stubborn_headers=True
+        )
+
+        with patch.object(request_log_writer, 'start'):
+            response = api_client.get(path=get_url(resource))
+            assert not resource.logs.exists()
+            assert request_log_writer.flush() == 1
+
+        request_log = resource.logs.get()
+        assert str(request_log.id) == response['Stubborn-Log-Id']
+        assert request_log.response_body == 'OK'
+
+    def test_timings_logged(self, settings, api_client):
+        response_stub = create_response_stub(body='OK')
+        resource = create_resource_stub(application=response_stub.application, response=response_stub, method='GET')
+
+        response = api_client.get(path=get_url(resource))
+
+        request_log = resource.logs.get()
+        assert request_log.duration is not None
+        assert set(request_log.timings) == {'resolve', 'hooks_before', 'render', 'hooks_after'}
+        assert 0 < sum(request_log.timings.values()) <= request_log.duration
+        assert 'Server-Timing' not in response
+
+    @patch('requests.request')
+    def test_proxy_server_timing(self, mock_requests_request, settings, api_client):
+        settings.SERVER_TIMING_HEADER = True
+        mock_requests_request.return_value.status_code = 200
+        mock_requests_request.return_value.json.return_value = {'Status': 'OK'}
+        mock_requests_request.return_value.content.decode.return_value = '{"Status": "OK"}'
+        mock_requests_request.return_value.headers = {'Content-Type': 'application/json'}
+        resource = create_resource_stub(
+            method='GET',
+            proxy_destination_address='https://example.com/foo',
+            response_type=ResponseChoices.PROXY_CURRENT,
+        )
+
+        response = api_client.get(path=get_url(resource))
+
+        request_log = resource.logs.get()
+        assert 'proxy' in request_log.timings
+        metrics = [metric.split(';')[0] for metric in response['Server-Timing'].split(', ')]
+        assert metrics == ['resolve', 'hooks_before', 'proxy', 'hooks_after', 'log', 'total']
+
+    @pytest.mark.parametrize(
+        'application_policy, resource_policy, status_code, logged',
+        [
+            (LogPolicy.OFF, LogPolicy.INHERIT, 200, False),
+            (LogPolicy.OFF, LogPolicy.FULL, 200, True),
+            (LogPolicy.FULL, LogPolicy.OFF, 500, False),
+            (LogPolicy.ERRORS, LogPolicy.INHERIT, 200, False),
+            (LogPolicy.ERRORS, LogPolicy.INHERIT, 404, True),
+        ],
+    )
+    def test_log_policy(self, application_policy, resource_policy, status_code, logged, api_client):
+        application = create_application(log_policy=application_policy)
+        response_stub = create_response_stub(application=application, status_code=status_code, body='OK')
+        resource = create_resource_stub(
+            application=application,
+            response=response_stub,
+            method='GET',
+            log_policy=resource_policy,
+            inject_stubborn_headers=True,
+        )
+
+        response = api_client.get(path=get_url(resource))
+
+        assert response.status_code == status_code
+        assert resource.logs.exists() == logged
+        assert ('Stubborn-Log-Id' in response) == logged
+
+    def test_metadata_log_policy(self, api_client):
+        response_stub = create_response_stub(headers={'Custom-Header': 'value'}, body='OK')
+        resource = create_resource_stub(
+            application=response_stub.application,
+            response=response_stub,
+            method='POST',
+            log_policy=LogPolicy.METADATA,
+            inject_stubborn_headers=True,
+        )
+
+        response = api_client.post(path=get_url(resource) + '?param=value', data='request body', content_type='text')
+
+        request_log = resource.logs.get()
+        assert str(request_log.id) == response['Stubborn-Log-Id']
+        assert response['Custom-Header'] == 'value'
+        assert request_log.status_code == 200
+        assert request_log.params == {'param': 'value'}
+        assert request_log.request_body is None
+        assert request_log.response_body is None
+        assert request_log.request_headers == request_log.response_headers == {}
+
+    def test_large_bodies_logged_compressed(self, settings, api_client):
+        settings.REQUEST_LOG_BODY_LIMIT = 1000
+        settings.REQUEST_LOG_COMPRESSION_THRESHOLD = 100
+        settings.REQUEST_LOG_SEARCHABLE_LENGTH = 0
+        response_stub = create_response_stub(body='a' * 200)
+        resource = create_resource_stub(application=response_stub.application, response=response_stub, method='POST')
+
+        api_client.post(path=get_url(resource), data='b' * 2000, content_type='text')
+
+        request_log = resource.logs.get()
+        assert request_log.is_truncated
+        assert request_log.request_body is request_log.response_body is None
+        assert request_log.request_body_text == 'b' * 1000
+        assert request_log.response_body_text == 'a' * 200
+
+    def test_large_bodies_logged_once(self, settings, api_client):
+        settings.REQUEST_LOG_BLOB_THRESHOLD = 100
+        response_stub = create_response_stub(body='a' * 200)
+        resource = create_resource_stub(application=response_stub.application, response=response_stub, method='POST')
+
+        for request_body in ('short', 'short', 'b' * 200):
+            api_client.post(path=get_url(resource), data=request_body, content_type='text')
+
+        request_logs = resource.logs.order_by('created_at')
+        assert models.LogBlob.objects.count() == 2
+        assert len({request_log.response_body_blob_id for request_log in request_logs}) == 1
+        assert [request_log.request_body_text for request_log in request_logs] == ['short', 'short', 'b' * 200]
+        assert [request_log.response_body_text for request_log in request_logs] == ['a' * 200] * 3
+
+        models.LogBlob.objects.all().delete()
+        assert resource.logs.all()[0].response_body_text is None
+
 
 @pytest.mark.django_db
 class TestServiceViews:
@@ -0,0 +1,53 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class Phase:
+    RESOLVE = 'resolve'
+    HOOKS_BEFORE = 'hooks_before'
+    RENDER = 'render'
+    PROXY = 'proxy'
+    HOOKS_AFTER = 'hooks_after'
+    LOG = 'log'
+
+
+class RequestTimer:
+    """Stopwatch measuring the request handling time and its phases in milliseconds."""
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the block to the phase.
+
+        Args:
+            phase: phase name.
+        """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - started_at) * 1000
+            self.phases[phase] = round(self.phases.get(phase, 0.0) + elapsed, 3)
+
+    @property
+    def elapsed(self) -> float:
+        """Return the time since the timer start.
+
+        Returns:
+            Milliseconds.
+        """
+        return round((time.perf_counter() - self.started_at) * 1000, 3)
+
+    def get_server_timing(self) -> str:
+        """Compose the Server-Timing header value of the measured phases and the total time.
+
+        Returns:
+            Header value, i.e. `resolve;dur=0.1, render;dur=1.5, total;dur=2.3`.
+        """
+        metrics = [f'{phase};dur={duration:g}' for phase, duration in self.phases.items()]
+        metrics.append(f'total;dur={self.elapsed:g}')
+        return ', '.join(metrics)
@@ -2,6 +2,7 @@ import json
 import logging
 import os
 import threading
+import zlib
 from datetime import datetime
 from functools import wraps
 from json import JSONDecodeError
@@ -19,6 +20,7 @@ from pygments.lexers.data import JsonLexer
 from pygments.lexers.html import HtmlLexer
 from rest_framework.request import Request
 
+from apps.enums import LogPolicy
 from apps.styles import StubbornDark
 
 logger = logging.getLogger(__name__)
@@ -214,7 +216,7 @@ def log_response(
     response_logger: logging.Logger,
     resource_type: str,
     status_code: int,
-    request_log_id: UUID,
+    request_log_id: UUID | None,
     body: dict[str, Any] | str = 'empty',
     headers: dict[str, str] | str = 'empty',
 ) -> None:
@@ -258,3 +260,64 @@ def add_stubborn_headers(initial_headers: dict[str, str], log_id: str | UUID) ->
     }
 
     return initial_headers | stubborn_headers
+
+
+def describe_log_policy(log_policy: str, sample_rate: float) -> str:
+    """Compose a human-readable description of the request logging policy.
+
+    Args:
+        log_policy: logging policy.
+        sample_rate: percentage of the logged requests for the sampled policy.
+
+    Returns:
+        Logging policy description, i.e. `Sampled (10%)`.
+    """
+    description = str(LogPolicy(log_policy).label)
+    if log_policy == LogPolicy.SAMPLED:
+        return f'{description} ({sample_rate:g}%)'
+    return description
+
+
+def pack_text(
+    text: str | None, limit: int, compression_threshold: int, searchable_length: int = 0
+) -> tuple[str | None, bytes | None, bool]:
+    """Truncate the text and compress it if it is still too long.
+
+    The beginning of the compressed text can be kept as plain text, so the database search still finds it.
+
+    Args:
+        text: text for packing.
+        limit: max length of the text (0 turns the truncation off).
+        compression_threshold: min length of the text to be compressed (0 turns the compression off).
+        searchable_length: length of the plain text beginning kept with the compressed text, not more than the
+            compression threshold.
+
+    Returns:
+        Plain text (the searchable beginning or None if compressed), compressed text (None if not compressed) and the
+        truncation flag.
+    """
+    if text is None:
+        return None, None, False
+
+    is_truncated = bool(limit) and len(text) > limit
+    if is_truncated:
+        text = text[:limit]
+    if compression_threshold and len(text) > compression_threshold:
+        searchable_text = text[: min(searchable_length, compression_threshold)] or None
+        return searchable_text, zlib.compress(text.encode()), is_truncated
+    return text, None, is_truncated
+
+
+def unpack_text(text: str | None, compressed: bytes | memoryview | None) -> str | None:
+    """Get the text packed with `pack_text`.
+
+    Args:
+        text: plain text.
+        compressed: compressed text.
+
+    Returns:
+        Decompressed text if it was compressed (the plain text is its searchable beginning then), plain text otherwise.
+    """
+    if compressed is not None:
+        return zlib.decompress(compressed).decode()
+    return text
@@ -5,13 +5,16 @@ from typing import Any, cast
 from urllib.parse import urlparse
 
 from django.contrib import messages
+from django.core.exceptions import PermissionDenied
 from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from prometheus_client import CONTENT_TYPE_LATEST
 from rest_framework import permissions, status
 from rest_framework.authentication import SessionAuthentication
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import APIException, ValidationError
 from rest_framework.renderers import JSONRenderer
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -20,6 +23,7 @@ from rest_framework_xml.renderers import XMLRenderer
 
 from apps import models
 from apps.enums import ResponseChoices
+from apps.metrics import observe_request, render_metrics
 from apps.renderers import SimpleTextRenderer, TextToXMLRenderer
 from apps.serializers import ApplicationSerializer
 from apps.services import (
@@ -28,48 +32,91 @@ from apps.services import (
     get_third_party_service_response,
     save_application_from_json_object,
 )
+from apps.timing import Phase, RequestTimer
 from apps.utils import log_request
 
 logger = logging.getLogger()
 
 
+def get_error_status(error: Exception) -> int:
+    """Get the status code of the response the view error is turned into.
+
+    Args:
+        error: exception raised by the view.
+
+    Returns:
+        HTTP status code.
+    """
+    if isinstance(error, Http404):
+        return status.HTTP_404_NOT_FOUND
+    if isinstance(error, PermissionDenied):
+        return status.HTTP_403_FORBIDDEN
+    if isinstance(error, APIException):
+        return error.status_code
+    return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
 class ResponseStubView(APIView):
     http_method_names = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
     renderer_classes = (JSONRenderer, TextToXMLRenderer, SimpleTextRenderer, XMLRenderer)
 
     @staticmethod
-    def make_response(request: Request, **kwargs: Any) -> Response:
+    def make_response(request: Request, **kwargs: Any) -> HttpResponse:
+        timer = RequestTimer()
         log_request(request_logger=logger, request=request)
+        # requests not matching any resource are counted without the labels, so random URLs do not add label values
+        labels = {'application': '', 'resource': '', 'response_type': ''}
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
 
-        application = get_object_or_404(models.Application, slug=kwargs.get('app_slug', ''), is_enabled=True)
-        resource = get_resource_from_request(request, kwargs)
-        request.accepted_renderer = JSONRenderer()
-
-        if resource.response_type in (ResponseChoices.PROXY_CURRENT, ResponseChoices.PROXY_GLOBAL):
-            return get_third_party_service_response(
-                application=application, request=request, resource=resource, tail=kwargs.get('tail', '')
-            )
-
-        return get_regular_response(application=application, request=request, resource=resource)
+        try:
+            with timer.measure(Phase.RESOLVE):
+                resource = get_resource_from_request(request, kwargs)
+            application = resource.application
+            labels = {
+                'application': application.slug,
+                'resource': '/'.join(filter(None, (resource.slug, resource.tail))),
+                'response_type': resource.response_type,
+            }
+            request.accepted_renderer = JSONRenderer()
+
+            if resource.response_type in (ResponseChoices.PROXY_CURRENT, ResponseChoices.PROXY_GLOBAL):
+                response = get_third_party_service_response(
+                    application=application,
+                    request=request,
+                    resource=resource,
+                    tail=kwargs.get('tail', ''),
+                    timer=timer,
+                )
+            else:
+                response = get_regular_response(
+                    application=application, request=request, resource=resource, timer=timer
+                )
+            status_code = response.status_code
+            return response
+        except Exception as e:
+            status_code = get_error_status(e)
+            raise
+        finally:
+            observe_request(method=request.method, status=status_code, duration=timer.elapsed / 1000, **labels)
 
     @staticmethod
-    def get(request: Request, **kwargs: Any) -> Response:
+    def get(request: Request, **kwargs: Any) -> HttpResponse:
         return ResponseStubView.make_response(request=request, **kwargs)
 
     @staticmethod
-    def post(request: Request, **kwargs: Any) -> Response:
+    def post(request: Request, **kwargs: Any) -> HttpResponse:
         return ResponseStubView.make_response(request=request, **kwargs)
 
     @staticmethod
-    def put(request: Request, **kwargs: Any) -> Response:
+    def put(request: Request, **kwargs: Any) -> HttpResponse:
         return ResponseStubView.make_response(request=request, **kwargs)
 
     @staticmethod
-    def patch(request: Request, **kwargs: Any) -> Response:
+    def patch(request: Request, **kwargs: Any) -> HttpResponse:
         return ResponseStubView.make_response(request=request, **kwargs)
 
     @staticmethod
-    def delete(request: Request, **kwargs: Any) -> Response:
+    def delete(request: Request, **kwargs: Any) -> HttpResponse:
         return ResponseStubView.make_response(request=request, **kwargs)
 
 
@@ -101,7 +148,7 @@ class StubRequestView(APIView):
         response, _ = models.ResponseStub.objects.get_or_create(
             status_code=cast(int, log.status_code),
             headers=log.response_headers,
-            body=log.response_body,
+            body=log.response_body_text,
             application=log.application,
             format=log.response_format,
             creator=request.user,
@@ -144,6 +191,16 @@ class HealthCheckView(APIView):
         return Response(status=status.HTTP_200_OK)
 
 
+class MetricsView(APIView):
+    """Metrics in the Prometheus text format."""
+
+    renderer_classes = (JSONRenderer,)
+
+    @staticmethod
+    def get(request: Request) -> HttpResponse:
+        return HttpResponse(content=render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
 class ExportToFile(APIView):
     """Export Application as a JSON file."""
 
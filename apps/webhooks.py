@@ -0,0 +1,204 @@
+import socket
+import threading
+import time
+from typing import Any, Mapping
+from urllib.parse import urlsplit
+from uuid import UUID
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError, NameResolutionError, NewConnectionError
+
+from apps.bulk_writer import webhook_delivery_writer
+from apps.models import WebhookDelivery
+
+RETRIED_STATUS_CODES = frozenset({502, 503, 504})
+
+# connection timings of the current thread request, empty if a kept-alive connection was reused
+_connection_timings = threading.local()
+
+
+class TimedConnectionMixin:
+    """Measure the name resolution and the connection time (including the TLS handshake) of the new connections."""
+
+    port: int
+    _dns_host: str
+
+    def _new_conn(self) -> socket.socket:
+        started_at = time.perf_counter()
+        try:
+            address_info = socket.getaddrinfo(self._dns_host, self.port, type=socket.SOCK_STREAM)
+        except socket.gaierror as error:
+            raise NameResolutionError(self._dns_host, self, error) from error  # type: ignore[arg-type]
+        _connection_timings.dns = (time.perf_counter() - started_at) * 1000
+
+        # connect to the resolved addresses one by one, so the name is not resolved once again
+        addresses = list(dict.fromkeys(info[4][0] for info in address_info))
+        host = self._dns_host
+        try:
+            for address in addresses[:-1]:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()  # type: ignore[misc]
+                except ConnectTimeoutError:  # NewConnectionError as well
+                    continue
+            self._dns_host = addresses[-1]
+            return super()._new_conn()  # type: ignore[misc]
+        finally:
+            self._dns_host = host
+
+    def connect(self) -> None:
+        started_at = time.perf_counter()
+        super().connect()  # type: ignore[misc]
+        _connection_timings.connect = (time.perf_counter() - started_at) * 1000 - _connection_timings.dns
+
+
+class TimedHTTPConnection(TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(url: str) -> requests.Session:
+    """Get the keep-alive session of the destination host, so the webhooks reuse the open connections.
+
+    Args:
+        url: webhook URL.
+
+    Returns:
+        Session instance shared by the threads of the worker.
+    """
+    parts = urlsplit(url)
+    origin = f'{parts.scheme}://{parts.netloc}'
+    if session := _sessions.get(origin):
+        return session
+
+    with _sessions_lock:
+        if session := _sessions.get(origin):
+            return session
+        session = requests.Session()
+        session.mount(f'{parts.scheme}://', TimedHTTPAdapter(pool_maxsize=settings.WEBHOOK_CONCURRENCY))
+        _sessions[origin] = session
+    return session
+
+
+def is_retried(response: requests.Response | None, error: Exception | None) -> bool:
+    """Check if the failed delivery must be retried.
+
+    Failures to connect and 502, 503, 504 responses are retried. Requests that could have reached the destination
+    (i.e. read timeouts and connections dropped after sending the request) are not, as the webhooks are not
+    idempotent.
+
+    Args:
+        response: destination response, None if there is no response.
+        error: request error.
+
+    Returns:
+        True if the delivery must be retried.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args and isinstance(error.args[0], MaxRetryError):
+        return isinstance(error.args[0].reason, (NewConnectionError, NameResolutionError))
+    return response is not None and response.status_code in RETRIED_STATUS_CODES
+
+
+def send_webhook(
+    method: str,
+    url: str,
+    params: Mapping[str, Any] | None,
+    headers: Mapping[str, str] | None,
+    body: str | None,
+    lifecycle: str,
+    application_id: UUID | None = None,
+    request_log_id: UUID | None = None,
+) -> requests.Response | None:
+    """Send the webhook, retry the failed deliveries and record every attempt.
+
+    Failed deliveries are retried WEBHOOK_RETRIES times, the first retry is immediate, the next ones wait 2, 4, 8...
+    times WEBHOOK_RETRY_BACKOFF seconds. The attempts are recorded by the background writer if the application is
+    known.
+
+    Args:
+        method: HTTP method.
+        url: destination URL.
+        params: query parameters.
+        headers: request headers.
+        body: request body.
+        lifecycle: lifecycle stage of the hook.
+        application_id: primary key of the application the hook belongs to.
+        request_log_id: id of the log of the request triggered the hook.
+
+    Returns:
+        Response of the last attempt, None if there was no response.
+
+    Raises:
+        RequestException if the last attempt failed with no response.
+    """
+    session = get_session(url)
+    for attempt in range(1, settings.WEBHOOK_RETRIES + 2):
+        if attempt > 2:
+            time.sleep(settings.WEBHOOK_RETRY_BACKOFF * 2 ** (attempt - 2))
+
+        _connection_timings.__dict__.clear()
+        response, error = None, None
+        started_at = time.perf_counter()
+        try:
+            response = session.request(
+                method=method,
+                url=url,
+                params=params,
+                headers=headers,
+                data=body,
+                timeout=(settings.WEBHOOK_CONNECT_TIMEOUT, settings.WEBHOOK_READ_TIMEOUT),
+            )
+        except requests.RequestException as request_error:
+            error = request_error
+        total_time = (time.perf_counter() - started_at) * 1000
+
+        if application_id:
+            webhook_delivery_writer.put(
+                WebhookDelivery(
+                    application_id=application_id,
+                    request_log_id=request_log_id,
+                    lifecycle=lifecycle,
+                    method=method,
+                    url=url,
+                    attempt=attempt,
+                    status_code=response.status_code if response is not None else None,
+                    response_size=len(response.content) if response is not None else None,
+                    dns_time=getattr(_connection_timings, 'dns', None),
+                    connect_time=getattr(_connection_timings, 'connect', None),
+                    total_time=total_time,
+                    error=str(error) if error else None,
+                )
+            )
+        if not is_retried(response, error):
+            break
+
+    if error:
+        raise error
+    return response
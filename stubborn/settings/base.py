@@ -114,6 +114,81 @@ STATIC_URL = '/static/'
 # APPLICATION
 REQUEST_LOGS_INLINE_LIMIT = 5
 RESERVED_APP_NAMES = ['log', 'srv']
+# How often (in seconds) a worker checks whether other workers changed the stubs configuration
+CONFIGURATION_CHECK_INTERVAL = env.float('CONFIGURATION_CHECK_INTERVAL', default=1.0)
+# Number of compiled body templates kept in memory by every worker
+TEMPLATE_CACHE_SIZE = env.int('TEMPLATE_CACHE_SIZE', default=512)
+# Private directory for the compiled templates bytecode shared by workers (Jinja's per-user temporary directory if
+# unset, an empty value turns it off)
+TEMPLATE_BYTECODE_CACHE_DIR = env.str('TEMPLATE_BYTECODE_CACHE_DIR', default=None)
+# Number of values pre-generated at the worker start for every pooled fake data provider (0 turns it off)
+FAKE_DATA_POOL_SIZE = env.int('FAKE_DATA_POOL_SIZE', default=0)
+# Fake data providers drawing the values from the pre-generated pools
+FAKE_DATA_POOL_PROVIDERS = env.list(
+    'FAKE_DATA_POOL_PROVIDERS',
+    default=['name', 'first_name', 'last_name', 'email', 'user_name', 'phone_number', 'company', 'address', 'uuid4'],
+)
+# Number of the requests every uWSGI process serves at the same time as gevent greenlets (0 turns the gevent mode off)
+GEVENT_CORES = env.int('GEVENT_CORES', default=0)
+# Write request logs in batches from a background thread instead of saving them in the response path (on by default
+# in the gevent mode, so the concurrent requests do not open a database connection each)
+REQUEST_LOG_ASYNC = env.bool('REQUEST_LOG_ASYNC', default=GEVENT_CORES > 0)
+# Max number of request logs waiting for saving, see REQUEST_LOG_OVERFLOW for the queue overflow behaviour
+REQUEST_LOG_QUEUE_SIZE = env.int('REQUEST_LOG_QUEUE_SIZE', default=10000)
+# Max number of request logs saved with one query
+REQUEST_LOG_BATCH_SIZE = env.int('REQUEST_LOG_BATCH_SIZE', default=500)
+# How often (in milliseconds) the queued request logs are saved
+REQUEST_LOG_FLUSH_INTERVAL = env.int('REQUEST_LOG_FLUSH_INTERVAL', default=200)
+# What to do if the request log queue is full: `drop` the new logs or `block` the request until there is free space
+REQUEST_LOG_OVERFLOW = env.str('REQUEST_LOG_OVERFLOW', default='drop')
+# Max length of the logged request and response bodies, longer bodies are truncated (0 turns it off)
+REQUEST_LOG_BODY_LIMIT = env.int('REQUEST_LOG_BODY_LIMIT', default=1024 * 1024)
+# Logged bodies longer than this are stored compressed (0 turns it off)
+REQUEST_LOG_COMPRESSION_THRESHOLD = env.int('REQUEST_LOG_COMPRESSION_THRESHOLD', default=4096)
+# Number of the first characters of the compressed bodies also kept as plain text for the log search (not more than
+# REQUEST_LOG_COMPRESSION_THRESHOLD, 0 turns it off)
+REQUEST_LOG_SEARCHABLE_LENGTH = env.int('REQUEST_LOG_SEARCHABLE_LENGTH', default=4096)
+# Logged bodies longer than this are stored once per content and shared by the logs (0 turns it off)
+REQUEST_LOG_BLOB_THRESHOLD = env.int('REQUEST_LOG_BLOB_THRESHOLD', default=512)
+# Partition interval of the request log table (`day` or `week`, PostgreSQL only), see `partition_request_logs`
+REQUEST_LOG_PARTITION_INTERVAL = env.str('REQUEST_LOG_PARTITION_INTERVAL', default='')
+# Number of days the request logs are kept (0 keeps them forever)
+REQUEST_LOG_RETENTION_DAYS = env.int('REQUEST_LOG_RETENTION_DAYS', default=0)
+# How often (in minutes) the workers prune the expired request logs (0 turns it off), see `prune_request_logs`
+REQUEST_LOG_PRUNE_INTERVAL = env.int('REQUEST_LOG_PRUNE_INTERVAL', default=0)
+# Number of the expired request logs deleted with one query
+REQUEST_LOG_PRUNE_CHUNK_SIZE = env.int('REQUEST_LOG_PRUNE_CHUNK_SIZE', default=1000)
+# Pause (in seconds) between the request log delete queries
+REQUEST_LOG_PRUNE_SLEEP = env.float('REQUEST_LOG_PRUNE_SLEEP', default=0.1)
+# Request log counts of the admin panel above this are estimated by the database statistics (0 - always exact)
+REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD = env.int('REQUEST_LOG_COUNT_ESTIMATE_THRESHOLD', default=10000)
+# How long (in seconds) the admin panel request log filter choices are cached by every worker (0 - not cached)
+REQUEST_LOG_FACET_TTL = env.int('REQUEST_LOG_FACET_TTL', default=300)
+# Number of the background threads of every worker running the after-response hooks
+AFTER_RESPONSE_HOOK_WORKERS = env.int('AFTER_RESPONSE_HOOK_WORKERS', default=8)
+# Max number of the after-response hook runs waiting for a free thread, see AFTER_RESPONSE_HOOK_OVERFLOW
+AFTER_RESPONSE_HOOK_QUEUE_SIZE = env.int('AFTER_RESPONSE_HOOK_QUEUE_SIZE', default=1000)
+# What to do if the after-response hook queue is full: `drop` the new runs or `block` the request until there is space
+AFTER_RESPONSE_HOOK_OVERFLOW = env.str('AFTER_RESPONSE_HOOK_OVERFLOW', default='drop')
+# Timeouts (in seconds) of connecting to the webhook destination and of waiting for its response
+WEBHOOK_CONNECT_TIMEOUT = env.float('WEBHOOK_CONNECT_TIMEOUT', default=5)
+WEBHOOK_READ_TIMEOUT = env.float('WEBHOOK_READ_TIMEOUT', default=30)
+# Number of the retries of the failed webhook connections and 502, 503, 504 responses
+WEBHOOK_RETRIES = env.int('WEBHOOK_RETRIES', default=2)
+# Backoff (in seconds) of the webhook retries: the first retry is immediate, the next ones wait 2, 4, 8... times this
+WEBHOOK_RETRY_BACKOFF = env.float('WEBHOOK_RETRY_BACKOFF', default=0.5)
+# Number of the webhooks of every worker sent at the same time and of the kept-alive connections per destination host
+WEBHOOK_CONCURRENCY = env.int('WEBHOOK_CONCURRENCY', default=8)
+# Where the after-response hooks run: `thread` pool of the worker or `database` job table read by `run_hook_worker`
+AFTER_RESPONSE_HOOK_BACKEND = env.str('AFTER_RESPONSE_HOOK_BACKEND', default='thread')
+# Number of the hook jobs run concurrently by the `run_hook_worker` command
+HOOK_WORKER_CONCURRENCY = env.int('HOOK_WORKER_CONCURRENCY', default=8)
+# How long (in seconds) a claimed hook job is hidden from other hook workers, the worker running it extends the lease
+HOOK_JOB_LEASE = env.int('HOOK_JOB_LEASE', default=300)
+# Number of the runs of a failing hook job before it is dropped
+HOOK_JOB_MAX_ATTEMPTS = env.int('HOOK_JOB_MAX_ATTEMPTS', default=3)
+# Add the Server-Timing header with the request handling phase durations to the stub responses
+SERVER_TIMING_HEADER = env.bool('SERVER_TIMING_HEADER', default=False)
 
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'stubborn.settings.production')
 
 application = get_wsgi_application()
+
+from apps.fake_data import faker_pool  # noqa: E402
+
+faker_pool.warm_up()